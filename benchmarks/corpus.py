@@ -0,0 +1,90 @@
+"""Deterministic synthetic corpora for the benchmark suite.
+
+Files are generated once per (kind, size) into a cache directory and reused
+across runs. Generation streams fixed-size blocks, so even the 1 GB corpora
+are produced with bounded memory.
+"""
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Callable
+
+_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+_ASCII_WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+_HANS = "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经"
+_HANT = "的一是在不了有和人這中大為上個國我以要他時來用們生到作地於出就分對成會可主發年動同工也能下過子說產種面而方後多定行學法所民得經"
+_KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん日本語文字"
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_ASCII_WORDS) for _ in range(n))
+
+
+def _cjk(alphabet: str) -> Callable[[random.Random], str]:
+    def line(rng: random.Random) -> str:
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(10, 60))) + "。"
+
+    return line
+
+
+# kind -> (encoding, newline, line generator)
+KINDS: dict[str, tuple[str, str, Callable[[random.Random], str]]] = {
+    "ascii": ("utf-8", "\n", lambda rng: f"{rng.randint(0, 10**9)} " + _words(rng, rng.randint(4, 16))),
+    "gbk": ("gbk", "\n", _cjk(_HANS)),
+    "big5": ("big5", "\n", _cjk(_HANT)),
+    "sjis": ("shift_jis", "\n", _cjk(_KANA)),
+    "crlf": ("utf-8", "\r\n", lambda rng: _words(rng, rng.randint(1, 4))),
+    "longlines": ("utf-8", "\n", lambda rng: _words(rng, rng.randint(20_000, 40_000))),
+}
+
+_BLOCK = 1 << 20
+
+
+def parse_size(label: str) -> int:
+    label = label.strip().upper()
+    if label and label[-1] in _UNITS:
+        return int(float(label[:-1]) * _UNITS[label[-1]])
+    return int(label)
+
+
+def size_label(size: int) -> str:
+    for suffix in ("G", "M", "K"):
+        if size >= _UNITS[suffix] and size % _UNITS[suffix] == 0:
+            return f"{size // _UNITS[suffix]}{suffix}"
+    return str(size)
+
+
+def ensure_corpus(directory: Path, kind: str, size: int) -> Path:
+    """Return the path of the (kind, size) corpus, generating it if missing."""
+    encoding, newline, make_line = KINDS[kind]
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{kind}-{size_label(size)}.txt"
+    if path.exists() and size * 0.9 <= path.stat().st_size <= size:
+        return path
+    rng = random.Random(f"{kind}:{size}")
+    # Build one block of whole lines and repeat it; content stays realistic
+    # while generation cost stays independent of the target size.
+    lines: list[str] = []
+    block_bytes = 0
+    while block_bytes < min(size, _BLOCK):
+        line = make_line(rng) + newline
+        lines.append(line)
+        block_bytes += len(line.encode(encoding))
+    tmp = path.with_suffix(".tmp")
+    encoded = [line.encode(encoding) for line in lines]
+    written = 0
+    with open(tmp, "wb") as fh:
+        while written < size:
+            for raw in encoded:
+                room = size - written
+                if len(raw) > room:
+                    # Cut the last line on a character boundary
+                    fh.write(raw[:room].decode(encoding, errors="ignore").encode(encoding))
+                    written = size
+                    break
+                fh.write(raw)
+                written += len(raw)
+    tmp.replace(path)
+    return path
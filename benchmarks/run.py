@@ -0,0 +1,418 @@
+"""Headless benchmark runner for ScribeOne's hot paths.
+
+Usage (from repo root):
+
+    python benchmarks/run.py --sizes 1K,1M,64M --out results.json
+    python benchmarks/run.py --compare baseline.json --threshold 0.15
+
+Every (bench, corpus, repeat) runs in a fresh child process under the
+offscreen Qt platform, so timings include no warm-up from previous benches
+and ``ru_maxrss`` reports the peak RSS of that single run. Children get
+throwaway config/data directories, so no settings, recent files or edit
+journals of the real user profile are read or written.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SRC = HERE.parent / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+if str(HERE) not in sys.path:
+    sys.path.insert(0, str(HERE))
+
+from corpus import KINDS, ensure_corpus, parse_size, size_label  # noqa: E402
+
+# Benches that need a corpus file; "startup" runs once per repeat without one
+FILE_BENCHES = ("read_text", "write_text", "doc_load", "doc_save", "open_path", "keystroke")
+BENCHES = FILE_BENCHES + ("startup",)
+DEFAULT_SIZES = "1K,1M,16M"
+KEYSTROKES = 200
+# Give up on a single child run after this long
+CHILD_TIMEOUT_S = 900
+# Timing changes smaller than this are noise, whatever the ratio
+MIN_DELTA_S = 0.001
+
+
+# ----- child side -----
+def _peak_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def _qt_app():
+    from scribeone.app import ScribeApplication
+
+    return ScribeApplication.instance() or ScribeApplication([sys.argv[0]])
+
+
+def _wait(signal, timeout_ms: int = CHILD_TIMEOUT_S * 1000) -> None:
+    from PyQt6.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    signal.connect(loop.quit)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    signal.disconnect(loop.quit)
+
+
+def _window(encoding: str):
+    from scribeone.ui import encoding_prompt, main_window
+
+    # A low-confidence guess would open a modal prompt; answer it with the
+    # corpus encoding and report that the prompt would have appeared
+    prompted: list[str] = []
+
+    def choose(parent, path, error=None, suggested=None):
+        prompted.append(suggested or "")
+        return encoding
+
+    encoding_prompt.choose_encoding = choose
+    win = main_window.MainWindow()
+    win.show()
+    return win, prompted
+
+
+def _close(win) -> None:
+    win.doc.mark_saved()
+    win.close()
+
+
+def bench_read_text(path: str, encoding: str) -> dict:
+    from scribeone.core.fileio import read_text
+
+    t0 = time.perf_counter()
+    read_text(path, encoding=encoding)
+    return {"seconds": time.perf_counter() - t0}
+
+
+def bench_write_text(path: str, encoding: str) -> dict:
+    from scribeone.core.fileio import read_text, write_text
+
+    text = read_text(path, encoding=encoding)
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        write_text(os.path.join(tmp, "out.txt"), text, encoding=encoding)
+        return {"seconds": time.perf_counter() - t0}
+
+
+def bench_doc_load(path: str, encoding: str) -> dict:
+    from scribeone.core import fileio  # noqa: F401 - keep the lazy import out of the timing
+    from scribeone.core.document import Document
+
+    t0 = time.perf_counter()
+    Document().load_from_path(path, encoding=encoding)
+    return {"seconds": time.perf_counter() - t0}
+
+
+def bench_doc_save(path: str, encoding: str) -> dict:
+    from scribeone.core import fileio  # noqa: F401 - keep the lazy import out of the timing
+    from scribeone.core.document import Document
+
+    doc = Document()
+    doc.load_from_path(path, encoding=encoding)
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        doc.save_to_path(os.path.join(tmp, "out.txt"))
+        return {"seconds": time.perf_counter() - t0}
+
+
+def bench_open_path(path: str, encoding: str) -> dict:
+    app = _qt_app()
+    win, prompted = _window(encoding)
+    app.processEvents()
+    t0 = time.perf_counter()
+    loaded: list[str] = []
+    win.documentLoaded.connect(loaded.append)
+    win._open_path(path)
+    if not loaded:
+        _wait(win.documentLoaded)
+    seconds = time.perf_counter() - t0
+    _close(win)
+    return {"seconds": seconds, "prompted": bool(prompted)}
+
+
+def bench_keystroke(path: str, encoding: str) -> dict:
+    from PyQt6.QtCore import QEvent, QObject, Qt
+    from PyQt6.QtGui import QTextCursor
+    from PyQt6.QtTest import QTest
+
+    app = _qt_app()
+    win, _ = _window(encoding)
+    loaded: list[str] = []
+    win.documentLoaded.connect(loaded.append)
+    win._open_path(path)
+    if not loaded:
+        _wait(win.documentLoaded)
+    if win._in_huge_mode():
+        _close(win)
+        return {"skipped": "read-only huge file mode"}
+    editor = win.editor
+    cursor = editor.textCursor()
+    cursor.setPosition(editor.document().characterCount() // 2)
+    cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
+    editor.setTextCursor(cursor)
+    editor.setFocus()
+    app.processEvents()
+
+    class PaintWatch(QObject):
+        painted = False
+
+        def eventFilter(self, obj, event):  # noqa: N802 - Qt override
+            if event.type() == QEvent.Type.Paint:
+                self.painted = True
+            return False
+
+    watch = PaintWatch()
+    editor.viewport().installEventFilter(watch)
+    samples: list[float] = []
+    for i in range(KEYSTROKES):
+        key = Qt.Key.Key_Backspace if i % 4 == 3 else Qt.Key.Key_X
+        watch.painted = False
+        t0 = time.perf_counter()
+        QTest.keyClick(editor, key)
+        deadline = t0 + 5.0
+        while not watch.painted and time.perf_counter() < deadline:
+            app.processEvents()
+        samples.append(time.perf_counter() - t0)
+    editor.viewport().removeEventFilter(watch)
+    _close(win)
+    samples.sort()
+    return {
+        "seconds": statistics.median(samples),
+        "p95": samples[int(len(samples) * 0.95) - 1],
+        "max": samples[-1],
+        "keystrokes": len(samples),
+    }
+
+
+def bench_startup(path: str, encoding: str) -> dict:
+    # Import time is part of cold startup, so nothing from scribeone or
+    # PyQt6 may be imported before t0
+    t0 = time.perf_counter()
+    from scribeone import main as entry
+    from scribeone.app import ScribeApplication
+
+    first_paint: list[float] = []
+
+    def exec_until_painted(self) -> int:
+        from PyQt6.QtCore import QEvent, QObject
+
+        class PaintWatch(QObject):
+            def eventFilter(self, obj, event):  # noqa: N802 - Qt override
+                if event.type() == QEvent.Type.Paint and not first_paint:
+                    first_paint.append(time.perf_counter())
+                return False
+
+        watch = PaintWatch()
+        self.installEventFilter(watch)
+        deadline = time.perf_counter() + 30
+        while not first_paint and time.perf_counter() < deadline:
+            self.processEvents()
+        self.removeEventFilter(watch)
+        for widget in self.topLevelWidgets():
+            widget.close()
+        return 0
+
+    ScribeApplication.exec = exec_until_painted
+    argv, sys.argv = sys.argv, [sys.argv[0], "--new-instance"]
+    try:
+        entry.main()
+    finally:
+        sys.argv = argv
+    return {"seconds": (first_paint[0] if first_paint else time.perf_counter()) - t0}
+
+
+def _child(bench: str, path: str, encoding: str) -> None:
+    result = globals()[f"bench_{bench}"](path, encoding)
+    result["peak_rss_kb"] = _peak_rss_kb()
+    print(json.dumps(result))
+
+
+# ----- parent side -----
+def _child_env(scratch: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env["XDG_CONFIG_HOME"] = os.path.join(scratch, "config")
+    env["XDG_DATA_HOME"] = os.path.join(scratch, "data")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    return env
+
+
+def _run_child(bench: str, path: str, encoding: str) -> dict:
+    with tempfile.TemporaryDirectory(prefix="scribeone-bench-") as scratch:
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--worker", bench, path, encoding],
+            capture_output=True,
+            text=True,
+            env=_child_env(scratch),
+            timeout=CHILD_TIMEOUT_S,
+        )
+        wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["exit %d" % proc.returncode])[-1]}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if bench == "startup":
+        # Process spawn and interpreter start are part of what users wait for
+        result["process_seconds"] = wall
+    return result
+
+
+def _summarize(runs: list[dict]) -> dict:
+    errors = [r["error"] for r in runs if "error" in r]
+    if errors:
+        return {"error": errors[0]}
+    if any("skipped" in r for r in runs):
+        return {"skipped": runs[0]["skipped"]}
+    seconds = [r["seconds"] for r in runs]
+    summary: dict = {
+        "median": statistics.median(seconds),
+        "min": min(seconds),
+        "runs": seconds,
+    }
+    rss = [r["peak_rss_kb"] for r in runs if r.get("peak_rss_kb") is not None]
+    if rss:
+        summary["peak_rss_kb"] = max(rss)
+    for extra in ("p95", "max", "process_seconds", "prompted"):
+        values = [r[extra] for r in runs if extra in r]
+        if values:
+            summary[extra] = any(values) if extra == "prompted" else statistics.median(values)
+    return summary
+
+
+def _meta() -> dict:
+    try:
+        from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+    except ImportError:
+        PYQT_VERSION_STR = QT_VERSION_STR = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pyqt": PYQT_VERSION_STR,
+        "qt": QT_VERSION_STR,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    corpus_dir = Path(args.corpus_dir)
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+    benches = [b.strip() for b in args.bench.split(",") if b.strip()]
+    for name in kinds:
+        if name not in KINDS:
+            raise SystemExit(f"unknown corpus kind: {name} (choose from {', '.join(KINDS)})")
+    for name in benches:
+        if name not in BENCHES:
+            raise SystemExit(f"unknown bench: {name} (choose from {', '.join(BENCHES)})")
+    results: dict[str, dict] = {}
+    for bench in benches:
+        if bench == "startup":
+            cases = [("startup", "", "utf-8")]
+        else:
+            cases = []
+            for kind in kinds:
+                for size in sizes:
+                    path = ensure_corpus(corpus_dir, kind, size)
+                    cases.append((f"{bench}/{kind}/{size_label(size)}", str(path), KINDS[kind][0]))
+        for key, path, encoding in cases:
+            runs = [_run_child(bench, path, encoding) for _ in range(args.repeat)]
+            results[key] = _summarize(runs)
+            print(_format_line(key, results[key]), file=sys.stderr, flush=True)
+    return {"meta": _meta(), "results": results}
+
+
+def _format_line(key: str, summary: dict) -> str:
+    if "error" in summary:
+        return f"{key:<32} ERROR {summary['error']}"
+    if "skipped" in summary:
+        return f"{key:<32} skipped ({summary['skipped']})"
+    line = f"{key:<32} {summary['median'] * 1000:10.2f} ms"
+    if "p95" in summary:
+        line += f"  p95 {summary['p95'] * 1000:.2f} ms"
+    if "peak_rss_kb" in summary:
+        line += f"  rss {summary['peak_rss_kb'] / 1024:.1f} MiB"
+    return line
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Regressions of ``current`` against ``baseline`` beyond ``threshold``."""
+    regressions: list[str] = []
+    base_results = baseline.get("results", {})
+    for key, now in current["results"].items():
+        before = base_results.get(key)
+        if not before or "median" not in before:
+            continue
+        if "error" in now:
+            regressions.append(f"{key}: failed ({now['error']})")
+            continue
+        if "median" not in now:
+            continue
+        for metric in ("median", "p95", "peak_rss_kb"):
+            if metric not in now or metric not in before or not before[metric]:
+                continue
+            change = now[metric] / before[metric] - 1
+            if metric != "peak_rss_kb" and now[metric] - before[metric] < MIN_DELTA_S:
+                continue
+            if change > threshold:
+                regressions.append(f"{key}: {metric} {before[metric]:.6g} -> {now[metric]:.6g} (+{change:.0%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--worker"]:
+        _child(*argv[1:4])
+        return 0
+    parser = argparse.ArgumentParser(description="Headless ScribeOne benchmarks")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated corpus sizes (default {DEFAULT_SIZES}; up to 1G)")
+    parser.add_argument("--kinds", default=",".join(KINDS), help="comma-separated corpus kinds")
+    parser.add_argument("--bench", default=",".join(BENCHES), help="comma-separated benches")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (median is reported)")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "scribeone-bench"))
+    parser.add_argument("--out", help="write JSON results here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if results regress against this JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown ratio for --compare")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
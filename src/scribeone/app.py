@@ -17,4 +17,12 @@ class ScribeApplication(QApplication):
         super().__init__(argv)
         QCoreApplication.setOrganizationName(self.ORGANIZATION)
         QCoreApplication.setApplicationName(self.APPLICATION)
+        # Settings are written behind; make sure nothing is lost on exit
+        self.aboutToQuit.connect(self._flush_settings)
         # Future: load settings, apply theme, fonts, translations
+
+    @staticmethod
+    def _flush_settings() -> None:
+        from .utils.settings import settings
+
+        settings().flush()
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+# ``scribeone batch``: convert encodings and line breaks of many files, headless.
+# Nothing here may import PyQt6 (directly or through ``ui``/``utils``), so the
+# command starts fast in containers without a display, or without Qt at all.
+
+import codecs
+import json
+import os
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+
+from .core.fileio import (
+    CHUNK_SIZE,
+    body_codec,
+    detect_bom,
+    detect_compression,
+    detect_encoding,
+    is_ascii_compatible,
+    iter_decoded_chunks,
+    open_decompressed,
+    write_chunks,
+)
+from .core.workspace_search import DEFAULT_IGNORE, iter_files, split_patterns
+
+_NEWLINES = {"lf": "\n", "crlf": "\r\n", "cr": "\r"}
+_TARGET_BOMS = {"utf-8": codecs.BOM_UTF8, "utf-16": codecs.BOM_UTF16_LE, "utf-32": codecs.BOM_UTF32_LE}
+# Text with NUL bytes in it: UTF-16/32, recognized by the BOM
+_WIDE_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE, codecs.BOM_UTF32_BE)
+# Bytes sniffed for NUL to skip binary files
+_BINARY_SNIFF = 8192
+
+
+@dataclass(frozen=True)
+class Options:
+    encoding: str = "utf-8"  # target
+    source: str | None = None  # None: detect per file
+    newline: str | None = None  # "\n", "\r\n", "\r"; None: the file's own (most used) style
+    bom: bool = False
+    dry_run: bool = False
+    force: bool = False  # convert files whose encoding was only guessed
+
+
+@dataclass
+class FileResult:
+    path: str
+    status: str  # "converted", "would-convert", "unchanged", "skipped", "failed"
+    encoding: str | None = None  # as read
+    confidence: float | None = None
+    newlines: dict[str, int] = field(default_factory=dict)  # style name -> count, as read
+    bytes_in: int = 0
+    bytes_out: int = 0
+    reason: str = ""
+
+
+def _count_newlines(path: str, encoding: str) -> Counter:
+    """Line breaks of each style in ``path``, decoding it a chunk at a time."""
+    counts: Counter = Counter()
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    pending_cr = False
+    with open_decompressed(path) as fh:
+        while True:
+            data = fh.read(CHUNK_SIZE)
+            text = decoder.decode(data, final=not data)
+            if pending_cr:
+                text = "\r" + text
+            # A CR at the end may be the first half of a CRLF: wait for the next chunk
+            pending_cr = bool(data) and text.endswith("\r")
+            if pending_cr:
+                text = text[:-1]
+            crlf = text.count("\r\n")
+            counts["crlf"] += crlf
+            counts["cr"] += text.count("\r") - crlf
+            counts["lf"] += text.count("\n") - crlf
+            if not data:
+                return counts
+
+
+def _is_binary(path: str, source: str | None) -> bool:
+    """NUL bytes near the start mean binary, unless the text is UTF-16/32."""
+    if source is not None and not is_ascii_compatible(source):
+        return False
+    with open_decompressed(path) as fh:
+        head = fh.read(_BINARY_SNIFF)
+    return b"\0" in head and (source is not None or not head.startswith(_WIDE_BOMS))
+
+
+def convert_file(path: str, options: Options) -> FileResult:
+    """Convert one file as ``options`` say (or only tell what would change)."""
+    result = FileResult(path, "failed")
+    try:
+        result.bytes_in = os.path.getsize(path)
+        if _is_binary(path, options.source):
+            result.status, result.reason = "skipped", "binary"
+            return result
+        if options.source:
+            encoding = options.source
+            result.confidence = 1.0
+        else:
+            guess = detect_encoding(path)
+            encoding, result.confidence = guess.encoding, guess.confidence
+            if not guess.confident and not options.force:
+                result.encoding, result.status = encoding, "skipped"
+                result.reason = "encoding uncertain (use --from or --force)"
+                return result
+        result.encoding = encoding
+        counts = _count_newlines(path, encoding)
+        result.newlines = {k: v for k, v in counts.items() if v}
+        style = options.newline or _NEWLINES[max(("lf", "crlf", "cr"), key=lambda k: counts[k])]
+        target_bom = _TARGET_BOMS.get(codecs.lookup(options.encoding).name, b"") if options.bom else b""
+        source_bom = detect_bom(path, encoding)
+        same_codec = (
+            codecs.lookup(body_codec(encoding, source_bom)).name
+            == codecs.lookup(body_codec(options.encoding, target_bom)).name
+        )
+        other_breaks = sum(v for k, v in counts.items() if _NEWLINES[k] != style)
+        if same_codec and source_bom == target_bom and not other_breaks:
+            result.status = "unchanged"
+            return result
+        if options.dry_run:
+            result.status = "would-convert"
+            return result
+        write_chunks(
+            path,
+            (text for text, _ in iter_decoded_chunks(path, encoding)),
+            encoding=options.encoding,
+            newline=style,
+            compression=detect_compression(path),
+            bom=target_bom,
+        )
+        result.bytes_out = os.path.getsize(path)
+        result.status = "converted"
+    except (OSError, UnicodeError, LookupError) as e:
+        result.status, result.reason = "failed", f"{type(e).__name__}: {e}"
+    return result
+
+
+def collect_files(paths: list[str], name_filters: tuple[str, ...]) -> list[str]:
+    """Files named on the command line, plus matching files under named directories."""
+    files: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(iter_files(path, name_filters, DEFAULT_IGNORE))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(os.path.abspath(f) for f in files))
+
+
+def run(files: list[str], options: Options, jobs: int = 1) -> list[FileResult]:
+    """Convert ``files`` on ``jobs`` worker processes; results in input order."""
+    if jobs <= 1 or len(files) <= 1:
+        return [convert_file(f, options) for f in files]
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(partial(convert_file, options=options), files, chunksize=8))
+
+
+def report(results: list[FileResult], options: Options) -> dict:
+    return {
+        "dry_run": options.dry_run,
+        "target": {
+            "encoding": options.encoding,
+            "newline": next((k for k, v in _NEWLINES.items() if v == options.newline), "keep"),
+            "bom": options.bom,
+        },
+        "summary": dict(Counter(r.status for r in results)),
+        "files": [asdict(r) for r in results],
+    }
+
+
+def _parse_args(argv: list[str]):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="scribeone batch",
+        description="Convert the encoding and line breaks of many files (no GUI).",
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="files, or directories to walk")
+    parser.add_argument("--to", dest="encoding", default="utf-8", help="target encoding (default: utf-8)")
+    parser.add_argument("--from", dest="source", help="source encoding for all files (default: detect each)")
+    parser.add_argument("--newline", choices=[*_NEWLINES, "keep"], default="keep", help="line breaks to write (default: keep the file's own)")
+    parser.add_argument("--bom", action="store_true", help="write a byte order mark (UTF-8/16/32 targets)")
+    parser.add_argument("--include", default="*.txt", help="name patterns for files in directories, ';'-separated (default: *.txt)")
+    parser.add_argument("--force", action="store_true", help="also convert files whose encoding is only a low-confidence guess")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="report what would change without writing")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument("--report", metavar="FILE", help="write a JSON report to FILE ('-' for stdout)")
+    args = parser.parse_args(argv)
+    try:
+        codecs.lookup(args.encoding)
+        if args.source:
+            codecs.lookup(args.source)
+    except LookupError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv: list[str]) -> int:
+    args = _parse_args(argv)
+    options = Options(
+        encoding=args.encoding,
+        source=args.source,
+        newline=_NEWLINES.get(args.newline),
+        bom=args.bom,
+        dry_run=args.dry_run,
+        force=args.force,
+    )
+    files = collect_files(args.paths, split_patterns(args.include))
+    results = run(files, options, args.jobs)
+    data = report(results, options)
+    if args.report == "-":
+        json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, ensure_ascii=False, indent=2)
+        for r in results:
+            if r.status != "unchanged":
+                detail = f" ({r.reason})" if r.reason else ""
+                print(f"{r.status:>13}  {r.path}{detail}")
+        print(", ".join(f"{n} {status}" for status, n in sorted(data["summary"].items())) or "no files")
+    return 1 if any(r.status == "failed" for r in results) else 0
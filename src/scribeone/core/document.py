@@ -1,46 +1,158 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+from .piece_table import Piece, PieceTable
+
+if TYPE_CHECKING:
+    from .fileio import Compression, Durability
+
+
+def normalize_newlines(text: str) -> str:
+    """Fold CRLF/CR into LF, matching what the editor widget displays."""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Immutable copy of a document's contents, safe to read from any thread."""
+
+    pieces: tuple[Piece, ...]
+    revision: int
+
+    def iter_chunks(self) -> Iterator[str]:
+        return PieceTable.from_pieces(self.pieces).iter_chunks()
 
 
-@dataclass
 class Document:
     """A minimal single-document model.
 
     API per specs:
       - path: str | None
+      - encoding: str (codec used to load, reused when saving)
+      - compression: "gzip" | "bz2" | "xz" | None (likewise)
+      - newline, bom: line break and BOM to write (as found on load)
+      - mixed_newlines: bool (the file had several line break styles; saving unifies them)
       - is_dirty: bool
-      - text: str
+      - text: str (built on demand from the piece table)
       - mark_dirty()
       - set_text(text)
+      - apply_edit(position, removed, added)
       - load_from_path(path, encoding)
       - save_to_path(path | None, encoding)
+      - snapshot() -> Snapshot
+
+    The buffer is a :class:`PieceTable` addressed in UTF-16 code units, so
+    ``QTextDocument.contentsChange`` positions can be applied directly. Dirty
+    state is an edit counter compared against the revision last saved.
     """
 
-    path: str | None = None
-    is_dirty: bool = False
-    text: str = ""
+    def __init__(self, path: str | None = None, text: str = "", encoding: str = "utf-8") -> None:
+        self.path = path
+        self.encoding = encoding
+        self.compression: Compression | None = None
+        self.newline = "\n"
+        self.mixed_newlines = False
+        self.bom: bytes | None = None  # None: unknown, left to the codec
+        self.buffer = PieceTable(text)
+        self._revision = 0
+        self._saved_revision = 0
+
+    # ----- state -----
+    @property
+    def text(self) -> str:
+        return self.buffer.text()
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    @property
+    def is_dirty(self) -> bool:
+        return self._revision != self._saved_revision
+
+    @is_dirty.setter
+    def is_dirty(self, value: bool) -> None:
+        if value:
+            self.mark_dirty()
+        else:
+            self.mark_saved()
+
+    def __len__(self) -> int:
+        return len(self.buffer)
 
     def mark_dirty(self) -> None:
-        self.is_dirty = True
+        self._revision += 1
+
+    def snapshot(self) -> Snapshot:
+        """O(pieces) copy for background saves; later edits do not affect it."""
+        return Snapshot(self.buffer.snapshot(), self._revision)
 
+    def mark_saved(self, revision: int | None = None) -> None:
+        """Record ``revision`` (default: current) as the on-disk state."""
+        self._saved_revision = self._revision if revision is None else revision
+
+    # ----- edits -----
     def set_text(self, text: str) -> None:
-        self.text = text
-        self.is_dirty = True
+        self.buffer = PieceTable(text)
+        self.mark_dirty()
+
+    def apply_edit(self, position: int, removed: int, added: str) -> str:
+        """Apply one ``contentsChange`` delta; returns the removed text."""
+        old = self.buffer.replace(position, removed, added)
+        self.mark_dirty()
+        return old
 
+    # ----- io -----
     def load_from_path(self, path: str, encoding: str = "utf-8") -> None:
         from .fileio import read_text
 
-        self.text = read_text(path, encoding=encoding)
+        self.buffer = PieceTable(normalize_newlines(read_text(path, encoding=encoding)))
         self.path = path
-        self.is_dirty = False
+        self.encoding = encoding
+        self.read_format()
+        self.mark_saved()
+
+    def read_format(self) -> None:
+        """Take compression, line breaks and BOM from the file at ``path``, to write them back.
+
+        Only samples of the file are read; of mixed line breaks the most
+        used style is written. Raises OSError.
+        """
+        from .fileio import detect_bom, detect_compression, newline_counts
+
+        self.compression = detect_compression(self.path)
+        counts = newline_counts(self.path, self.encoding)
+        if counts:
+            self.newline = counts.most_common(1)[0][0]
+        self.mixed_newlines = len(counts) > 1
+        self.bom = detect_bom(self.path, self.encoding)
 
-    def save_to_path(self, path: str | None = None, encoding: str = "utf-8") -> None:
-        from .fileio import write_text
+    def save_to_path(
+        self,
+        path: str | None = None,
+        encoding: str | None = None,
+        durability: Durability = "file",
+    ) -> None:
+        from .fileio import write_chunks
 
         target = path or self.path
         if not target:
             raise ValueError("No path provided for save")
-        write_text(target, self.text, encoding=encoding)
+        encoding = encoding or self.encoding
+        snap = self.snapshot()
+        write_chunks(
+            target,
+            snap.iter_chunks(),
+            encoding=encoding,
+            newline=self.newline,
+            durability=durability,
+            compression=self.compression,
+            bom=self.bom if encoding == self.encoding else None,
+        )
         self.path = target
-        self.is_dirty = False
+        self.encoding = encoding
+        self.mark_saved(snap.revision)
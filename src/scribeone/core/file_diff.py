@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+from .piece_table import utf16_len
+
+# Files are hashed in blocks of this size to tell a real rewrite from a touch
+BLOCK_SIZE = 1 << 20
+# Changed regions with more lines than this on both sides are replaced as a
+# whole instead of being matched line by line (the matcher is quadratic)
+MAX_MATCH_LINES = 20_000
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Cheap identity of a file version: size and mtime, plus block hashes once known."""
+
+    size: int
+    mtime_ns: int
+    blocks: tuple[bytes, ...] | None = None
+
+    @classmethod
+    def of(cls, path: str) -> Fingerprint:
+        """Size and mtime of ``path`` (no hashes); raises OSError."""
+        st = os.stat(path)
+        return cls(st.st_size, st.st_mtime_ns)
+
+    def same_stat(self, other: Fingerprint) -> bool:
+        return (self.size, self.mtime_ns) == (other.size, other.mtime_ns)
+
+    def same_content(self, other: Fingerprint) -> bool:
+        """Whether both versions hash the same; False when either lacks hashes."""
+        return self.blocks is not None and self.size == other.size and self.blocks == other.blocks
+
+
+def block_hashes(data: bytes, block_size: int = BLOCK_SIZE) -> tuple[bytes, ...]:
+    view = memoryview(data)
+    return tuple(
+        hashlib.blake2b(view[i:i + block_size], digest_size=16).digest()
+        for i in range(0, len(data), block_size)
+    )
+
+
+@dataclass(frozen=True)
+class Hunk:
+    """One changed region, as an edit of the old text.
+
+    ``position`` and ``removed`` are UTF-16 units (the editor's positions);
+    the line fields locate the region for keeping the view in place.
+    """
+
+    position: int
+    removed: int
+    text: str
+    old_line: int  # first replaced line, 0-based
+    old_lines: int
+    new_lines: int
+
+    @property
+    def line_delta(self) -> int:
+        return self.new_lines - self.old_lines
+
+
+def _lines(text: str) -> list[str]:
+    # Lines keep their "\n" so joining any run of them gives the exact text
+    parts = text.split("\n")
+    return [p + "\n" for p in parts[:-1]] + [parts[-1]]
+
+
+def diff_lines(old: str, new: str) -> list[Hunk]:
+    """Line-level differences turning ``old`` into ``new``, in document order.
+
+    Applying the hunks from last to first leaves earlier positions valid.
+    """
+    if old == new:
+        return []
+    a, b = _lines(old), _lines(new)
+    # The common head and tail are skipped before matching what is left
+    lo = 0
+    limit = min(len(a), len(b))
+    while lo < limit and a[lo] == b[lo]:
+        lo += 1
+    hi_a, hi_b = len(a), len(b)
+    while hi_a > lo and hi_b > lo and a[hi_a - 1] == b[hi_b - 1]:
+        hi_a -= 1
+        hi_b -= 1
+    if hi_a - lo > MAX_MATCH_LINES and hi_b - lo > MAX_MATCH_LINES:
+        opcodes = [("replace", lo, hi_a, lo, hi_b)]
+    else:
+        matcher = SequenceMatcher(None, a[lo:hi_a], b[lo:hi_b], autojunk=False)
+        opcodes = [(tag, i1 + lo, i2 + lo, j1 + lo, j2 + lo) for tag, i1, i2, j1, j2 in matcher.get_opcodes()]
+
+    hunks = []
+    position = utf16_len("".join(a[:lo]))
+    for tag, i1, i2, j1, j2 in opcodes:
+        removed = utf16_len("".join(a[i1:i2]))
+        if tag != "equal":
+            hunks.append(Hunk(position, removed, "".join(b[j1:j2]), i1, i2 - i1, j2 - j1))
+        position += removed
+    return hunks
@@ -1,9 +1,257 @@
 from __future__ import annotations
 
+import codecs
+import os
+import stat
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Literal
+
+# Bytes read per step by the chunked loader
+CHUNK_SIZE = 1 << 20
+
+# Bytes taken from the head, middle and tail of a file for detection
+SAMPLE_SIZE = 32 * 1024
+# Guesses below this confidence should be confirmed by the user
+CONFIDENCE_THRESHOLD = 0.8
+# A guess resting on fewer non-ASCII bytes than this is scaled down
+_MIN_EVIDENCE_BYTES = 32
+# Chaos + coherence lead over the best rival reading needed for full confidence
+_MIN_MARGIN = 0.1
+# Rival matches compared against the best one
+_MAX_RIVALS = 5
+
+# Compressed files are recognized by their magic bytes and streamed through
+# the stdlib codecs, which are imported only once such a file turns up
+Compression = Literal["gzip", "bz2", "xz"]
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+_MAGIC_SIZE = 6
+_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+# Default compression level (gzip/bz2 level, xz preset), 0-9
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Longest BOMs first: the UTF-32-LE BOM starts with the UTF-16-LE one
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+@dataclass(frozen=True)
+class EncodingGuess:
+    """Result of :func:`detect_encoding`.
+
+    ``encoding`` is a Python codec name that consumes any BOM itself
+    (``utf-8-sig``, ``utf-16``, ``utf-32``); ``confidence`` is in [0, 1].
+    """
+
+    encoding: str
+    confidence: float
+    bom: bool = False
+
+    @property
+    def confident(self) -> bool:
+        return self.confidence >= CONFIDENCE_THRESHOLD
+
+
+# (abspath, mtime_ns, size) -> guess, least recently used first; files
+# rarely change encoding in place. Workspace scans pass every file through
+# here, so only the most recent guesses are kept.
+_DETECT_CACHE_SIZE = 4096
+_detect_cache: OrderedDict[tuple[str, int, int], EncodingGuess] = OrderedDict()
+_detect_lock = threading.Lock()
+
+
+def detect_encoding(path: str) -> EncodingGuess:
+    """Guess the encoding of ``path`` from bounded samples; cached per version.
+
+    Order: BOM, then strict UTF-8 over head/middle/tail samples, then
+    charset-normalizer over the same samples (if installed). The whole file
+    is never read, so the cost is constant for any file size.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _detect_lock:
+        guess = _detect_cache.get(key)
+        if guess is not None:
+            _detect_cache.move_to_end(key)
+            return guess
+    guess = _detect_samples(_read_samples(path, st.st_size))
+    with _detect_lock:
+        _detect_cache[key] = guess
+        while len(_detect_cache) > _DETECT_CACHE_SIZE:
+            _detect_cache.popitem(last=False)
+    return guess
+
+
+def _read_samples(path: str, size: int) -> list[bytes]:
+    with open(path, "rb") as fh:
+        stream = _decompressing(fh)
+        if stream is not fh:
+            # Only the head can be had without decompressing all before it
+            with stream:
+                return [stream.read(3 * SAMPLE_SIZE)]
+        if size <= 3 * SAMPLE_SIZE:
+            return [fh.read()]
+        samples = [fh.read(SAMPLE_SIZE)]
+        for offset in (size // 2 - SAMPLE_SIZE // 2, size - SAMPLE_SIZE):
+            fh.seek(offset)
+            samples.append(fh.read(SAMPLE_SIZE))
+        return samples
+
+
+def _detect_samples(samples: list[bytes]) -> EncodingGuess:
+    head = samples[0]
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return EncodingGuess(name, 1.0, bom=True)
+    if all(_valid_utf8(sample, first=(i == 0)) for i, sample in enumerate(samples)):
+        return EncodingGuess("utf-8", 1.0)
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:  # optional dependency
+        return EncodingGuess("utf-8", 0.0)
+    # Trim samples to whole lines so no multibyte character is cut in half
+    data = b"\n".join(_line_aligned(sample, first=(i == 0)) for i, sample in enumerate(samples))
+    matches = list(from_bytes(data))
+    if not matches:
+        return EncodingGuess("utf-8", 0.0)
+    best = matches[0]
+    return EncodingGuess(codecs.lookup(best.encoding).name, _confidence(data, matches))
+
+
+def _confidence(data: bytes, matches: list) -> float:
+    """How far to trust the first of charset-normalizer's ``matches`` for ``data``.
+
+    Its chaos score alone says little: every match it returns is already
+    below its own chaos cut-off. A guess counts only in proportion to the
+    non-ASCII bytes behind it and to its lead over the best rival that
+    reads the bytes differently (codecs that agree on this data are no rivals).
+    """
+    best = matches[0]
+    evidence = min(1.0, sum(b >= 0x80 for b in data) / _MIN_EVIDENCE_BYTES)
+    text = str(best)
+    margin = 1.0
+    for rival in matches[1:1 + _MAX_RIVALS]:
+        if str(rival) != text:
+            lead = (rival.chaos - best.chaos) + (best.coherence - rival.coherence)
+            margin = min(1.0, max(0.0, lead / _MIN_MARGIN))
+            break
+    return max(0.0, 1.0 - best.chaos) * evidence * margin
+
+
+def _valid_utf8(sample: bytes, first: bool) -> bool:
+    if b"\x00" in sample:
+        # NULs are valid UTF-8 but in text they point at UTF-16/32
+        return False
+    if not first:
+        # Skip continuation bytes of a character cut by the sample boundary
+        skip = 0
+        while skip < 3 and skip < len(sample) and 0x80 <= sample[skip] <= 0xBF:
+            skip += 1
+        sample = sample[skip:]
+    try:
+        # final=False tolerates a character cut at the end of the sample
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _line_aligned(sample: bytes, first: bool) -> bytes:
+    start = 0 if first else sample.find(b"\n") + 1
+    end = sample.rfind(b"\n")
+    if end <= start:
+        return sample if first else sample[start:]
+    return sample[start:end]
+
+
+def newline_counts(path: str, encoding: str) -> Counter:
+    """Line terminators (``"\\r\\n"``, ``"\\n"``, ``"\\r"``) counted in samples of ``path``.
+
+    The same head, middle and tail samples as :func:`detect_encoding`, so
+    small files are counted whole; for wide encodings only the head, which
+    is the one sample sure to start on a character.
+    """
+    size = os.stat(path).st_size
+    samples = _read_samples(path, size)
+    whole = len(samples) == 1 and len(samples[0]) == size
+    if not is_ascii_compatible(encoding):
+        samples = samples[:1]
+    counts: Counter = Counter()
+    for sample in samples:
+        text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample, final=whole)
+        if text.endswith("\r") and not whole:
+            text = text[:-1]  # maybe the first half of a CRLF cut off by the sample
+        crlf = text.count("\r\n")
+        counts["\r\n"] += crlf
+        counts["\r"] += text.count("\r") - crlf
+        counts["\n"] += text.count("\n") - crlf
+    return +counts
+
+
+def detect_newline(path: str, encoding: str) -> str | None:
+    """The most used line terminator in :func:`newline_counts` of ``path``.
+
+    None if the samples hold no line break (e.g. a one-line file).
+    """
+    counts = newline_counts(path, encoding)
+    return counts.most_common(1)[0][0] if counts else None
+
+
+def detect_bom(path: str, encoding: str) -> bytes:
+    """The BOM at the start of ``path`` that ``encoding`` consumes; b"" if none.
+
+    Codecs that do not consume a BOM (plain ``utf-8``) keep it as text, so
+    for them it is not reported either.
+    """
+    name = codecs.lookup(encoding).name
+    if name not in ("utf-8-sig", "utf-16", "utf-32"):
+        return b""
+    with open_decompressed(path) as fh:
+        head = fh.read(4)
+    for bom, codec in _BOMS:
+        if codec == name and head.startswith(bom):
+            return bom
+    return b""
+
+
+def body_codec(encoding: str, bom: bytes) -> str:
+    """The codec that writes the text after ``bom``, which is written by itself.
+
+    BOM-writing codecs are swapped for their BOM-less form in the byte
+    order the BOM gives, so the text comes back exactly as it was read.
+    """
+    name = codecs.lookup(encoding).name
+    if name == "utf-8-sig":
+        return "utf-8"
+    if name == "utf-16":
+        return "utf-16-be" if bom == codecs.BOM_UTF16_BE else "utf-16-le"
+    if name == "utf-32":
+        return "utf-32-be" if bom == codecs.BOM_UTF32_BE else "utf-32-le"
+    return encoding
+
+
+def is_ascii_compatible(encoding: str) -> bool:
+    """Whether ``\\n`` is a single 0x0A byte, so byte-level line scans work."""
+    return not codecs.lookup(encoding).name.startswith(("utf-16", "utf-32"))
 
 
 def read_text(path: str, encoding: str = "utf-8") -> str:
+    if detect_compression(path) is not None:
+        with open_decompressed(path) as fh:
+            data = fh.read()
+        return data.decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
     p = Path(path)
     try:
         return p.read_text(encoding=encoding)
@@ -14,12 +262,249 @@ def read_text(path: str, encoding: str = "utf-8") -> str:
         raise e
 
 
+class _NewlineFolder:
+    """Incrementally fold CRLF/CR into LF across chunk boundaries."""
+
+    __slots__ = ("_pending_cr",)
+
+    def __init__(self) -> None:
+        self._pending_cr = False
+
+    def feed(self, text: str, final: bool = False) -> str:
+        if self._pending_cr:
+            text = "\r" + text
+            self._pending_cr = False
+        if not final and text.endswith("\r"):
+            # Wait for the next chunk to tell CR from CRLF
+            text = text[:-1]
+            self._pending_cr = True
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+
+def compression_of(head: bytes) -> Compression | None:
+    """The format whose magic bytes start ``head``; None for anything else."""
+    for magic, kind in _MAGIC:
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def detect_compression(path: str) -> Compression | None:
+    """The compression format of ``path`` by its magic bytes; None for plain files."""
+    with open(path, "rb") as fh:
+        return compression_of(fh.read(_MAGIC_SIZE))
+
+
+def compression_for_name(path: str) -> Compression | None:
+    """The format a new file should get from its suffix (``.gz``, ``.bz2``, ``.xz``)."""
+    return _SUFFIXES.get(Path(path).suffix.lower())
+
+
+def _decompressing(raw: BinaryIO) -> BinaryIO:
+    """``raw`` itself, or a reader that decompresses it as it goes."""
+    kind = compression_of(raw.peek(_MAGIC_SIZE)[:_MAGIC_SIZE])
+    if kind == "gzip":
+        import gzip
+
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if kind == "bz2":
+        import bz2
+
+        return bz2.BZ2File(raw, "rb")
+    if kind == "xz":
+        import lzma
+
+        return lzma.LZMAFile(raw, "rb")
+    return raw
+
+
+def _compressing(raw: BinaryIO, kind: Compression, level: int) -> BinaryIO:
+    """A writer compressing into ``raw``; closing it leaves ``raw`` open."""
+    level = min(9, max(0, level))
+    if kind == "gzip":
+        import gzip
+
+        return gzip.GzipFile(filename="", fileobj=raw, mode="wb", compresslevel=level)
+    if kind == "bz2":
+        import bz2
+
+        return bz2.BZ2File(raw, "wb", compresslevel=max(1, level))
+    if kind == "xz":
+        import lzma
+
+        return lzma.LZMAFile(raw, "wb", preset=level)
+    raise ValueError(f"Unknown compression: {kind}")
+
+
+@contextmanager
+def open_decompressed(path: str) -> Iterator[BinaryIO]:
+    """Open ``path`` for reading, decompressing it on the fly if it is compressed."""
+    with open(path, "rb") as raw:
+        fh = _decompressing(raw)
+        try:
+            yield fh
+        finally:
+            if fh is not raw:
+                fh.close()
+
+
+def decompress(data: bytes) -> bytes:
+    """``data`` decompressed if it starts with a known magic, else as is."""
+    kind = compression_of(data[:_MAGIC_SIZE])
+    if kind == "gzip":
+        import gzip
+
+        return gzip.decompress(data)
+    if kind == "bz2":
+        import bz2
+
+        return bz2.decompress(data)
+    if kind == "xz":
+        import lzma
+
+        return lzma.decompress(data)
+    return data
+
+
+def iter_decoded_chunks(
+    path: str,
+    encoding: str = "utf-8",
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[str, int]]:
+    """Decode ``path`` incrementally, yielding ``(text, bytes_read)`` pairs.
+
+    Multibyte sequences split across reads are carried over by the
+    incremental decoder, and CRLF/CR are folded into LF even when the pair
+    straddles a chunk boundary. Decoding errors raise ``UnicodeDecodeError``
+    as soon as the offending chunk is reached. Compressed files are
+    decompressed on the fly; ``bytes_read`` then counts compressed bytes.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    folder = _NewlineFolder()
+    with open(path, "rb") as raw:
+        fh = _decompressing(raw)
+        try:
+            while True:
+                data = fh.read(chunk_size)
+                final = not data
+                text = folder.feed(decoder.decode(data, final=final), final)
+                if text or final:
+                    yield text, raw.tell()
+                if final:
+                    return
+        finally:
+            if fh is not raw:
+                fh.close()
+
+
 essential_newline = "\n"
 
+# fsync policies for write_chunks():
+#   "none" - rely on the OS to flush; fastest, may lose the file on power loss
+#   "file" - fsync the temp file before the rename (default)
+#   "full" - also fsync the directory so the rename itself is durable
+Durability = Literal["none", "file", "full"]
+DURABILITY_LEVELS: tuple[Durability, ...] = ("none", "file", "full")
 
-def write_text(path: str, text: str, encoding: str = "utf-8") -> None:
-    p = Path(path)
-    # Normalize newlines to \n when writing; OS will handle conversions if needed
-    content = text.replace("\r\n", essential_newline).replace("\r", essential_newline)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(content, encoding=encoding)
+
+def write_chunks(
+    path: str,
+    chunks: Iterable[str],
+    encoding: str = "utf-8",
+    newline: str = essential_newline,
+    durability: Durability = "file",
+    compression: Compression | None = None,
+    level: int = DEFAULT_COMPRESSION_LEVEL,
+    bom: bytes | None = None,
+) -> int:
+    """Stream ``chunks`` to ``path`` atomically; returns bytes written.
+
+    Text is newline-normalized and encoded one chunk at a time into a temp
+    file next to the target, which then replaces the target with
+    ``os.replace``. A failure at any point leaves the original untouched.
+    Line breaks are written as ``newline``; ``bom`` (e.g. what
+    :func:`detect_bom` found) is written as is, before text encoded without
+    one, while None leaves the BOM to the codec. With ``compression`` the
+    encoded text is compressed as it is written.
+    """
+    target = Path(os.path.realpath(path))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = _open_temp(target)
+    try:
+        encoder = codecs.getincrementalencoder(encoding if bom is None else body_codec(encoding, bom))()
+        folder = _NewlineFolder()
+        with os.fdopen(fd, "wb") as fh:
+            out = _compressing(fh, compression, level) if compression else fh
+            if bom:
+                out.write(bom)
+            for chunk in chunks:
+                text = folder.feed(chunk)
+                if newline != essential_newline and essential_newline in text:
+                    text = text.replace(essential_newline, newline)
+                out.write(encoder.encode(text))
+            out.write(encoder.encode(folder.feed("", final=True).replace(essential_newline, newline), final=True))
+            if out is not fh:
+                out.close()  # writes the trailer
+            written = fh.tell()
+            fh.flush()
+            if durability != "none":
+                os.fsync(fh.fileno())
+        _copy_mode(target, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    if durability == "full":
+        _fsync_dir(target.parent)
+    return written
+
+
+def write_text(
+    path: str,
+    text: str,
+    encoding: str = "utf-8",
+    newline: str = essential_newline,
+    bom: bytes | None = None,
+) -> None:
+    # Chunked, so line breaks are converted a chunk at a time, not on a copy of it all
+    step = CHUNK_SIZE
+    write_chunks(
+        path, (text[i:i + step] for i in range(0, len(text), step)), encoding=encoding, newline=newline, bom=bom
+    )
+
+
+def _open_temp(target: Path) -> tuple[int, str]:
+    # Like mkstemp, but honours the umask (0o666) so new files get normal modes
+    import secrets  # pulls in hashlib; only needed once something is saved
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(100):
+        tmp = str(target.parent / f".{target.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(tmp, flags, 0o666), tmp
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Could not create a temp file next to {target}")
+
+
+def _copy_mode(target: Path, tmp: str) -> None:
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        return
+    os.chmod(tmp, mode)
+
+
+def _fsync_dir(directory: Path) -> None:
+    if not hasattr(os, "O_DIRECTORY"):  # Windows cannot open directories
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
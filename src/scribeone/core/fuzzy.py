@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import heapq
+import re
+from itertools import compress
+from typing import Iterable
+
+# Characters after which a match counts as the start of a word
+_BOUNDARY = frozenset("/\\_-. ")
+# At most this many candidates are scored; larger sets are narrowed first
+_SCORE_LIMIT = 2000
+
+
+def _subsequence(q: str) -> str:
+    """Regex matching ``q`` as a subsequence from the start, without backtracking.
+
+    Each gap excludes the character that ends it, so there is exactly one
+    way to match.
+    """
+    return "".join(f"[^{re.escape(ch)}]*{re.escape(ch)}" for ch in q)
+
+
+def fuzzy_score(query: str, text: str) -> int | None:
+    """Score ``text`` for the lowercase subsequence ``query``; None if absent.
+
+    The tightest window ending at the earliest complete match is scored:
+    every character earns a base score, more when it directly follows the
+    previous one or else starts a word, and gaps inside the window cost.
+    Both strings must already be lowercase.
+    """
+    end = 0
+    for ch in query:
+        end = text.find(ch, end) + 1
+        if not end:
+            return None
+    start = end
+    for ch in reversed(query):
+        start = text.rfind(ch, 0, start)
+    score = 0
+    prev = start - 2
+    pos = start
+    for ch in query:
+        k = text.find(ch, pos, end)
+        score += 10
+        if k == prev + 1:
+            score += 18
+        elif k == 0 or text[k - 1] in _BOUNDARY:
+            score += 12
+        prev = k
+        pos = k + 1
+    return score - (end - start - len(query))
+
+
+class FuzzyIndex:
+    """Paths searchable by subsequence, fast enough to filter on each keystroke.
+
+    Candidates are picked by a backtracking-free regex mapped over all keys
+    (the loop runs in C), narrowed from the previous result while the query
+    only grows, and just those are scored. Keys are what the user sees and
+    types against (e.g. root-relative paths).
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._keys: list[str] = []  # lowercase
+        self._names: list[str] = []  # the keys' last components
+        self._paths: list[str] = []
+        self._index: dict[str, int] = {}
+        self._last: tuple[str, list[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def extend(self, items: Iterable[tuple[str, str]]) -> None:
+        """Add ``(key, path)`` pairs; paths already present are ignored."""
+        for key, path in items:
+            if path not in self._index:
+                self._index[path] = len(self._paths)
+                key = key.lower()
+                self._keys.append(key)
+                self._names.append(key[key.rfind("/") + 1:])
+                self._paths.append(path)
+                self._last = None
+
+    def search(self, query: str, limit: int = 50, boost: dict[str, int] | None = None) -> list[str]:
+        """Best ``limit`` paths for ``query`` (whitespace ignored), best first.
+
+        ``boost`` adds to the score of particular paths (e.g. recent files).
+        """
+        q = "".join(query.lower().split())
+        if not q:
+            return []
+        hits = self._candidates(q)
+        keys, names, paths = self._keys, self._names, self._paths
+        boost = boost or {}
+        if len(hits) > _SCORE_LIMIT:
+            # Short queries match nearly everything: prefer matches within the
+            # file name, and always score the boosted paths
+            in_name = re.compile(_subsequence(q)).match
+            hits = list(compress(hits, map(in_name, map(names.__getitem__, hits)))) or hits
+            if len(hits) > _SCORE_LIMIT:
+                hits = set(hits[:_SCORE_LIMIT]).union(self._index[p] for p in boost if p in self._index)
+        scored = []
+        for i in hits:
+            key = keys[i]
+            s = fuzzy_score(q, key)
+            if s is None:
+                continue
+            if fuzzy_score(q, names[i]) is not None:
+                s += 30  # the whole match fits in the file name
+            scored.append((s + boost.get(paths[i], 0), -len(key), -i))
+        return [paths[-i] for _, _, i in heapq.nlargest(limit, scored)]
+
+    def _candidates(self, q: str) -> list[int]:
+        match = re.compile(_subsequence(q)).match
+        keys = self._keys
+        if self._last is not None and q.startswith(self._last[0]):
+            # The query grew: only earlier candidates can still match
+            pool = self._last[1]
+            hits = list(compress(pool, map(match, map(keys.__getitem__, pool))))
+        else:
+            hits = list(compress(range(len(keys)), map(match, keys)))
+        self._last = (q, hits)
+        return hits
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import json
+import os
+from bisect import bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .document import normalize_newlines
+from .piece_table import Piece, PieceTable, utf16_len
+
+JOURNAL_SUFFIX = ".journal"
+# A journal is in use while some process holds a lock on its sibling lock file
+LOCK_SUFFIX = ".lock"
+# Rewrite the journal as a checkpoint once this many edit bytes pile up
+COMPACT_BYTES = 4 << 20
+_VERSION = 1
+
+# Lock files this process holds open, by journal
+_held: dict[Path, int] = {}
+
+
+def fingerprint(path: str | None) -> list[int] | None:
+    """``[size, mtime_ns]`` of ``path``, or None if it does not exist."""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+@dataclass
+class RecoveredDocument:
+    journal: Path
+    path: str | None
+    encoding: str
+    base: tuple[Piece, ...]  # the file as re-read from disk
+    pieces: tuple[Piece, ...]  # the recovered buffer, sharing text with base
+    base_changed: bool  # the file on disk differs from the journal's base
+
+    @property
+    def text(self) -> str:
+        return PieceTable.from_pieces(self.pieces).text()
+
+
+class EditJournal:
+    """Append-only, crash-safe log of the edits made to one document.
+
+    The journal describes the buffer relative to its *base*: the file as it
+    was last loaded or saved (empty for untitled documents). Each
+    ``contentsChange`` delta is recorded as one JSON line; ``flush`` hands
+    pending lines to a single background writer that appends and fsyncs, so
+    I/O scales with edit volume. Once the log grows past ``COMPACT_BYTES``
+    it is rewritten as a checkpoint: ranges of the base plus only the text
+    that was actually typed or pasted. Once written, the journal is locked
+    as in use (see :func:`journal_in_use`), so other running instances do
+    not mistake it for a leftover.
+    """
+
+    def __init__(self, directory: Path, path: str | None, encoding: str, base: tuple[Piece, ...]) -> None:
+        self.directory = Path(directory)
+        self.file = self.directory / f"{os.urandom(16).hex()}{JOURNAL_SUFFIX}"
+        self.path = path
+        self.encoding = encoding
+        self._base = base
+        self._base_fp = fingerprint(path)
+        self._pending: list[str] = []
+        self._started = False
+        self._claimed = False  # lock taken on self.file
+        self._log_bytes = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal")
+
+    @classmethod
+    def adopt(
+        cls,
+        directory: Path,
+        recovered: RecoveredDocument,
+        base: tuple[Piece, ...],
+        pieces: tuple[Piece, ...],
+    ) -> "EditJournal":
+        """Continue a recovered journal, rewritten against the current base."""
+        journal = cls(directory, recovered.path, recovered.encoding, base)
+        journal.file = recovered.journal
+        journal.checkpoint(pieces)
+        return journal
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._log_bytes >= COMPACT_BYTES
+
+    # ----- recording (GUI thread) -----
+    def record(self, position: int, removed: int, text: str) -> None:
+        line = json.dumps({"p": position, "r": removed, "t": text}, ensure_ascii=False)
+        self._pending.append(line)
+        self._log_bytes += len(line)
+
+    def flush(self) -> Future | None:
+        if not self._pending:
+            return None
+        lines, self._pending = self._pending, []
+        header = None if self._started else self._header()
+        self._started = True
+        self._claim()
+        return self._executor.submit(self._append, self.file, header, lines)
+
+    def checkpoint(self, pieces: tuple[Piece, ...]) -> Future:
+        """Replace the log with one compacted record describing ``pieces``."""
+        self._pending.clear()
+        self._started = True
+        self._log_bytes = 0
+        self._claim()
+        return self._executor.submit(self._rewrite, self.file, self._header(), self._base, pieces)
+
+    def rebase(self, path: str, encoding: str, base: tuple[Piece, ...], pieces: tuple[Piece, ...] | None) -> None:
+        """The document was saved as ``base``; ``pieces`` is the live buffer.
+
+        With no unsaved changes left (``pieces`` is None) the journal file is
+        deleted; otherwise it is rewritten against the new base.
+        """
+        self.path = path
+        self.encoding = encoding
+        self._base = base
+        self._base_fp = fingerprint(path)
+        if pieces is None:
+            self.discard()
+        else:
+            self.checkpoint(pieces)
+
+    def discard(self) -> None:
+        self._pending.clear()
+        self._started = False
+        self._log_bytes = 0
+        self._claimed = False
+        self._executor.submit(delete_journal, self.file)
+
+    def spill(self, pieces: tuple[Piece, ...]) -> None:
+        """Write ``pieces`` out as plain text and close, so the buffer can be dropped.
+
+        Unlike a checkpoint the record does not refer to the base file, so
+        ``recover(file, with_base=False)`` brings the text back as it was.
+        The file stays locked as in use until :func:`delete_journal`.
+        """
+        self._pending.clear()
+        self._started = True
+        self._log_bytes = 0
+        self._claim()
+        self._executor.submit(self._rewrite, self.file, self._header(), (), pieces)
+        self.close()
+
+    def close(self) -> None:
+        """Wait for queued writes; the file stays unless discarded first."""
+        self._executor.shutdown(wait=True)
+
+    def _claim(self) -> None:
+        # Locked on the writer thread, so it is ordered with unlinks queued before
+        if not self._claimed:
+            self._claimed = True
+            self._executor.submit(_hold, self.file)
+
+    # ----- worker side -----
+    def _header(self) -> str:
+        return json.dumps(
+            {"v": _VERSION, "path": self.path, "encoding": self.encoding, "base": self._base_fp},
+            ensure_ascii=False,
+        )
+
+    @staticmethod
+    def _append(file: Path, header: str | None, lines: list[str]) -> None:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with open(file, "a", encoding="utf-8") as fh:
+            if header is not None:
+                fh.write(header + "\n")
+            fh.write("\n".join(lines) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    @staticmethod
+    def _rewrite(file: Path, header: str, base: tuple[Piece, ...], pieces: tuple[Piece, ...]) -> None:
+        record = json.dumps({"c": _checkpoint(base, pieces)}, ensure_ascii=False)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(header + "\n" + record + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, file)
+
+
+def _checkpoint(base: tuple[Piece, ...], pieces: tuple[Piece, ...]) -> list:
+    """Express ``pieces`` as ``[start, length]`` base ranges and literal text."""
+    # Per source string: sorted (start, end, base offset in units) of base pieces
+    spans: dict[int, list[tuple[int, int, int, bool]]] = {}
+    offset = 0
+    for src, start, end, units in base:
+        spans.setdefault(id(src), []).append((start, end, offset, units == end - start))
+        offset += units
+    for entries in spans.values():
+        entries.sort()
+    out: list = []
+    for src, start, end, units in pieces:
+        entries = spans.get(id(src))
+        hit = None
+        if entries:
+            i = bisect_right(entries, (start, float("inf"))) - 1
+            if i >= 0 and entries[i][0] <= start and end <= entries[i][1]:
+                hit = entries[i]
+        if hit is None:
+            text = src[start:end]
+            if out and isinstance(out[-1], str):
+                out[-1] += text
+            else:
+                out.append(text)
+            continue
+        b_start, _, b_offset, bmp = hit
+        at = b_offset + (start - b_start if bmp else utf16_len(src[b_start:start]))
+        if out and isinstance(out[-1], list) and out[-1][0] + out[-1][1] == at:
+            out[-1][1] += units
+        else:
+            out.append([at, units])
+    return out
+
+
+def _lock_file(file: Path) -> Path:
+    return file.with_suffix(LOCK_SUFFIX)
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _hold(file: Path) -> None:
+    """Lock ``file`` as in use by this process until :func:`delete_journal` or exit."""
+    if file in _held:
+        return
+    try:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(_lock_file(file), os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return  # unlocked, so other instances may offer to recover it
+    if _try_lock(fd):
+        _held[file] = fd
+    else:
+        os.close(fd)
+
+
+def journal_in_use(file: Path) -> bool:
+    """Whether a live process (this one included) holds ``file``."""
+    if file in _held:
+        return True
+    try:
+        fd = os.open(_lock_file(file), os.O_RDWR)
+    except OSError:
+        return False
+    try:
+        # The lock goes with the descriptor, so taking it frees it again
+        return not _try_lock(fd)
+    finally:
+        os.close(fd)
+
+
+def delete_journal(file: Path) -> None:
+    """Remove ``file``, then drop its lock."""
+    file.unlink(missing_ok=True)
+    fd = _held.pop(file, None)
+    if fd is not None:
+        os.close(fd)
+    try:
+        _lock_file(file).unlink(missing_ok=True)
+    except OSError:
+        pass  # still open in another process (Windows)
+
+
+def list_journals(directory: Path) -> list[Path]:
+    """Journals left behind in ``directory``, newest first."""
+    try:
+        files = [p for p in Path(directory).iterdir() if p.suffix == JOURNAL_SUFFIX]
+    except OSError:
+        return []
+    return sorted(files, key=lambda p: p.stat().st_mtime, reverse=True)
+
+
+def recover(file: Path, with_base: bool = True) -> RecoveredDocument:
+    """Rebuild the text described by a journal.
+
+    The base file is re-read and decoded with the recorded encoding, then the
+    checkpoint (if any) and every complete edit record are replayed. A torn
+    final line from a crash mid-append is ignored. A spilled journal (see
+    :meth:`EditJournal.spill`) needs no base: pass ``with_base=False``.
+    """
+    from .fileio import read_text
+
+    with open(file, encoding="utf-8") as fh:
+        lines = fh.read().split("\n")
+    try:
+        header = json.loads(lines[0])
+    except (IndexError, ValueError):
+        raise ValueError(f"Not a journal: {file}")
+    path = header.get("path")
+    encoding = header.get("encoding") or "utf-8"
+    base_text = ""
+    if with_base and path and os.path.exists(path):
+        base_text = normalize_newlines(read_text(path, encoding=encoding))
+    base_changed = bool(path) and fingerprint(path) != header.get("base")
+    base = PieceTable(base_text)
+    table = PieceTable.from_pieces(base.snapshot())
+    for line in lines[1:]:
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            break  # torn write at the tail
+        if "c" in rec:
+            pieces: list[Piece] = []
+            for part in rec["c"]:
+                if isinstance(part, list):
+                    pieces.extend(base.range_pieces(part[0], part[0] + part[1]))
+                elif part:
+                    pieces.append((part, 0, len(part), utf16_len(part)))
+            table = PieceTable.from_pieces(pieces)
+        else:
+            table.replace(rec["p"], rec["r"], rec["t"])
+    return RecoveredDocument(Path(file), path, encoding, base.snapshot(), table.snapshot(), base_changed)
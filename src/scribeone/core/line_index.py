@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from typing import Callable
+
+# Bytes per index block; each block costs one 8-byte entry
+BLOCK_SIZE = 1 << 16
+# Longest line slice handed out by line_bytes(); longer lines are cut
+MAX_LINE_BYTES = 1 << 16
+
+
+class LineIndex:
+    """Sparse line index over a byte buffer such as an ``mmap``.
+
+    Instead of storing every line start, it stores the number of newlines
+    before each fixed-size block. Memory is ``8 * size / BLOCK_SIZE`` bytes,
+    and any line or offset lookup scans at most one block. Line numbers are
+    0-based; ``\\n`` terminates a line, so any ASCII-compatible encoding works.
+    """
+
+    def __init__(self, data, block_size: int = BLOCK_SIZE) -> None:
+        self.data = data
+        self.size = len(data)
+        self.block_size = block_size
+        # _counts[i] = newlines in data[:i * block_size]
+        self._counts = array("Q", [0])
+        self.indexed = 0  # bytes covered so far
+
+    @property
+    def complete(self) -> bool:
+        return self.indexed >= self.size
+
+    @property
+    def line_count(self) -> int:
+        """Lines known so far (all lines once ``complete``)."""
+        lines = self._counts[-1] + self._count(self._block_start(len(self._counts) - 1), self.indexed)
+        if self.complete:
+            ends_with_newline = self.size > 0 and self.data[self.size - 1:self.size] == b"\n"
+            return lines + (0 if ends_with_newline else 1)
+        return lines
+
+    def build(
+        self,
+        progress: Callable[[int, int], None] | None = None,
+        cancelled: Callable[[], bool] | None = None,
+        step: int = 64,
+    ) -> bool:
+        """Index the remaining blocks; returns False if ``cancelled`` fired."""
+        while not self.complete:
+            if cancelled is not None and cancelled():
+                return False
+            for _ in range(step):
+                end = min(self.size, self.indexed + self.block_size)
+                total = self._counts[-1] + self._count(self._block_start(len(self._counts) - 1), end)
+                if end - self._block_start(len(self._counts) - 1) == self.block_size:
+                    self._counts.append(total)
+                self.indexed = end
+                if self.complete:
+                    break
+            if progress is not None:
+                progress(self.indexed, self.size)
+        return True
+
+    def export(self) -> bytes | None:
+        """The block counts of a complete index, for :meth:`restore` later."""
+        return self._counts.tobytes() if self.complete else None
+
+    def restore(self, blob: bytes) -> bool:
+        """Adopt counts from :meth:`export` instead of building; False if they don't fit.
+
+        The caller must make sure ``data`` is unchanged since the export
+        (e.g. same size and mtime); only the block count is checked here.
+        """
+        counts = array("Q")
+        try:
+            counts.frombytes(blob)
+        except ValueError:
+            return False
+        if len(counts) != self.size // self.block_size + 1 or counts[0] != 0:
+            return False
+        self._counts = counts
+        self.indexed = self.size
+        return True
+
+    def line_start(self, line: int) -> int | None:
+        """Byte offset where ``line`` starts, or None if not indexed yet."""
+        if line <= 0:
+            return 0
+        if line >= self.line_count:
+            return None
+        # Find the last block that starts before the line'th newline
+        block = bisect_right(self._counts, line - 1) - 1
+        pos = self._block_start(block)
+        seen = self._counts[block]
+        while seen < line:
+            pos = self.data.find(b"\n", pos) + 1
+            seen += 1
+        return pos
+
+    def line_of(self, offset: int) -> int:
+        """0-based line containing byte ``offset``.
+
+        Past the indexed part this counts from the last indexed block, so it
+        is slower there (but still reads one block at a time).
+        """
+        offset = max(0, min(offset, self.size))
+        block = min(offset // self.block_size, len(self._counts) - 1)
+        return self._counts[block] + self._count(self._block_start(block), offset)
+
+    def line_bytes(self, line: int, limit: int = MAX_LINE_BYTES) -> tuple[bytes, bool]:
+        """Raw bytes of ``line`` without its terminator, plus a truncated flag."""
+        start = self.line_start(line)
+        if start is None:
+            return b"", False
+        end = self.data.find(b"\n", start, start + limit + 1)
+        truncated = False
+        if end < 0:
+            end = min(self.size, start + limit)
+            truncated = end < self.size and self.data[end:end + 1] != b"\n"
+        raw = self.data[start:end]
+        if raw.endswith(b"\r"):
+            raw = raw[:-1]
+        return raw, truncated
+
+    def _block_start(self, block: int) -> int:
+        return block * self.block_size
+
+    def _count(self, start: int, end: int) -> int:
+        # mmap has no count(); slice one block at a time so no copy outgrows it
+        count = 0
+        for pos in range(start, end, self.block_size):
+            count += self.data[pos:min(end, pos + self.block_size)].count(b"\n")
+        return count
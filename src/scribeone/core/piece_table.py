@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from typing import Iterator
+
+# Code points outside the BMP occupy two UTF-16 code units (a surrogate pair)
+_ASTRAL = re.compile("[\U00010000-\U0010FFFF]")
+
+# Typing runs are coalesced into one piece until they reach this size
+_COALESCE_MAX = 4096
+
+# Pieces larger than this are sliced when streamed through iter_chunks()
+CHUNK_CHARS = 1 << 20
+
+# A piece is (source, start, end, units): the slice source[start:end] and its
+# length in UTF-16 code units. Tuples are immutable, so snapshots can share them.
+Piece = tuple[str, int, int, int]
+
+
+def utf16_len(s: str) -> int:
+    """Length of ``s`` in UTF-16 code units (Qt's position unit)."""
+    if s.isascii():
+        return len(s)
+    return len(s) + len(_ASTRAL.findall(s))
+
+
+def _cp_offset(src: str, start: int, end: int, units: int) -> int:
+    """Map a UTF-16 offset inside ``src[start:end]`` to a code point index."""
+    cp = start
+    remaining = units
+    for m in _ASTRAL.finditer(src, start, end):
+        gap = m.start() - cp
+        if remaining <= gap:
+            return cp + remaining
+        remaining -= gap
+        cp = m.start()
+        if remaining <= 1:
+            # A position inside a surrogate pair snaps to the pair's start
+            return cp
+        remaining -= 2
+        cp += 1
+    return min(end, cp + remaining)
+
+
+def _split(piece: Piece, k: int) -> tuple[Piece, Piece]:
+    src, start, end, units = piece
+    if units == end - start:
+        mid = start + k
+    else:
+        mid = _cp_offset(src, start, end, k)
+    left_units = utf16_len(src[start:mid]) if units != end - start else k
+    return (src, start, mid, left_units), (src, mid, end, units - left_units)
+
+
+class PieceTable:
+    """Text buffer made of immutable pieces, addressed in UTF-16 code units.
+
+    Edits only touch the piece list, never the loaded text, so an insert or
+    delete costs O(pieces) regardless of the buffer size. The full string is
+    built lazily by ``text()`` and cached until the next edit.
+    """
+
+    __slots__ = ("_pieces", "_starts", "_length", "_cache")
+
+    def __init__(self, text: str = "") -> None:
+        self._pieces: list[Piece] = []
+        self._starts: list[int] | None = None
+        self._length = 0
+        self._cache: str | None = None
+        if text:
+            self.append(text)
+
+    @classmethod
+    def from_pieces(cls, pieces: tuple[Piece, ...] | list[Piece]) -> "PieceTable":
+        table = cls()
+        table._pieces = list(pieces)
+        table._length = sum(p[3] for p in table._pieces)
+        return table
+
+    # ----- queries -----
+    def __len__(self) -> int:
+        return self._length
+
+    def piece_count(self) -> int:
+        return len(self._pieces)
+
+    def text(self) -> str:
+        if self._cache is None:
+            if len(self._pieces) == 1:
+                src, start, end, _ = self._pieces[0]
+                self._cache = src if (start == 0 and end == len(src)) else src[start:end]
+            else:
+                self._cache = "".join(src[start:end] for src, start, end, _ in self._pieces)
+        return self._cache
+
+    def slice(self, start: int, end: int) -> str:
+        if self._cache is not None and self._cache.isascii():
+            return self._cache[max(0, start):max(0, end)]
+        return "".join(src[s:e] for src, s, e, _ in self.range_pieces(start, end))
+
+    def range_pieces(self, start: int, end: int) -> list[Piece]:
+        """Pieces covering ``[start, end)``; they share text with this table."""
+        start = max(0, start)
+        end = min(self._length, end)
+        if start >= end:
+            return []
+        i, offset = self._locate(start)
+        out: list[Piece] = []
+        pos = start
+        while pos < end and i < len(self._pieces):
+            piece = self._pieces[i]
+            if pos > offset:
+                piece = _split(piece, pos - offset)[1]
+            take = min(piece[3], end - pos)
+            if take < piece[3]:
+                piece = _split(piece, take)[0]
+            out.append(piece)
+            pos += piece[3]
+            offset = pos
+            i += 1
+        return out
+
+    def iter_chunks(self, max_chars: int = CHUNK_CHARS) -> Iterator[str]:
+        """Yield the buffer as consecutive strings of at most ``max_chars``."""
+        for src, start, end, _ in self._pieces:
+            while end - start > max_chars:
+                yield src[start:start + max_chars]
+                start += max_chars
+            if end > start:
+                yield src[start:end]
+
+    def snapshot(self) -> tuple[Piece, ...]:
+        """Immutable view of the current contents; O(pieces), shares text."""
+        return tuple(self._pieces)
+
+    # ----- edits -----
+    def append(self, text: str) -> None:
+        if not text:
+            return
+        self._pieces.append((text, 0, len(text), utf16_len(text)))
+        if self._starts is not None:
+            self._starts.append(self._length)
+        self._length += self._pieces[-1][3]
+        self._cache = None
+
+    def insert(self, pos: int, text: str) -> None:
+        if not text:
+            return
+        pos = max(0, min(pos, self._length))
+        units = utf16_len(text)
+        self._cache = None
+        if pos == self._length:
+            if self._pieces and self._coalesce(len(self._pieces) - 1, text, units):
+                return
+            self.append(text)
+            return
+        i, offset = self._locate(pos)
+        if pos == offset:
+            if i > 0 and self._coalesce(i - 1, text, units):
+                return
+            self._pieces.insert(i, (text, 0, len(text), units))
+        else:
+            left, right = _split(self._pieces[i], pos - offset)
+            self._pieces[i:i + 1] = [left, (text, 0, len(text), units), right]
+        self._length += units
+        self._starts = None
+
+    def delete(self, pos: int, count: int) -> str:
+        """Remove ``count`` units at ``pos`` and return the removed text."""
+        pos = max(0, pos)
+        end = min(self._length, pos + count)
+        if pos >= end:
+            return ""
+        removed = self.slice(pos, end)
+        first, offset = self._locate(pos)
+        keep: list[Piece] = []
+        last = first
+        piece_start = offset
+        while last < len(self._pieces) and piece_start < end:
+            piece = self._pieces[last]
+            piece_end = piece_start + piece[3]
+            if piece_start < pos:
+                keep.append(_split(piece, pos - piece_start)[0])
+            if piece_end > end:
+                keep.append(_split(piece, end - piece_start)[1])
+            piece_start = piece_end
+            last += 1
+        self._pieces[first:last] = keep
+        self._length -= end - pos
+        self._starts = None
+        self._cache = None
+        return removed
+
+    def replace(self, pos: int, removed: int, text: str) -> str:
+        old = self.delete(pos, removed) if removed else ""
+        self.insert(pos, text)
+        return old
+
+    # ----- internals -----
+    def _locate(self, pos: int) -> tuple[int, int]:
+        """Index of the piece containing ``pos`` and that piece's start."""
+        if self._starts is None:
+            starts = []
+            acc = 0
+            for piece in self._pieces:
+                starts.append(acc)
+                acc += piece[3]
+            self._starts = starts
+        if not self._pieces:
+            return 0, 0
+        i = bisect_right(self._starts, pos) - 1
+        i = max(0, i)
+        if pos >= self._length:
+            return len(self._pieces), self._length
+        return i, self._starts[i]
+
+    def _coalesce(self, i: int, text: str, units: int) -> bool:
+        # Extend a previous typing run in place instead of adding a piece
+        src, start, end, piece_units = self._pieces[i]
+        if end != len(src) or start != 0 or end + len(text) > _COALESCE_MAX:
+            return False
+        self._pieces[i] = (src + text, start, end + len(text), piece_units + units)
+        self._length += units
+        if self._starts is not None:
+            for j in range(i + 1, len(self._starts)):
+                self._starts[j] += units
+        return True
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+from .piece_table import utf16_len
+
+# Longest run without a newline that is buffered before a window is cut
+# mid-line; only matches longer than _LONG_LINE_GUARD can be missed there
+_MAX_LINE = 1 << 20
+_LONG_LINE_GUARD = 4096
+
+# Regex constructs that may match a newline; such patterns are rescanned
+# in full after edits instead of line by line
+_SPANNING = re.compile(r"\\n|\\s|\\W|\\D|\\Z|\[\^|\(\?[a-zA-Z]*s")
+
+Match = tuple[int, int]  # start, length in UTF-16 code units
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    pattern: str
+    regex: bool = False
+    case_sensitive: bool = False
+    whole_word: bool = False
+
+    def compile(self) -> re.Pattern[str]:
+        """Raises ``re.error`` for an invalid regular expression."""
+        source = self.pattern if self.regex else re.escape(self.pattern)
+        if self.whole_word:
+            source = rf"\b(?:{source})\b"
+        flags = re.MULTILINE | (0 if self.case_sensitive else re.IGNORECASE)
+        return re.compile(source, flags)
+
+    @property
+    def spans_lines(self) -> bool:
+        """Whether a match may contain a newline (conservative for regexes)."""
+        if "\n" in self.pattern:
+            return True
+        return self.regex and bool(_SPANNING.search(self.pattern))
+
+
+def iter_matches(
+    chunks: Iterable[str],
+    rx: re.Pattern[str],
+    offset: int = 0,
+    cancelled: Callable[[], bool] | None = None,
+    spans_lines: bool = False,
+) -> Iterator[Match]:
+    """Yield non-empty matches of ``rx`` over text streamed as ``chunks``.
+
+    Text is searched in windows cut after the last newline, and the partial
+    line is carried into the next window, so single-line matches are never
+    split by chunk boundaries. A pattern that may match across lines (see
+    :attr:`SearchQuery.spans_lines`) is searched over the joined text
+    instead. Positions are UTF-16 units from ``offset``.
+    """
+    if spans_lines:
+        chunks = ("".join(chunks),)
+    carry = ""
+    base = offset  # units position of carry[0]
+    it = iter(chunks)
+    final = False
+    while not final:
+        chunk = next(it, None)
+        final = chunk is None
+        if cancelled is not None and cancelled():
+            return
+        window = carry + (chunk or "")
+        if final:
+            cut = len(window)
+        else:
+            cut = window.rfind("\n") + 1
+            if cut == 0:
+                if len(window) < _MAX_LINE:
+                    carry = window
+                    continue
+                cut = len(window) - _LONG_LINE_GUARD
+        ascii_window = window.isascii()
+        cp = units = 0  # last converted position in the window
+        resume = cut
+        for m in rx.finditer(window):
+            start, end = m.span()
+            if start >= cut:
+                break
+            if start == end:
+                continue
+            if ascii_window:
+                yield base + start, end - start
+            else:
+                units += utf16_len(window[cp:start])
+                length = utf16_len(window[start:end])
+                cp = end
+                yield base + units, length
+                units += length
+            resume = max(resume, end)
+        carry = window[resume:]
+        base += resume if ascii_window else utf16_len(window[:resume])
+
+
+def replace_all(text: str, rx: re.Pattern[str], replacement: str, expand: bool) -> tuple[int, int, str, int] | None:
+    """Replace every match in one pass; None if nothing matched.
+
+    Returns ``(start, end, text, count)``: the units range from the first
+    match's start to the last match's end and its replacement, joined once.
+    ``expand`` applies ``\\1``/``\\g<name>`` templates (regex mode).
+    """
+    parts: list[str] = []
+    first = last = -1
+    count = 0
+    for m in rx.finditer(text):
+        start, end = m.span()
+        if start == end:
+            continue
+        if first < 0:
+            first = last = start
+        parts.append(text[last:start])
+        parts.append(m.expand(replacement) if expand else replacement)
+        last = end
+        count += 1
+    if not count:
+        return None
+    if text.isascii():
+        return first, last, "".join(parts), count
+    start_units = utf16_len(text[:first])
+    return start_units, start_units + utf16_len(text[first:last]), "".join(parts), count
+
+
+class MatchList:
+    """Sorted, non-overlapping matches that follow edits without a rescan.
+
+    Starts are stored with a pending shift for every index at or after
+    ``_gap``, like a gap buffer: an edit moves the gap to the edit site
+    (touching only the entries in between) and adjusts one integer instead
+    of shifting every later match.
+    """
+
+    __slots__ = ("_starts", "_lens", "_gap", "_delta")
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._starts: list[int] = []
+        self._lens: list[int] = []
+        self._gap = 0
+        self._delta = 0
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, i: int) -> Match:
+        start = self._starts[i] + (self._delta if i >= self._gap else 0)
+        return start, self._lens[i]
+
+    def extend(self, matches: Iterable[Match]) -> None:
+        """Append matches that all lie after the current last one."""
+        self._move_gap(len(self._starts))
+        for start, length in matches:
+            self._starts.append(start)
+            self._lens.append(length)
+        self._gap = len(self._starts)
+
+    def index_at(self, pos: int) -> int:
+        """Index of the first match starting at or after ``pos``."""
+        lo, hi = 0, len(self._starts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self[mid][0] < pos:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def in_range(self, start: int, end: int) -> list[Match]:
+        """Matches overlapping ``[start, end)``."""
+        i = self._first_ending_after(start)
+        out: list[Match] = []
+        while i < len(self._starts):
+            m = self[i]
+            if m[0] >= end:
+                break
+            out.append(m)
+            i += 1
+        return out
+
+    def replace(self, start: int, old_end: int, delta: int, matches: list[Match]) -> None:
+        """An edit changed ``[start, old_end)`` by ``delta`` units; ``matches``
+        (in new coordinates) replace every old match overlapping that range."""
+        i0 = self._first_ending_after(start)
+        i1 = i0
+        while i1 < len(self._starts) and self[i1][0] < old_end:
+            i1 += 1
+        self._move_gap(i0)
+        self._starts[i0:i1] = [m[0] for m in matches]
+        self._lens[i0:i1] = [m[1] for m in matches]
+        self._gap = i0 + len(matches)
+        self._delta += delta
+
+    def _first_ending_after(self, pos: int) -> int:
+        lo, hi = 0, len(self._starts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            s, n = self[mid]
+            if s + n <= pos:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _move_gap(self, k: int) -> None:
+        starts, delta = self._starts, self._delta
+        if not delta:
+            self._gap = k
+            return
+        if k > self._gap:
+            for i in range(self._gap, k):
+                starts[i] += delta
+        else:
+            for i in range(k, self._gap):
+                starts[i] -= delta
+        self._gap = k
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import codecs
+import os
+
+from .document import normalize_newlines
+from .fileio import CHUNK_SIZE, _NewlineFolder, is_ascii_compatible
+
+# Bytes before the read offset kept to notice a file rewritten in place
+_PROBE_SIZE = 64
+# Step used when scanning backwards for the start of the last lines
+_BACK_STEP = 64 * 1024
+
+
+def read_tail(path: str, max_lines: int, encoding: str = "utf-8") -> tuple[str, int]:
+    """The last ``max_lines`` complete lines of ``path`` and the offset after them.
+
+    Only the tail of the file is read. A final line that is still being
+    written is left for :class:`LogTail` to pick up from the offset.
+    """
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        if not is_ascii_compatible(encoding):
+            # "\n" cannot be found bytewise: decode it all and keep the end
+            f.seek(0)
+            data = f.read()
+            text = normalize_newlines(data.decode(encoding, errors="replace"))
+            return "\n".join(text.split("\n")[-max_lines - 1:]), size
+        start = size
+        data = b""
+        while start > 0 and data.count(b"\n") <= max_lines:
+            step = min(_BACK_STEP, start)
+            start -= step
+            f.seek(start)
+            data = f.read(step) + data
+    end = data.rfind(b"\n") + 1  # complete lines only
+    lines = data[:end].split(b"\n")
+    keep = b"\n".join(lines[-max_lines - 1:]) if len(lines) > max_lines + 1 else data[:end]
+    return normalize_newlines(codecs.decode(keep, encoding, errors="replace")), start + end
+
+
+class LogTail:
+    """Read what is appended to a file, following truncation and rotation.
+
+    Each :meth:`read` picks up from the byte offset where the last one
+    stopped. Multibyte characters and CRLF pairs split between reads are
+    carried over. When the file is truncated, rewritten in place or replaced
+    by a new file (log rotation), reading restarts from its beginning.
+    """
+
+    def __init__(self, path: str, encoding: str = "utf-8", offset: int | None = None) -> None:
+        self.path = path
+        self.encoding = encoding
+        st = os.stat(path)
+        self._identity = (st.st_dev, st.st_ino)
+        self.offset = st.st_size if offset is None else offset
+        self._probe = b""
+        if self.offset:
+            with open(path, "rb") as f:
+                f.seek(max(0, self.offset - _PROBE_SIZE))
+                self._probe = f.read(min(self.offset, _PROBE_SIZE))
+        self._reset_decoder()
+
+    def read(self, limit: int = CHUNK_SIZE) -> tuple[str, bool]:
+        """Decoded text appended since the last read (at most ``limit`` bytes).
+
+        The flag tells that the file was truncated or replaced and the text
+        starts from its beginning. A missing file (mid-rotation) reads as
+        nothing.
+        """
+        try:
+            st = os.stat(self.path)
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return "", False
+        with f:
+            restarted = (st.st_dev, st.st_ino) != self._identity or st.st_size < self.offset
+            if not restarted and self._probe:
+                f.seek(self.offset - len(self._probe))
+                restarted = f.read(len(self._probe)) != self._probe
+            if restarted:
+                self._identity = (st.st_dev, st.st_ino)
+                self.offset = 0
+                self._probe = b""
+                self._reset_decoder()
+            f.seek(self.offset)
+            data = f.read(limit)
+        if data:
+            self.offset += len(data)
+            self._probe = (self._probe + data)[-_PROBE_SIZE:]
+        return self._folder.feed(self._decoder.decode(data)), restarted
+
+    def _reset_decoder(self) -> None:
+        self._decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        self._folder = _NewlineFolder()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+
+def _word_starts(prev: str, text: str) -> int:
+    """Words that start inside ``text`` when it follows the character ``prev``."""
+    n = len(text.split())
+    if n and prev and not prev.isspace() and not text[0].isspace():
+        n -= 1  # the first run continues a word that started before ``text``
+    return n
+
+
+def _starts_word(prev: str, ch: str) -> bool:
+    return bool(ch) and not ch.isspace() and (not prev or prev.isspace())
+
+
+class TextStats:
+    """Character, line and word counts kept up to date from edit deltas.
+
+    A word is a maximal run of non-whitespace. An edit can only change
+    whether words start inside the replaced range or at the character right
+    after it, so :meth:`apply_edit` looks at the removed and added text plus
+    one character of context on each side and never rescans the buffer.
+    """
+
+    __slots__ = ("chars", "lines", "words")
+
+    def __init__(self, text: str = "") -> None:
+        self.reset(text)
+
+    def reset(self, text: str = "") -> None:
+        self.chars = len(text)
+        self.lines = text.count("\n") + 1
+        self.words = len(text.split())
+
+    def apply_edit(self, before: str, removed: str, added: str, after: str) -> None:
+        """Account for ``removed`` -> ``added`` between characters ``before`` and ``after``.
+
+        ``before``/``after`` are the single characters adjacent to the edit
+        (empty at the buffer ends); appending a chunk is ``after=""``.
+        """
+        self.chars += len(added) - len(removed)
+        self.lines += added.count("\n") - removed.count("\n")
+        old_last = removed[-1] if removed else before
+        new_last = added[-1] if added else before
+        self.words += (
+            _word_starts(before, added) + _starts_word(new_last, after)
+            - _word_starts(before, removed) - _starts_word(old_last, after)
+        )
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+
+from .fileio import detect_encoding, iter_decoded_chunks
+from .search import SearchQuery
+from .workspace_search import is_binary
+
+SCHEMA_VERSION = 1
+# Larger files are not indexed; searches always read them
+MAX_INDEXED_BYTES = 16 * 1024 * 1024
+# Rows written between commits, so readers see progress during a long build
+_COMMIT_EVERY = 200
+# Stale postings tolerated before the trigram table is rebuilt from scratch
+_MIN_DEAD_FOR_REBUILD = 1000
+_REGEX_META = set(".^$*+?{}[]()|\\")
+
+
+def index_file_name(root: str) -> str:
+    """Database file name for the workspace at ``root`` (one index per root)."""
+    return hashlib.sha1(os.path.abspath(root).encode("utf-8", "surrogatepass")).hexdigest()[:16] + ".sqlite"
+
+
+class FileState(NamedTuple):
+    mtime_ns: int
+    size: int
+    indexed: bool  # False: too large or undecodable, so never filtered out
+
+
+def required_literals(query: SearchQuery) -> list[str]:
+    """Substrings every match of ``query`` must contain (may be empty)."""
+    if not query.regex:
+        return [query.pattern]
+    return _regex_literals(query.pattern)
+
+
+def _regex_literals(pattern: str) -> list[str]:
+    # Conservative: only runs of plain characters outside groups, classes
+    # and quantifiers; any alternation or verbose mode gives up entirely
+    if "|" in pattern or "(?x" in pattern:
+        return []
+    runs: list[str] = []
+    cur: list[str] = []
+
+    def flush() -> None:
+        if cur:
+            runs.append("".join(cur))
+            cur.clear()
+
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if nxt and not nxt.isalnum():
+                cur.append(nxt)
+                i += 2
+            else:
+                flush()  # \d, \b, \1, \x41 … are not plain characters
+                i = _skip_escape(pattern, i)
+            continue
+        if c in "([":
+            flush()
+            i = _skip_group(pattern, i)
+            continue
+        if c in "*?{":
+            if cur:
+                cur.pop()  # the quantified character may be absent
+            flush()
+            i = pattern.find("}", i) + 1 if c == "{" else i + 1
+            if i == 0:
+                return []
+            continue
+        if c in _REGEX_META:
+            flush()  # "+": the previous character stays, but the run ends
+            i += 1
+            continue
+        cur.append(c)
+        i += 1
+    flush()
+    return runs
+
+
+def _skip_escape(pattern: str, i: int) -> int:
+    """Index after the letter or digit escape starting at ``i`` (the backslash)."""
+    c = pattern[i + 1:i + 2]
+    j = i + 2
+    width = {"x": 2, "u": 4, "U": 8}.get(c)
+    if width is not None:
+        return j + width
+    if c == "N":  # \N{NAME}
+        end = pattern.find("}", j)
+        return len(pattern) if end < 0 else end + 1
+    if c.isdigit():
+        # As re reads them: \0 or three octal digits is octal, else a 1-2 digit group number
+        head = pattern[i + 1:i + 4]
+        digits = 3 if c == "0" or (len(head) == 3 and all(d in "01234567" for d in head)) else 2
+        j = i + 1
+        while j < min(len(pattern), i + 1 + digits) and pattern[j].isdigit():
+            j += 1
+    return j
+
+
+def _skip_group(pattern: str, i: int) -> int:
+    """Index after the group or class opening at ``i``."""
+    depth = 0
+    in_class = False
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+                if depth == 0:
+                    return i + 1
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return n
+
+
+def _trigram_query(literals: Iterable[str]) -> str | None:
+    grams = {lit[k:k + 3] for lit in literals for k in range(len(lit) - 2)}
+    if not grams:
+        return None
+    return " AND ".join('"' + g.replace('"', '""') + '"' for g in sorted(grams))
+
+
+class WorkspaceIndex:
+    """On-disk trigram index of the text files under one workspace root.
+
+    Contents go into a contentless FTS5 table with the trigram tokenizer at
+    ``detail=none``, so only document-level postings are stored. Such a
+    table cannot delete rows, so a changed file gets a new document id and
+    the old postings are left to be ignored; once stale postings outnumber
+    live ones the table is rebuilt. Each thread opens its own instance.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._db = sqlite3.connect(str(self.path), timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._create()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _create(self) -> None:
+        db = self._db
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            db.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS grams; DROP TABLE IF EXISTS meta;")
+        db.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                doc INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS files_doc ON files(doc);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            CREATE VIRTUAL TABLE IF NOT EXISTS grams USING fts5(
+                body, content='', detail=none, tokenize='trigram case_sensitive 0'
+            );
+            PRAGMA user_version = {SCHEMA_VERSION};
+            """
+        )
+        db.commit()
+
+    def _meta(self, key: str) -> int:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _set_meta(self, key: str, value: int) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", (key, value))
+
+    # ----- reading -----
+    def paths(self) -> list[str]:
+        return [path for (path,) in self._db.execute("SELECT path FROM files")]
+
+    def states(self) -> dict[str, FileState]:
+        rows = self._db.execute("SELECT path, mtime_ns, size, doc IS NOT NULL FROM files")
+        return {path: FileState(mtime, size, bool(indexed)) for path, mtime, size, indexed in rows}
+
+    def candidates(self, literals: Iterable[str]) -> set[str] | None:
+        """Indexed files that may contain every literal; None if the index can't tell."""
+        match = _trigram_query(literals)
+        if match is None:
+            return None
+        rows = self._db.execute(
+            "SELECT path FROM files WHERE doc IN (SELECT rowid FROM grams WHERE grams MATCH ?)", (match,)
+        )
+        return {path for (path,) in rows}
+
+    def find_names(self, text: str, limit: int = 50) -> list[str]:
+        """Paths whose file name contains the characters of ``text`` in order.
+
+        Empty if the index cannot be read (e.g. a pass is still creating it).
+        """
+        text = text.strip().lower()
+        if not text:
+            return []
+        like = "%" + "%".join("\\" + c if c in "%_\\" else c for c in text) + "%"
+        try:
+            rows = self._db.execute(
+                "SELECT path FROM files WHERE name LIKE ? ESCAPE '\\' ORDER BY instr(name, ?) = 0, length(name), path LIMIT ?",
+                (like, text, limit),
+            ).fetchall()
+        except sqlite3.Error:
+            return []
+        return [path for (path,) in rows]
+
+    # ----- writing -----
+    def sync(
+        self,
+        paths: Iterable[str],
+        in_scope: Callable[[str], bool],
+        cancelled: Callable[[], bool] | None = None,
+    ) -> int:
+        """Bring the index in line with ``paths``; returns files (re)indexed.
+
+        ``paths`` is every current file within the scanned scope; known files
+        for which ``in_scope`` holds but that were not listed are dropped.
+        Unchanged files (same mtime and size) are not read again.
+        """
+        if self._meta("dead") > max(_MIN_DEAD_FOR_REBUILD, self._live_docs()):
+            self.rebuild()
+        known = self.states()
+        seen: set[str] = set()
+        changed = 0
+        pending = 0
+        for path in paths:
+            if cancelled is not None and cancelled():
+                break
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            seen.add(path)
+            state = known.get(path)
+            if state is not None and (state.mtime_ns, state.size) == (st.st_mtime_ns, st.st_size):
+                continue
+            self._index_file(path, st)
+            changed += 1
+            pending += 1
+            if pending >= _COMMIT_EVERY:
+                self._db.commit()
+                pending = 0
+        else:
+            gone = [p for p in known if p not in seen and in_scope(p)]
+            self.remove(gone)
+        self._db.commit()
+        return changed
+
+    def remove(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            row = self._db.execute("SELECT doc FROM files WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                continue
+            self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+            if row[0] is not None:
+                self._set_meta("dead", self._meta("dead") + 1)
+        self._db.commit()
+
+    def rebuild(self) -> None:
+        """Drop all postings and mark every file for reindexing."""
+        db = self._db
+        db.execute("DROP TABLE grams")
+        db.execute("UPDATE files SET mtime_ns = -1, doc = NULL")
+        self._set_meta("dead", 0)
+        db.commit()
+        self._create()
+
+    def _live_docs(self) -> int:
+        return self._db.execute("SELECT count(*) FROM files WHERE doc IS NOT NULL").fetchone()[0]
+
+    def _index_file(self, path: str, st: os.stat_result) -> None:
+        old = self._db.execute("SELECT doc FROM files WHERE path = ?", (path,)).fetchone()
+        if old and old[0] is not None:
+            self._set_meta("dead", self._meta("dead") + 1)
+        doc = None
+        text = _read_for_index(path, st.st_size)
+        if text is not None:
+            doc = self._meta("next_doc") + 1
+            self._set_meta("next_doc", doc)
+            self._db.execute("INSERT INTO grams(rowid, body) VALUES (?, ?)", (doc, text))
+        self._db.execute(
+            "INSERT OR REPLACE INTO files(path, name, mtime_ns, size, doc) VALUES (?, ?, ?, ?, ?)",
+            (path, os.path.basename(path).lower(), st.st_mtime_ns, st.st_size, doc),
+        )
+
+
+def indexed_paths(db_path: str) -> list[str]:
+    """Every file in the index at ``db_path``; empty if there is none or it can't be read."""
+    if not os.path.exists(db_path):
+        return []
+    try:
+        index = WorkspaceIndex(db_path)
+        try:
+            return index.paths()
+        finally:
+            index.close()
+    except sqlite3.Error:
+        return []
+
+
+def _read_for_index(path: str, size: int) -> str | None:
+    if size > MAX_INDEXED_BYTES:
+        return None
+    try:
+        encoding = detect_encoding(path).encoding
+        if is_binary(path, encoding):
+            return None
+        return "".join(text for text, _ in iter_decoded_chunks(path, encoding))
+    except (OSError, UnicodeDecodeError, LookupError):
+        return None
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+from .fileio import detect_encoding, is_ascii_compatible, iter_decoded_chunks
+from .search import SearchQuery
+
+# What the explorer shows, and directories nobody wants searched
+DEFAULT_NAME_FILTERS = ("*.txt",)
+DEFAULT_IGNORE = (".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", ".tox")
+# A file with more hits than this is almost certainly a bad query
+MAX_HITS_PER_FILE = 1000
+_PREVIEW_CHARS = 200
+# Longest unfinished line carried between chunks; longer ones are searched in pieces
+MAX_CARRY_CHARS = 1 << 20
+# Bytes sniffed for NUL to skip binary files
+_BINARY_SNIFF = 8192
+
+
+@dataclass(frozen=True)
+class FileHit:
+    path: str
+    line: int  # 1-based
+    column: int  # 1-based, in characters
+    preview: str  # the matching line, trimmed
+
+
+def split_patterns(text: str) -> tuple[str, ...]:
+    """``"*.txt; *.md"`` -> ``("*.txt", "*.md")`` (commas also separate)."""
+    return tuple(p for p in (s.strip() for s in text.replace(",", ";").split(";")) if p)
+
+
+def name_matches(name: str, patterns: Iterable[str]) -> bool:
+    """Whether ``name`` matches any glob in ``patterns``, ignoring case."""
+    name = name.lower()
+    return any(fnmatch.fnmatchcase(name, p.lower()) for p in patterns)
+
+
+def iter_files(
+    root: str,
+    name_filters: Iterable[str] = DEFAULT_NAME_FILTERS,
+    ignore: Iterable[str] = DEFAULT_IGNORE,
+    cancelled: Callable[[], bool] | None = None,
+    recursive: bool = True,
+) -> Iterator[str]:
+    """Yield files under ``root`` whose names match ``name_filters``.
+
+    Entries (files or directories) matching an ``ignore`` pattern are
+    skipped, symlinked directories are not followed, and unreadable
+    directories are passed over silently. Names compare case-insensitively.
+    """
+    name_filters, ignore = tuple(name_filters), tuple(ignore)
+    stack = [root]
+    while stack:
+        if cancelled is not None and cancelled():
+            return
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            if ignore and name_matches(entry.name, ignore):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        subdirs.append(entry.path)
+                elif entry.is_file() and (not name_filters or name_matches(entry.name, name_filters)):
+                    yield entry.path
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+def list_dir(path: str, show_hidden: bool = False) -> tuple[list[str], list[str]]:
+    """Names of the subdirectories and files directly in ``path``, sorted.
+
+    Types come from the directory entries themselves, so nothing is stat'ed
+    on filesystems that report them. Raises ``OSError`` if ``path`` cannot
+    be read.
+    """
+    dirs: list[str] = []
+    files: list[str] = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if not show_hidden and entry.name.startswith("."):
+                continue
+            try:
+                (dirs if entry.is_dir() else files).append(entry.name)
+            except OSError:
+                continue
+    dirs.sort(key=str.casefold)
+    files.sort(key=str.casefold)
+    return dirs, files
+
+
+def is_binary(path: str, encoding: str) -> bool:
+    """NUL bytes near the start mean binary, except in UTF-16/32 text."""
+    if not is_ascii_compatible(encoding):
+        return False
+    with open(path, "rb") as fh:
+        return b"\0" in fh.read(_BINARY_SNIFF)
+
+
+def search_file(path: str, query: SearchQuery) -> list[FileHit]:
+    """Hits for ``query`` in ``path``, decoded as the editor would open it.
+
+    The file is streamed in line-aligned windows, so memory stays bounded by
+    the chunk size plus the longest line, up to ``MAX_CARRY_CHARS``: a longer
+    line (minified JSON, a one-line log) is searched in pieces of about that
+    size, missing matches that straddle two pieces. Files that are binary,
+    unreadable or fail to decode yield what was found before the problem.
+    """
+    rx = query.compile()
+    hits: list[FileHit] = []
+    try:
+        encoding = detect_encoding(path).encoding
+        if is_binary(path, encoding):
+            return hits
+        carry = ""
+        line = 1  # line number of carry[0]
+        column = 0  # characters of that line already searched
+        for text, _ in iter_decoded_chunks(path, encoding):
+            window = carry + text
+            cut = window.rfind("\n") + 1
+            if cut:
+                line = _scan(path, window[:cut], line, rx, hits, column)
+                carry, column = window[cut:], 0
+            else:
+                carry = window
+            if len(carry) > MAX_CARRY_CHARS:
+                _scan(path, carry, line, rx, hits, column)
+                carry, column = "", column + len(carry)
+            if len(hits) >= MAX_HITS_PER_FILE:
+                return hits[:MAX_HITS_PER_FILE]
+        if carry:
+            _scan(path, carry, line, rx, hits, column)
+    except (OSError, UnicodeDecodeError, LookupError):
+        pass
+    return hits[:MAX_HITS_PER_FILE]
+
+
+def _scan(path: str, block: str, line: int, rx, hits: list[FileHit], column: int = 0) -> int:
+    """Append hits in ``block`` (lines from ``line``); returns the next line number.
+
+    ``column`` characters of the block's first line came before the block.
+    """
+    pos = 0
+    for m in rx.finditer(block):
+        start, end = m.span()
+        if start == end:
+            continue
+        line += block.count("\n", pos, start)
+        pos = start
+        line_start = block.rfind("\n", 0, start) + 1
+        line_end = block.find("\n", start)
+        text = block[line_start:line_end if line_end >= 0 else len(block)]
+        offset = column if line_start == 0 else 0
+        hits.append(FileHit(path, line, offset + start - line_start + 1, text.strip()[:_PREVIEW_CHARS]))
+        if len(hits) >= MAX_HITS_PER_FILE:
+            break
+    return line + block.count("\n", pos)
+
+
+def search_files(paths: list[str], query: SearchQuery) -> list[FileHit]:
+    """Search a batch of files; the unit of work handed to pool workers."""
+    hits: list[FileHit] = []
+    for path in paths:
+        hits.extend(search_file(path, query))
+    return hits
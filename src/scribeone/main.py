@@ -1,27 +1,153 @@
 from __future__ import annotations
 
+import os
 import sys
 
-# When run as a module (python -m scribeone.main), relative imports work.
-# When run as a script inside the package folder (python main.py), fix sys.path.
-try:
-    from .app import ScribeApplication  # type: ignore
-    from .ui.main_window import MainWindow  # type: ignore
-except Exception:  # ImportError in script mode
-    if __name__ == "__main__":
-        from pathlib import Path
+# Qt and the UI are imported inside main() so that --startup-profile can time
+# those imports, and so a launch only pays for what the first paint needs.
+if __name__ == "__main__" and not __package__:
+    # Run as a script inside the package folder (python main.py): fix sys.path
+    from pathlib import Path
 
-        sys.path.append(str(Path(__file__).resolve().parents[1]))  # add <repo>/src
-        from scribeone.app import ScribeApplication  # type: ignore
-        from scribeone.ui.main_window import MainWindow  # type: ignore
-    else:
-        raise
+    sys.path.append(str(Path(__file__).resolve().parents[1]))  # add <repo>/src
+
+BATCH_COMMAND = "batch"
+PROFILE_FLAG = "--startup-profile"
+NEW_INSTANCE_FLAG = "--new-instance"
+
+# Qt's own options that take a value; QApplication consumes them, argparse must not
+_QT_VALUE_OPTIONS = frozenset({
+    "-platform", "-platformpluginpath", "-platformtheme", "-plugin", "-style",
+    "-stylesheet", "-session", "-qwindowgeometry", "-qwindowicon", "-qwindowtitle",
+    "-display", "-geometry", "-title",
+})
+
+
+def _split_qt_args(argv: list[str]) -> tuple[list[str], list[str]]:
+    """Separate Qt options (``-platform offscreen`` …) from ScribeOne's own."""
+    ours: list[str] = []
+    qt: list[str] = []
+    it = iter(argv)
+    for arg in it:
+        if arg in _QT_VALUE_OPTIONS:
+            qt += [arg, next(it, "")]
+        elif arg.startswith("-") and not arg.startswith("--") and arg not in ("-", "-h"):
+            qt.append(arg)
+        else:
+            ours.append(arg)
+    return ours, qt
+
+
+def _parse_args(argv: list[str], strict: bool = False):
+    """Parse ScribeOne's own arguments.
+
+    ``strict`` is for command lines from other processes: there is no
+    ``--help``, and bad arguments raise ValueError instead of exiting.
+    """
+    import argparse  # ~10 ms with its gettext/locale imports; skipped for a bare launch
+
+    class Parser(argparse.ArgumentParser):
+        def error(self, message: str):
+            if strict:
+                raise ValueError(message)
+            super().error(message)
+
+    parser = Parser(
+        prog="scribeone",
+        add_help=not strict,
+        description="ScribeOne text editor",
+        epilog=f"Run 'scribeone {BATCH_COMMAND} --help' to convert many files without the GUI.",
+    )
+    parser.add_argument("files", nargs="*", metavar="FILE[:LINE[:COL]]", help="files to open, optionally at a line and column")
+    parser.add_argument(NEW_INSTANCE_FLAG, action="store_true", help="start a separate instance instead of handing files to a running one")
+    parser.add_argument(PROFILE_FLAG, action="store_true", help="print per-phase startup timings and import costs (implies --new-instance)")
+    return parser.parse_args(argv)
+
+
+def _apply_command_line(win, argv: list[str], cwd: str, forwarded: bool = False) -> None:
+    """Open what a command line asks for; shared by launches and handoffs.
+
+    A ``forwarded`` one comes from another process: it must not print or
+    exit here, so one that does not parse is ignored.
+    """
+    from scribeone.utils.single_instance import split_location
+
+    if not argv:
+        return
+    try:
+        args = _parse_args(argv, strict=forwarded)
+    except ValueError:
+        return
+    # One tab each, in order; the last one ends up current
+    for arg in args.files:
+        path, line, column = split_location(os.path.join(cwd, os.path.expanduser(arg)))
+        win.open_location(path, line, column)
 
 
 def main() -> int:
-    app = ScribeApplication(sys.argv)
-    win = MainWindow()
-    win.show()
+    if sys.argv[1:2] == [BATCH_COMMAND]:
+        # Headless: dispatched before anything imports Qt
+        from scribeone.batch import main as batch_main
+
+        return batch_main(sys.argv[2:])
+    argv, qt_argv = _split_qt_args(sys.argv[1:])
+    profile = None
+    if PROFILE_FLAG in argv:
+        from scribeone.utils.startup_profile import StartupProfile
+
+        profile = StartupProfile()
+    elif NEW_INSTANCE_FLAG not in argv:
+        # Usage errors and --help are handled here; the other instance only gets the files
+        files = _parse_args(argv).files if argv else []
+        from scribeone.utils.single_instance import forward_to_running
+
+        if forward_to_running(["--", *files] if files else []):
+            return 0
+
+    def phase(name: str):
+        from contextlib import nullcontext
+
+        return profile.phase(name) if profile is not None else nullcontext()
+
+    with phase("import Qt + app"):
+        from scribeone.app import ScribeApplication
+    with phase("QApplication"):
+        app = ScribeApplication(sys.argv[:1] + qt_argv)
+    with phase("import main window"):
+        from scribeone.ui.main_window import MainWindow
+    with phase("build main window"):
+        win = MainWindow()
+    if NEW_INSTANCE_FLAG not in argv:
+        # A separate instance leaves the session to the primary one
+        with phase("restore session"):
+            win.restore_session()
+    if argv:
+        with phase("open file"):
+            _apply_command_line(win, argv, os.getcwd())
+    with phase("show"):
+        win.show()
+    if NEW_INSTANCE_FLAG not in argv and profile is None:
+        from scribeone.ui.instance_server import InstanceServer
+
+        server = InstanceServer(app)
+
+        def handoff(cwd: str, request: list[str]) -> None:
+            win.bring_to_front()
+            _apply_command_line(win, request, cwd, forwarded=True)
+
+        server.requestReceived.connect(handoff)
+        # Start serving once the first paint is out; a launch racing us just
+        # starts normally
+        win.startupFinished.connect(server.listen)
+        app.aboutToQuit.connect(server.close)
+    if profile is not None:
+        win.firstPainted.connect(lambda: profile.mark("first paint"))
+
+        def finished() -> None:
+            profile.mark("deferred startup done")
+            profile.report()
+
+        win.startupFinished.connect(finished)
     return app.exec()
 
 
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from PyQt6.QtCore import QObject, QTimer
+
+# One display frame at 60 Hz: the most often any piece of chrome is redrawn
+FRAME_MS = 16
+
+
+class ChromeScheduler(QObject):
+    """Coalesce window-chrome updates to at most one run per frame.
+
+    Each piece of chrome (title, status text, Ln/Col, counters, …) is a named
+    section with an update callback. ``invalidate`` only marks sections
+    dirty and arms a single-shot timer; when it fires, each dirty section's
+    callback runs once, in registration order, however many edits or
+    cursor moves happened in between.
+    """
+
+    def __init__(self, parent=None, interval_ms: int = FRAME_MS) -> None:
+        super().__init__(parent)
+        self._sections: dict[str, Callable[[], None]] = {}
+        self._dirty: set[str] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def add(self, name: str, update: Callable[[], None]) -> None:
+        self._sections[name] = update
+        self._dirty.add(name)
+        self._timer.start()
+
+    def invalidate(self, *names: str) -> None:
+        self._dirty.update(names or self._sections)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Run the pending updates now (also called by the frame timer)."""
+        self._timer.stop()
+        dirty, self._dirty = self._dirty, set()
+        for name, update in self._sections.items():
+            if name in dirty:
+                update()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from PyQt6.QtGui import QTextDocument
+
+from ..core.document import Document
+from ..core.text_stats import TextStats
+
+if TYPE_CHECKING:
+    from ..core.file_diff import Fingerprint
+    from ..core.journal import EditJournal
+
+# Rough resident cost of one UTF-16 unit: the piece table's str, the
+# QTextDocument's copy and its per-block layout data
+BYTES_PER_UNIT = 8
+
+
+@dataclass(eq=False)
+class DocumentTab:
+    """One open document: its model, editor text and journal, or a stub of them.
+
+    A hibernated tab keeps only what is needed to bring it back: the path
+    and encoding (a clean file is reloaded from disk) or the spilled journal
+    holding the text of unsaved changes.
+    """
+
+    doc: Document | None
+    qdoc: QTextDocument | None
+    stats: TextStats | None
+    journal: EditJournal | None = None
+    path: str | None = None  # kept while hibernated
+    encoding: str = "utf-8"
+    dirty: bool = False
+    spill: Path | None = None  # the text of a hibernated dirty tab
+    spill_base: bool = False  # the spill is a live journal, still based on the file
+    anchor: int = 0
+    position: int = 0
+    scroll: int = 0  # first visible block
+    baseline: Fingerprint | None = None  # the file version the text matches
+    used: int = 0  # LRU clock
+
+    @property
+    def resident(self) -> bool:
+        return self.qdoc is not None
+
+    @property
+    def file_path(self) -> str | None:
+        return self.doc.path if self.doc is not None else self.path
+
+    @property
+    def is_dirty(self) -> bool:
+        return self.doc.is_dirty if self.doc is not None else self.dirty
+
+    @property
+    def blank(self) -> bool:
+        """An untitled, empty, unmodified tab: opening a file may take it over."""
+        return self.doc is not None and not self.doc.path and not self.doc.is_dirty and len(self.doc) == 0
+
+    def cost(self) -> int:
+        return len(self.doc) * BYTES_PER_UNIT if self.doc is not None and self.resident else 0
+
+    def title(self) -> str:
+        path = self.file_path
+        name = os.path.basename(path) if path else "untitled"
+        return f"{name} ●" if self.is_dirty else name
+
+    def is_for(self, path: str) -> bool:
+        own = self.file_path
+        return bool(own) and os.path.normcase(os.path.abspath(own)) == os.path.normcase(os.path.abspath(path))
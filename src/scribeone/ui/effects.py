@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+import sys
+from typing import Mapping
+
+from PyQt6.QtGui import QGuiApplication
+
+from ..utils.settings import REDUCED_EFFECTS, settings
+
+# Platform plugins that composite without a GPU or draw over the network
+_SOFTWARE_PLATFORMS = frozenset({"offscreen", "minimal", "vnc", "linuxfb"})
+
+_detected: bool | None = None
+
+
+def low_performance_environment(platform: str, env: Mapping[str, str] = os.environ) -> bool:
+    """Whether animations and graphics effects would be slow here.
+
+    True for software rendering and remote sessions (RDP, X forwarding or
+    a TCP X display), where every animated frame is rasterized on the CPU
+    and often sent over the network.
+    """
+    if platform in _SOFTWARE_PLATFORMS:
+        return True
+    if env.get("LIBGL_ALWAYS_SOFTWARE") == "1" or env.get("QT_OPENGL") == "software":
+        return True
+    if env.get("QT_QUICK_BACKEND") == "software":
+        return True
+    if "XRDP_SESSION" in env or env.get("SESSIONNAME", "").upper().startswith("RDP-"):
+        return True
+    display = env.get("DISPLAY", "")
+    host = display.rpartition(":")[0]
+    if platform == "xcb" and host and host != "unix":
+        return True  # e.g. "localhost:10.0" from ssh -X
+    return sys.platform == "win32" and _windows_remote_session()
+
+
+def _windows_remote_session() -> bool:
+    try:
+        import ctypes
+
+        return bool(ctypes.windll.user32.GetSystemMetrics(0x1000))  # SM_REMOTESESSION
+    except (AttributeError, OSError):
+        return False
+
+
+def reduced_effects() -> bool:
+    """Whether to skip animations and graphics effects.
+
+    The ``ui/reducedEffects`` setting is ``"on"``, ``"off"`` or ``"auto"``
+    (the default), which detects a low-performance environment once.
+    """
+    global _detected
+    mode = settings().get(REDUCED_EFFECTS)
+    if mode in ("on", "off"):
+        return mode == "on"
+    if _detected is None:
+        _detected = low_performance_environment(QGuiApplication.platformName())
+    return _detected
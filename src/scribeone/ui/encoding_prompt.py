@@ -18,12 +18,27 @@ COMMON_ENCODINGS = [
 ]
 
 
-def choose_encoding(parent=None, path: str | None = None, error: Exception | None = None) -> Optional[str]:
+def choose_encoding(
+    parent=None,
+    path: str | None = None,
+    error: Exception | None = None,
+    suggested: str | None = None,
+) -> Optional[str]:
     title = "选择编码以重新打开"
-    msg = "无法以 UTF-8 打开文件，选择其他编码后重试："
-    if path:
-        msg = f"无法以 UTF-8 打开文件:\n{path}\n\n请选择编码后重试："
-    enc, ok = QInputDialog.getItem(parent, title, msg, COMMON_ENCODINGS, 0, False)
+    if error is None and suggested:
+        title = "确认文件编码"
+        msg = f"无法可靠识别文件编码（推测：{suggested}），请选择："
+        if path:
+            msg = f"无法可靠识别文件编码:\n{path}\n\n推测为 {suggested}，请确认或选择其他编码："
+    else:
+        msg = "无法以 UTF-8 打开文件，选择其他编码后重试："
+        if path:
+            msg = f"无法以 UTF-8 打开文件:\n{path}\n\n请选择编码后重试："
+    choices = list(COMMON_ENCODINGS)
+    if suggested and suggested not in choices:
+        choices.insert(0, suggested)
+    current = choices.index(suggested) if suggested else 0
+    enc, ok = QInputDialog.getItem(parent, title, msg, choices, current, False)
     if ok and enc:
         return str(enc)
     return None
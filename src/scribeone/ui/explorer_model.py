@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import os
+import queue
+from collections import OrderedDict
+
+from PyQt6.QtCore import QAbstractItemModel, QFileSystemWatcher, QModelIndex, QObject, QThread, QTimer, Qt, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QStyle
+
+from ..core.workspace_search import list_dir, name_matches
+
+# Directories watched for changes at once; the least recently listed go first
+MAX_WATCHED_DIRS = 256
+# Bursts of change notifications are folded into one relisting per directory
+_REFRESH_DEBOUNCE_MS = 500
+FILE_PATH_ROLE = Qt.ItemDataRole.UserRole + 1
+
+_UNLISTED, _LOADING, _LISTED = range(3)
+
+
+class _Node:
+    __slots__ = ("name", "path", "is_dir", "parent", "row", "children", "state", "dirs", "files")
+
+    def __init__(self, name: str, path: str, is_dir: bool, parent: _Node | None) -> None:
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.parent = parent
+        self.row = 0
+        self.children: list[_Node] = []  # visible rows: directories, then matching files
+        self.state = _UNLISTED
+        self.dirs: list[str] = []  # the last listing, kept to refilter without rereading
+        self.files: list[str] = []
+
+    def key(self) -> tuple[bool, str]:
+        return (not self.is_dir, self.name.casefold())
+
+
+class DirLister(QThread):
+    """Lists directories off the GUI thread, one request at a time.
+
+    A slow or hung mount therefore delays only its own directory instead of
+    freezing the window.
+    """
+
+    listed = pyqtSignal(str, object)  # path, (dirs, files) or None if unreadable
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._queue: queue.Queue[str | None] = queue.Queue()
+
+    def request(self, path: str) -> None:
+        self._queue.put(path)
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self.wait()
+
+    def run(self) -> None:
+        while True:
+            path = self._queue.get()
+            if path is None:
+                return
+            try:
+                listing = list_dir(path)
+            except OSError:
+                listing = None
+            self.listed.emit(path, listing)
+
+
+class ExplorerModel(QAbstractItemModel):
+    """File tree of the workspace root that lists a directory only when expanded.
+
+    Unlike ``QFileSystemModel`` nothing is read or stat'ed ahead of the
+    view, at most ``MAX_WATCHED_DIRS`` directories are watched, and change
+    notifications are debounced and merged into the existing rows so
+    expanded folders stay open. Name filters hide files using the cached
+    listings, without touching the disk.
+    """
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._root: _Node | None = None
+        self._dirs: dict[str, _Node] = {}
+        self._name_filters: tuple[str, ...] = ()
+        self._watched: OrderedDict[str, None] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.refresh)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._relist_dirty)
+        self._lister = DirLister(self)
+        self._lister.listed.connect(self._on_listed)
+        self._lister.start(QThread.Priority.LowPriority)
+        style = QApplication.style()
+        self._dir_icon = style.standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+        self._file_icon = style.standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+
+    # ----- public API -----
+    def set_root(self, path: str) -> QModelIndex:
+        """Show ``path``; returns the index to use as the view's root."""
+        path = os.path.abspath(path)
+        self.beginResetModel()
+        self._unwatch_all()
+        self._dirs.clear()
+        self._dirty.clear()
+        self._root = _Node(os.path.basename(path) or path, path, True, None)
+        self._dirs[path] = self._root
+        self.endResetModel()
+        self._fetch(self._root)
+        return QModelIndex()
+
+    def root_path(self) -> str | None:
+        return self._root.path if self._root is not None else None
+
+    def set_name_filters(self, patterns: tuple[str, ...]) -> None:
+        """Only list files matching one of ``patterns`` (none: every file)."""
+        patterns = tuple(patterns)
+        if patterns == self._name_filters:
+            return
+        self._name_filters = patterns
+        for node in list(self._dirs.values()):
+            if node.state == _LISTED:
+                self._sync_children(node)
+
+    def name_filters(self) -> tuple[str, ...]:
+        return self._name_filters
+
+    def refresh(self, path: str) -> None:
+        """Relist ``path`` soon if it is shown (e.g. it changed on disk)."""
+        self._dirty.add(path)
+        if not self._timer.isActive():
+            self._timer.start(_REFRESH_DEBOUNCE_MS)
+
+    def filePath(self, index: QModelIndex) -> str:  # noqa: N802 - QFileSystemModel's name
+        node = self._node(index)
+        return node.path if node is not None else ""
+
+    def isDir(self, index: QModelIndex) -> bool:  # noqa: N802
+        node = self._node(index)
+        return node is not None and node.is_dir
+
+    def index_for_path(self, path: str) -> QModelIndex:
+        """Index of a directory that has been listed (invalid otherwise)."""
+        node = self._dirs.get(os.path.abspath(path))
+        if node is None or node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def shutdown(self) -> None:
+        self._timer.stop()
+        self._unwatch_all()
+        self._lister.stop()
+
+    # ----- QAbstractItemModel -----
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        node = self._node(parent)
+        if node is None or column != 0 or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, 0, node.children[row])
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:  # type: ignore[override]
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        node = self._node(parent)
+        return len(node.children) if node is not None else 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:  # noqa: N802
+        node = self._node(parent)
+        if node is None or not node.is_dir:
+            return False
+        # Unlisted directories show an expander; listing happens on expand
+        return node.state != _LISTED or bool(node.children)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:  # noqa: N802
+        node = self._node(parent)
+        return node is not None and node.is_dir and node.state == _UNLISTED
+
+    def fetchMore(self, parent: QModelIndex) -> None:  # noqa: N802
+        node = self._node(parent)
+        if node is not None and node.is_dir and node.state == _UNLISTED:
+            self._fetch(node)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        node = self._node(index)
+        if node is None or node is self._root:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.name
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._dir_icon if node.is_dir else self._file_icon
+        if role in (Qt.ItemDataRole.ToolTipRole, FILE_PATH_ROLE):
+            return node.path
+        return None
+
+    # ----- internals -----
+    def _node(self, index: QModelIndex) -> _Node | None:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index_of(self, node: _Node) -> QModelIndex:
+        return QModelIndex() if node is self._root else self.createIndex(node.row, 0, node)
+
+    def _fetch(self, node: _Node) -> None:
+        node.state = _LOADING
+        self._lister.request(node.path)
+
+    def _on_listed(self, path: str, listing: tuple[list[str], list[str]] | None) -> None:
+        node = self._dirs.get(path)
+        if node is None:
+            return  # collapsed away or a different root by now
+        node.dirs, node.files = listing or ([], [])
+        node.state = _LISTED
+        self._sync_children(node)
+        if listing is not None:
+            self._watch(path)
+
+    def _sync_children(self, node: _Node) -> None:
+        """Make ``node``'s rows match its listing, keeping rows that remain."""
+        filters = self._name_filters
+        want = [(False, d.casefold(), d) for d in node.dirs]
+        want += [(True, f.casefold(), f) for f in node.files if not filters or name_matches(f, filters)]
+        want_keys = {w[:2] for w in want}
+        parent = self._index_of(node)
+        children = node.children
+        for row in range(len(children) - 1, -1, -1):
+            if children[row].key() not in want_keys:
+                self.beginRemoveRows(parent, row, row)
+                self._forget(children.pop(row))
+                self.endRemoveRows()
+        # What remains is in order; insert the missing runs between it
+        i = 0
+        while i < len(want):
+            if i < len(children) and children[i].key() == want[i][:2]:
+                i += 1
+                continue
+            stop = i
+            have = children[i].key() if i < len(children) else None
+            while stop < len(want) and want[stop][:2] != have:
+                stop += 1
+            self.beginInsertRows(parent, i, stop - 1)
+            new = []
+            for is_file, _, name in want[i:stop]:
+                child = _Node(name, os.path.join(node.path, name), not is_file, node)
+                if child.is_dir:
+                    self._dirs[child.path] = child
+                new.append(child)
+            children[i:i] = new
+            for row in range(i, len(children)):
+                children[row].row = row
+            self.endInsertRows()
+            i = stop
+        for row, child in enumerate(children):
+            child.row = row
+
+    def _forget(self, node: _Node) -> None:
+        if not node.is_dir:
+            return
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            self._dirs.pop(n.path, None)
+            if n.path in self._watched:
+                del self._watched[n.path]
+                self._watcher.removePath(n.path)
+            stack.extend(c for c in n.children if c.is_dir)
+
+    def _watch(self, path: str) -> None:
+        if path in self._watched:
+            self._watched.move_to_end(path)
+            return
+        if len(self._watched) >= MAX_WATCHED_DIRS:
+            oldest, _ = self._watched.popitem(last=False)
+            self._watcher.removePath(oldest)
+        if self._watcher.addPath(path):
+            self._watched[path] = None
+
+    def _unwatch_all(self) -> None:
+        if self._watched:
+            self._watcher.removePaths(list(self._watched))
+            self._watched.clear()
+
+    def _relist_dirty(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        for path in dirty:
+            node = self._dirs.get(path)
+            if node is not None and node.state == _LISTED:
+                self._fetch(node)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import os
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ..core.fileio import CHUNK_SIZE, iter_decoded_chunks
+
+
+class FileLoader(QThread):
+    """Read and decode a file on a worker thread, streaming text chunks.
+
+    Chunks are passed as Python objects (no QString round-trip) and must be
+    consumed on the GUI thread in emission order. Call ``cancel()`` to stop
+    early; ``finished`` is still emitted once the thread winds down.
+    """
+
+    chunkLoaded = pyqtSignal(object)  # str
+    progress = pyqtSignal("qint64", "qint64")  # bytes read, total bytes
+    failed = pyqtSignal(object)  # Exception
+
+    def __init__(self, path: str, encoding: str = "utf-8", parent=None) -> None:
+        super().__init__(parent)
+        self.path = path
+        self.encoding = encoding
+        self.succeeded = False
+
+    def cancel(self) -> None:
+        self.requestInterruption()
+
+    def run(self) -> None:
+        try:
+            total = os.path.getsize(self.path)
+            for text, done in iter_decoded_chunks(self.path, self.encoding, CHUNK_SIZE):
+                if self.isInterruptionRequested():
+                    return
+                if text:
+                    self.chunkLoaded.emit(text)
+                self.progress.emit(done, total)
+            self.succeeded = True
+        except Exception as e:  # UnicodeDecodeError / OSError surface to the UI
+            self.failed.emit(e)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ..core.document import Snapshot
+from ..core.fileio import DEFAULT_COMPRESSION_LEVEL, Compression, Durability, essential_newline, write_chunks
+
+
+class FileSaver(QThread):
+    """Write a :class:`Snapshot` to disk on a worker thread.
+
+    Encoding, newline normalization, compression and the atomic replace all
+    happen in ``fileio.write_chunks``; the GUI keeps running and may keep editing,
+    since the snapshot shares no mutable state with the live document.
+    """
+
+    saved = pyqtSignal(str, int)  # path, revision written
+    failed = pyqtSignal(str, object)  # path, Exception
+
+    def __init__(
+        self,
+        snapshot: Snapshot,
+        path: str,
+        encoding: str = "utf-8",
+        durability: Durability = "file",
+        compression: Compression | None = None,
+        level: int = DEFAULT_COMPRESSION_LEVEL,
+        newline: str = essential_newline,
+        bom: bytes | None = None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.path = path
+        self.encoding = encoding
+        self.durability = durability
+        self.compression = compression
+        self.level = level
+        self.newline = newline
+        self.bom = bom
+
+    def run(self) -> None:
+        try:
+            write_chunks(
+                self.path,
+                self.snapshot.iter_chunks(),
+                encoding=self.encoding,
+                newline=self.newline,
+                durability=self.durability,
+                compression=self.compression,
+                level=self.level,
+                bom=self.bom,
+            )
+        except Exception as e:  # OSError / UnicodeEncodeError surface to the UI
+            self.failed.emit(self.path, e)
+            return
+        self.saved.emit(self.path, self.snapshot.revision)
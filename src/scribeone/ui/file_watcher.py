@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, replace
+from typing import Callable
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QThread, QTimer, pyqtSignal
+
+from ..core.document import Snapshot, normalize_newlines
+from ..core.file_diff import Fingerprint, Hunk, block_hashes, diff_lines
+from ..core.fileio import decompress
+from ..core.piece_table import PieceTable
+
+# Writers often touch a file several times in a row; wait for them to settle
+_SETTLE_MS = 200
+
+
+@dataclass(frozen=True)
+class ExternalChange:
+    path: str
+    fingerprint: Fingerprint  # the version on disk
+    revision: int  # document revision the hunks were computed against
+    hunks: list[Hunk] | None  # None: not diffed (the read-only viewer)
+
+
+class ChangeCheck(QThread):
+    """Compare the watched file with the document's text on a worker thread.
+
+    The file is read once; its blocks are hashed so that a rewrite with the
+    same bytes (or a touch) is recognized without decoding anything.
+    """
+
+    unchanged = pyqtSignal(object)  # Fingerprint of the file as it is now
+    changed = pyqtSignal(object)  # ExternalChange
+    failed = pyqtSignal(object)  # Exception (deleted, unreadable, undecodable)
+
+    def __init__(
+        self,
+        path: str,
+        encoding: str,
+        baseline: Fingerprint,
+        snapshot: Snapshot | None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.path = path
+        self.encoding = encoding
+        self.baseline = baseline
+        self.snapshot = snapshot
+
+    def run(self) -> None:
+        try:
+            fp = Fingerprint.of(self.path)
+            if fp.same_stat(self.baseline):
+                self.unchanged.emit(self.baseline)
+                return
+            if self.snapshot is None:
+                self.changed.emit(ExternalChange(self.path, fp, -1, None))
+                return
+            with open(self.path, "rb") as f:
+                data = f.read()
+            fp = replace(fp, blocks=block_hashes(data))
+            if self.baseline.same_content(fp):
+                self.unchanged.emit(fp)
+                return
+            new = normalize_newlines(decompress(data).decode(self.encoding))
+            old = PieceTable.from_pieces(self.snapshot.pieces).text()
+            hunks = diff_lines(old, new)
+        except Exception as e:  # OSError / UnicodeDecodeError surface to the UI
+            self.failed.emit(e)
+            return
+        if hunks:
+            self.changed.emit(ExternalChange(self.path, fp, self.snapshot.revision, hunks))
+        else:
+            self.unchanged.emit(fp)
+
+
+class FileWatcher(QObject):
+    """Report changes other programs make to the open file.
+
+    A filesystem watcher on the file and its directory (which also catches
+    atomic replaces and re-creation) schedules a check; a size/mtime
+    mismatch with the baseline runs a ``ChangeCheck``, one at a time. The
+    owner applies what ``changed`` reports and moves the baseline with
+    ``set_baseline``, and brackets its own saves with ``suspend``/``resume``.
+    """
+
+    changed = pyqtSignal(object)  # ExternalChange
+    failed = pyqtSignal(str, object)  # path, Exception
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.path: str | None = None
+        self.encoding = "utf-8"
+        self.baseline: Fingerprint | None = None
+        self._snapshot: Callable[[], Snapshot] | None = None
+        self._check: ChangeCheck | None = None
+        self._rerun = False
+        self._suspended = 0
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule)
+        self._watcher.directoryChanged.connect(self._schedule)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(_SETTLE_MS)
+        self._timer.timeout.connect(self.check)
+
+    def watch(self, path: str, encoding: str, snapshot: Callable[[], Snapshot] | None) -> None:
+        """Watch ``path`` as it is now; ``snapshot`` gives the text to diff against.
+
+        Without ``snapshot`` changes are reported with no hunks.
+        """
+        self.unwatch()
+        self.path = os.path.abspath(path)
+        self.encoding = encoding
+        self._snapshot = snapshot
+        try:
+            self.baseline = Fingerprint.of(self.path)
+        except OSError:
+            self.baseline = Fingerprint(-1, -1)
+        self._watcher.addPaths([self.path, os.path.dirname(self.path)])
+
+    def unwatch(self) -> None:
+        self._timer.stop()
+        self._rerun = False
+        self.path = self.baseline = self._snapshot = None
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        if self._check is not None:
+            self._check.requestInterruption()  # its result is dropped
+
+    def set_baseline(self, fingerprint: Fingerprint | None = None) -> None:
+        """Take ``fingerprint`` (default: the file as it is now) as the known version."""
+        if self.path is None:
+            return
+        try:
+            self.baseline = fingerprint or Fingerprint.of(self.path)
+        except OSError:
+            self.baseline = Fingerprint(-1, -1)
+
+    def suspend(self) -> None:
+        """Hold checks back, e.g. while the editor writes the file itself."""
+        self._suspended += 1
+
+    def resume(self, rebase: bool = False) -> None:
+        """Allow checks again; with ``rebase`` the file as it is now is the baseline."""
+        self._suspended = max(0, self._suspended - 1)
+        if rebase:
+            self.set_baseline()
+        if not self._suspended and self.path is not None:
+            self._schedule()
+
+    def check(self) -> None:
+        """Compare the file with the baseline now (after the settle delay normally)."""
+        if self.path is None or self.baseline is None or self._suspended:
+            return
+        if self._check is not None:
+            self._rerun = True
+            return
+        self._rewatch()
+        try:
+            if Fingerprint.of(self.path).same_stat(self.baseline):
+                return  # a sibling changed, or nothing did
+        except OSError:
+            if self.baseline.size < 0:
+                return  # missing, and already reported
+        snapshot = self._snapshot() if self._snapshot is not None else None
+        check = ChangeCheck(self.path, self.encoding, self.baseline, snapshot, self)
+        check.unchanged.connect(self._on_unchanged)
+        check.changed.connect(self._on_changed)
+        check.failed.connect(self._on_failed)
+        check.finished.connect(self._on_check_finished)
+        self._check = check
+        check.start()
+
+    def shutdown(self) -> None:
+        self.unwatch()
+        if self._check is not None:
+            self._check.wait()
+
+    # ----- internals -----
+    def _schedule(self, *_args) -> None:
+        self._timer.start()
+
+    def _rewatch(self) -> None:
+        # Replacing or deleting a file drops it from the watcher
+        if self.path not in self._watcher.files() and os.path.exists(self.path):
+            self._watcher.addPath(self.path)
+
+    def _current(self, check: ChangeCheck) -> bool:
+        return check is self._check and not check.isInterruptionRequested() and check.path == self.path
+
+    def _on_unchanged(self, fingerprint: Fingerprint) -> None:
+        if self._current(self.sender()):
+            self.baseline = fingerprint
+
+    def _on_changed(self, change: ExternalChange) -> None:
+        if self._current(self.sender()):
+            self.changed.emit(change)
+
+    def _on_failed(self, error: Exception) -> None:
+        check = self.sender()
+        if self._current(check):
+            # Reported once per version: a deleted file stays quiet until it returns
+            self.baseline = Fingerprint(-1, -1)
+            self.failed.emit(check.path, error)
+
+    def _on_check_finished(self) -> None:
+        check = self.sender()
+        if check is self._check:
+            self._check = None
+        check.deleteLater()
+        if self._rerun:
+            self._rerun = False
+            self.check()
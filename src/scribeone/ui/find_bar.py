@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QKeySequence, QShortcut
+from PyQt6.QtWidgets import QApplication, QFrame, QHBoxLayout, QLabel, QLineEdit, QToolButton, QVBoxLayout
+
+from ..core.search import SearchQuery
+
+# Typing in the find field restarts the search after this pause
+_QUERY_DEBOUNCE_MS = 120
+
+
+class FindBar(QFrame):
+    """Inline find/replace bar shown under the editor.
+
+    Purely a view: it emits the query and commands and displays the count
+    it is given; ``SearchSession`` does the searching.
+    """
+
+    queryChanged = pyqtSignal(object)  # SearchQuery | None
+    findNext = pyqtSignal()
+    findPrevious = pyqtSignal()
+    replaceOne = pyqtSignal(str)
+    replaceAll = pyqtSignal(str)
+    closed = pyqtSignal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setObjectName("FindBar")
+
+        self.find_edit = QLineEdit(self)
+        self.find_edit.setPlaceholderText("查找")
+        self.find_edit.setClearButtonEnabled(True)
+        self.replace_edit = QLineEdit(self)
+        self.replace_edit.setPlaceholderText("替换为")
+
+        self.case_btn = self._toggle("Aa", "区分大小写")
+        self.word_btn = self._toggle("W", "全字匹配")
+        self.regex_btn = self._toggle(".*", "正则表达式")
+        self.count_label = QLabel("", self)
+        self.count_label.setMinimumWidth(80)
+        prev_btn = self._button("↑", "上一个 (Shift+Enter)", self.findPrevious.emit)
+        next_btn = self._button("↓", "下一个 (Enter)", self.findNext.emit)
+        close_btn = self._button("✕", "关闭 (Esc)", self.close_bar)
+        self.replace_btn = self._button("替换", "替换当前匹配", lambda: self.replaceOne.emit(self.replace_edit.text()))
+        self.replace_all_btn = self._button("全部替换", "一次替换全部匹配（可一步撤销）", lambda: self.replaceAll.emit(self.replace_edit.text()))
+
+        find_row = QHBoxLayout()
+        for w in (self.find_edit, self.case_btn, self.word_btn, self.regex_btn, self.count_label, prev_btn, next_btn, close_btn):
+            find_row.addWidget(w)
+        self._replace_row = QHBoxLayout()
+        for w in (self.replace_edit, self.replace_btn, self.replace_all_btn):
+            self._replace_row.addWidget(w)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 4, 6, 4)
+        layout.setSpacing(4)
+        layout.addLayout(find_row)
+        layout.addLayout(self._replace_row)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(_QUERY_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._emit_query)
+        self.find_edit.textChanged.connect(self._debounce.start)
+        for btn in (self.case_btn, self.word_btn, self.regex_btn):
+            btn.toggled.connect(self._emit_query)
+        self.find_edit.returnPressed.connect(self._on_return)
+        self.replace_edit.returnPressed.connect(lambda: self.replaceOne.emit(self.replace_edit.text()))
+        QShortcut(QKeySequence(Qt.Key.Key_Escape), self, self.close_bar, context=Qt.ShortcutContext.WidgetWithChildrenShortcut)
+
+    # ----- public API -----
+    def open(self, text: str = "", replace: bool = False) -> None:
+        if text:
+            self.find_edit.setText(text)
+        if replace:
+            self.set_replace_visible(True)
+        elif not self.isVisible():
+            self.set_replace_visible(False)
+        self.show()
+        target = self.replace_edit if replace and self.find_edit.text() else self.find_edit
+        target.setFocus()
+        target.selectAll()
+
+    def close_bar(self) -> None:
+        self.hide()
+        self.closed.emit()
+
+    def query(self) -> SearchQuery | None:
+        text = self.find_edit.text()
+        if not text:
+            return None
+        return SearchQuery(text, self.regex_btn.isChecked(), self.case_btn.isChecked(), self.word_btn.isChecked())
+
+    def set_replace_visible(self, visible: bool) -> None:
+        for i in range(self._replace_row.count()):
+            self._replace_row.itemAt(i).widget().setVisible(visible)
+
+    def set_replace_enabled(self, enabled: bool) -> None:
+        """Read-only views can search but not replace (nor use regexes)."""
+        for w in (self.replace_edit, self.replace_btn, self.replace_all_btn, self.regex_btn):
+            w.setEnabled(enabled)
+
+    def set_count(self, text: str, error: bool = False) -> None:
+        self.count_label.setText(text)
+        self.find_edit.setProperty("error", error)
+        self.find_edit.setToolTip(text if error else "")
+        self.find_edit.style().unpolish(self.find_edit)
+        self.find_edit.style().polish(self.find_edit)
+
+    # ----- internals -----
+    def _toggle(self, text: str, tip: str) -> QToolButton:
+        btn = QToolButton(self)
+        btn.setText(text)
+        btn.setToolTip(tip)
+        btn.setCheckable(True)
+        return btn
+
+    def _button(self, text: str, tip: str, slot) -> QToolButton:
+        btn = QToolButton(self)
+        btn.setText(text)
+        btn.setToolTip(tip)
+        btn.clicked.connect(slot)
+        return btn
+
+    def _emit_query(self) -> None:
+        self._debounce.stop()
+        self.queryChanged.emit(self.query())
+
+    def _on_return(self) -> None:
+        if self._debounce.isActive():
+            self._emit_query()
+        if QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier:
+            self.findPrevious.emit()
+        else:
+            self.findNext.emit()
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import (
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QToolButton,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..core.search import SearchQuery
+from ..core.workspace_search import FileHit, split_patterns
+from ..utils.settings import SEARCH_EXCLUDE, SEARCH_NAME_FILTERS, settings
+from .find_in_files_worker import FindInFilesWorker
+from .workspace_indexer import WorkspaceIndexer
+from .messages import (
+    ERR_BAD_REGEX,
+    ERR_FIND_IN_FILES,
+    MSG_FIND_IN_FILES_DONE,
+    MSG_FIND_IN_FILES_PROGRESS,
+    MSG_FIND_IN_FILES_STOPPED,
+    MSG_FIND_IN_FILES_TOO_MANY,
+)
+
+# The search stops once this many hits are listed
+MAX_RESULTS = 5000
+_HIT_ROLE = Qt.ItemDataRole.UserRole
+
+
+class FindInFilesPanel(QWidget):
+    """Sidebar tab searching file contents under the sidebar root.
+
+    Results stream into a file → line tree while ``FindInFilesWorker``
+    runs; activating a line asks for the file to be opened there.
+    """
+
+    fileOpenRequested = pyqtSignal(str, int)  # path, 1-based line
+
+    def __init__(self, indexer: WorkspaceIndexer | None = None, parent=None) -> None:
+        super().__init__(parent)
+        self.root = str(Path.home())
+        self.indexer = indexer
+        self._worker: FindInFilesWorker | None = None
+        self._files: dict[str, QTreeWidgetItem] = {}
+        self._hits = 0
+
+        s = settings()
+        self.query_edit = QLineEdit(self)
+        self.query_edit.setPlaceholderText("在文件中查找")
+        self.query_edit.setClearButtonEnabled(True)
+        self.filter_edit = QLineEdit(s.get(SEARCH_NAME_FILTERS), self)
+        self.filter_edit.setPlaceholderText("包含的文件，如 *.txt; *.md")
+        self.exclude_edit = QLineEdit(s.get(SEARCH_EXCLUDE), self)
+        self.exclude_edit.setPlaceholderText("排除的文件或目录")
+        self.case_btn = self._toggle("Aa", "区分大小写")
+        self.word_btn = self._toggle("W", "全字匹配")
+        self.regex_btn = self._toggle(".*", "正则表达式")
+        self.stop_btn = QToolButton(self)
+        self.stop_btn.setText("停止")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop)
+        self.status = QLabel("", self)
+        self.status.setWordWrap(True)
+        self.results = QTreeWidget(self)
+        self.results.setHeaderHidden(True)
+        self.results.setUniformRowHeights(True)
+        self.results.itemActivated.connect(self._open_item)
+
+        row = QHBoxLayout()
+        for w in (self.query_edit, self.case_btn, self.word_btn, self.regex_btn):
+            row.addWidget(w)
+        status_row = QHBoxLayout()
+        status_row.addWidget(self.status, 1)
+        status_row.addWidget(self.stop_btn)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        layout.setSpacing(4)
+        layout.addLayout(row)
+        layout.addWidget(self.filter_edit)
+        layout.addWidget(self.exclude_edit)
+        layout.addLayout(status_row)
+        layout.addWidget(self.results, 1)
+
+        for edit in (self.query_edit, self.filter_edit, self.exclude_edit):
+            edit.returnPressed.connect(self.start)
+
+    # ----- public API -----
+    def set_root(self, root: str) -> None:
+        root = os.path.abspath(root)
+        if root != self.root:
+            self.stop()
+            self.root = root
+
+    def filters(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """The include and exclude patterns currently entered."""
+        return split_patterns(self.filter_edit.text()), split_patterns(self.exclude_edit.text())
+
+    def query(self) -> SearchQuery | None:
+        text = self.query_edit.text()
+        if not text:
+            return None
+        return SearchQuery(text, self.regex_btn.isChecked(), self.case_btn.isChecked(), self.word_btn.isChecked())
+
+    def start(self) -> None:
+        """(Re)run the search for the current query and filters."""
+        self.stop()
+        self.results.clear()
+        self._files.clear()
+        self._hits = 0
+        query = self.query()
+        if query is None:
+            self.status.clear()
+            return
+        try:
+            query.compile()
+        except re.error as e:
+            self.status.setText(ERR_BAD_REGEX.format(error=e))
+            return
+        s = settings()
+        s.set(SEARCH_NAME_FILTERS, self.filter_edit.text())
+        s.set(SEARCH_EXCLUDE, self.exclude_edit.text())
+        name_filters, ignore = self.filters()
+        index_db = None
+        if self.indexer is not None:
+            self.indexer.set_filters(name_filters, ignore)
+            index_db = self.indexer.db_path
+        worker = FindInFilesWorker(self.root, query, name_filters, ignore, index_db, self)
+        worker.resultsFound.connect(self._on_results)
+        worker.progress.connect(self._on_progress)
+        worker.failed.connect(self._on_failed)
+        worker.finished.connect(self._on_finished)
+        self._worker = worker
+        self.stop_btn.setEnabled(True)
+        worker.start()
+
+    def stop(self) -> None:
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.cancel()
+            worker.wait()
+            worker.deleteLater()
+            self.status.setText(MSG_FIND_IN_FILES_STOPPED.format(hits=f"{self._hits:,}"))
+        self.stop_btn.setEnabled(False)
+
+    # ----- internals -----
+    def _toggle(self, text: str, tip: str) -> QToolButton:
+        btn = QToolButton(self)
+        btn.setText(text)
+        btn.setToolTip(tip)
+        btn.setCheckable(True)
+        return btn
+
+    def _on_results(self, hits: list[FileHit]) -> None:
+        if self.sender() is not self._worker:
+            return
+        self.results.setUpdatesEnabled(False)
+        try:
+            for hit in hits[: MAX_RESULTS - self._hits]:
+                parent = self._files.get(hit.path)
+                if parent is None:
+                    parent = QTreeWidgetItem(self.results, [os.path.relpath(hit.path, self.root)])
+                    parent.setToolTip(0, hit.path)
+                    parent.setData(0, _HIT_ROLE, (hit.path, 0))
+                    parent.setExpanded(True)
+                    self._files[hit.path] = parent
+                item = QTreeWidgetItem(parent, [f"{hit.line}: {hit.preview}"])
+                item.setData(0, _HIT_ROLE, (hit.path, hit.line))
+                self._hits += 1
+        finally:
+            self.results.setUpdatesEnabled(True)
+        if self._hits >= MAX_RESULTS:
+            self.stop()
+            self.status.setText(MSG_FIND_IN_FILES_TOO_MANY.format(hits=f"{self._hits:,}"))
+
+    def _on_progress(self, searched: int, found: int) -> None:
+        if self.sender() is self._worker:
+            self.status.setText(MSG_FIND_IN_FILES_PROGRESS.format(hits=f"{self._hits:,}", searched=f"{searched:,}", files=f"{found:,}"))
+
+    def _on_failed(self, error: Exception) -> None:
+        if self.sender() is self._worker:
+            self.status.setText(ERR_FIND_IN_FILES.format(error=error))
+
+    def _on_finished(self) -> None:
+        worker = self.sender()
+        if worker is not self._worker:
+            return
+        self._worker = None
+        worker.deleteLater()
+        self.stop_btn.setEnabled(False)
+        if worker.complete:
+            self.status.setText(
+                MSG_FIND_IN_FILES_DONE.format(hits=f"{self._hits:,}", matched=f"{len(self._files):,}", files=f"{worker.files_found:,}")
+            )
+
+    def _open_item(self, item: QTreeWidgetItem) -> None:
+        data = item.data(0, _HIT_ROLE)
+        if data:
+            path, line = data
+            self.fileOpenRequested.emit(path, line)
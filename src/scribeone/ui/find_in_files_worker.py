@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ..core.search import SearchQuery
+from ..core.workspace_index import FileState, WorkspaceIndex, required_literals
+from ..core.workspace_search import iter_files, search_files
+
+# Files per task sent to a pool process, and tasks kept in flight per process
+_BATCH_FILES = 16
+_INFLIGHT_PER_PROCESS = 4
+_POLL_S = 0.05
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _worker_count() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def shared_pool() -> ProcessPoolExecutor:
+    """The process pool reused by every workspace search.
+
+    Regex matching holds the GIL, so files are searched in separate
+    processes. They are spawned rather than forked: forking a process that
+    runs Qt threads is unsafe. The pool starts on first use only.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(_worker_count(), mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class FindInFilesWorker(QThread):
+    """Walk ``root`` and search the matching files on the shared pool.
+
+    Hits stream back through ``resultsFound`` as lists of ``FileHit`` in
+    completion order; ``progress(searched, found)`` counts files. Cancelling
+    drops queued batches; ones already running finish and are ignored.
+
+    With a workspace index, files the index has seen unchanged (same mtime
+    and size) and rules out by trigrams are skipped without being read.
+    """
+
+    resultsFound = pyqtSignal(object)  # list[FileHit]
+    progress = pyqtSignal(int, int)  # files searched, files found so far
+    failed = pyqtSignal(object)  # Exception
+
+    def __init__(
+        self,
+        root: str,
+        query: SearchQuery,
+        name_filters: tuple[str, ...],
+        ignore: tuple[str, ...],
+        index_db: str | None = None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.root = root
+        self.query = query
+        self.name_filters = name_filters
+        self.ignore = ignore
+        self.index_db = index_db
+        self.complete = False
+        self.files_skipped = 0
+        self.files_found = 0
+        self.files_searched = 0
+
+    def cancel(self) -> None:
+        self.requestInterruption()
+
+    def run(self) -> None:
+        pending: dict[Future, int] = {}  # task -> number of files in it
+        error: Exception | None = None
+        try:
+            pool = shared_pool()
+            limit = _INFLIGHT_PER_PROCESS * _worker_count()
+            candidates, known = self._index_filter()
+            batch: list[str] = []
+            for path in iter_files(self.root, self.name_filters, self.ignore, self.isInterruptionRequested):
+                self.files_found += 1
+                if candidates is not None and path not in candidates and _unchanged(path, known.get(path)):
+                    self.files_skipped += 1
+                    self.files_searched += 1
+                    continue
+                batch.append(path)
+                if len(batch) < _BATCH_FILES:
+                    continue
+                pending[pool.submit(search_files, batch, self.query)] = len(batch)
+                batch = []
+                self._collect(pending, block=len(pending) >= limit)
+            if batch and not self.isInterruptionRequested():
+                pending[pool.submit(search_files, batch, self.query)] = len(batch)
+            while pending and not self.isInterruptionRequested():
+                self._collect(pending, block=True)
+        except Exception as e:  # a broken pool, or an error raised in a worker
+            error = e
+        finally:
+            for fut in pending:
+                fut.cancel()
+            if error is not None:
+                shutdown_pool()  # the next search starts on a fresh one
+        if error is not None:
+            self.failed.emit(error)
+            return
+        if not self.isInterruptionRequested():
+            self.progress.emit(self.files_searched, self.files_found)
+            self.complete = True
+
+    def _index_filter(self) -> tuple[set[str] | None, dict[str, FileState]]:
+        if self.index_db is None:
+            return None, {}
+        try:
+            index = WorkspaceIndex(self.index_db)
+            try:
+                candidates = index.candidates(required_literals(self.query))
+                return candidates, (index.states() if candidates is not None else {})
+            finally:
+                index.close()
+        except sqlite3.Error:
+            return None, {}
+
+    def _collect(self, pending: dict[Future, int], block: bool) -> None:
+        done, _ = wait(pending, timeout=_POLL_S if block else 0, return_when=FIRST_COMPLETED)
+        for fut in done:
+            self.files_searched += pending.pop(fut)
+            hits = fut.result()
+            if hits and not self.isInterruptionRequested():
+                self.resultsFound.emit(hits)
+        if done:
+            self.progress.emit(self.files_searched, self.files_found)
+
+
+def _unchanged(path: str, state: FileState | None) -> bool:
+    """Whether the index holds the current contents of ``path``."""
+    if state is None or not state.indexed:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return (st.st_mtime_ns, st.st_size) == (state.mtime_ns, state.size)
@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import codecs
+import mmap
+import os
+import re
+
+from PyQt6.QtCore import QThread, Qt, pyqtSignal
+from PyQt6.QtGui import QFontDatabase, QPainter
+from PyQt6.QtWidgets import QAbstractScrollArea
+
+from ..core.line_index import MAX_LINE_BYTES, LineIndex
+from ..core.search import SearchQuery
+
+# QScrollBar ranges are 32-bit; scale line numbers beyond that
+_SCROLL_MAX = 2**31 - 1
+# Bytes a background find scans between checks for cancellation
+_FIND_STEP = 4 << 20
+# How far before a hit to look for a byte that must start a character
+_SYNC_WINDOW = 4096
+# Bytes below 0x30 never continue a multibyte character in the ASCII-compatible
+# encodings (UTF-8, GBK/GB18030, Big5, Shift-JIS, EUC), so decoding can resume after one
+_SYNC = re.compile(rb"[\x00-\x2f][\x30-\xff]*\Z")
+
+
+class LineIndexer(QThread):
+    """Builds a :class:`LineIndex` on a worker thread at low priority."""
+
+    progress = pyqtSignal("qint64", "qint64")  # bytes indexed, total bytes
+
+    def __init__(self, index: LineIndex, parent=None) -> None:
+        super().__init__(parent)
+        self.index = index
+
+    def run(self) -> None:
+        self.index.build(
+            progress=lambda done, total: self.progress.emit(done, total),
+            cancelled=self.isInterruptionRequested,
+        )
+
+
+class HugeFinder(QThread):
+    """Searches a mapped file for one query on a worker thread.
+
+    The bytes are scanned in steps of ``_FIND_STEP`` so the search can be
+    cancelled, and hits that start inside a multibyte character are skipped.
+    """
+
+    found = pyqtSignal("qint64", "qint64", "qint64")  # hit offset, line, line start
+    notFound = pyqtSignal()
+
+    def __init__(self, data, index: LineIndex, rx: re.Pattern[bytes], encoding: str,
+                 start: int, forward: bool, parent=None) -> None:
+        super().__init__(parent)
+        self.data = data
+        self.index = index
+        self.rx = rx
+        self.encoding = encoding
+        self.start_at = start
+        self.forward = forward
+        # Lets a step also see hits that straddle its end, plus one byte for \b
+        self._overlap = len(rx.pattern) + 1
+
+    def run(self) -> None:
+        size = len(self.data)
+        start = min(max(0, self.start_at), size)
+        if self.forward:
+            hit = self._scan_forward(start, size)
+            if hit is None:
+                hit = self._scan_forward(0, start)
+        else:
+            hit = self._scan_backward(0, start)
+            if hit is None:
+                hit = self._scan_backward(start, size)
+        if self.isInterruptionRequested():
+            return
+        if hit is None:
+            self.notFound.emit()
+            return
+        line = self.index.line_of(hit)
+        line_start = self.index.line_start(line)
+        if line_start is None:  # not indexed that far yet
+            line_start = self.data.rfind(b"\n", 0, hit) + 1
+        self.found.emit(hit, line, line_start)
+
+    def _scan_forward(self, lo: int, hi: int) -> int | None:
+        """First hit starting in ``[lo, hi)``."""
+        pos = lo
+        while pos < hi and not self.isInterruptionRequested():
+            end = min(hi, pos + _FIND_STEP)
+            for m in self.rx.finditer(self.data, pos, min(len(self.data), end + self._overlap)):
+                if m.start() >= end:
+                    break
+                if self._on_char_boundary(m.start()):
+                    return m.start()
+            pos = end
+        return None
+
+    def _scan_backward(self, lo: int, hi: int) -> int | None:
+        """Last hit starting in ``[lo, hi)``."""
+        end = hi
+        while end > lo and not self.isInterruptionRequested():
+            pos = max(lo, end - _FIND_STEP)
+            last = None
+            for m in self.rx.finditer(self.data, pos, min(len(self.data), end + self._overlap)):
+                if m.start() >= end:
+                    break
+                if self._on_char_boundary(m.start()):
+                    last = m.start()
+            if last is not None:
+                return last
+            end = pos
+        return None
+
+    def _on_char_boundary(self, offset: int) -> bool:
+        lo = max(0, offset - _SYNC_WINDOW)
+        sync = _SYNC.search(self.data, lo, offset)
+        if sync is not None:
+            lo = sync.start() + 1
+        elif lo:
+            return True  # no safe place to resume decoding; accept the hit
+        decoder = codecs.getincrementaldecoder(self.encoding)("replace")
+        decoder.decode(self.data[lo:offset], False)
+        return not decoder.getstate()[0]
+
+
+class HugeFileView(QAbstractScrollArea):
+    """Read-only viewer for files too large for QPlainTextEdit.
+
+    The file is memory-mapped and only the lines inside the viewport are
+    decoded and painted, so memory stays flat regardless of file size. Lines
+    and columns are addressed through a sparse :class:`LineIndex` that is
+    built in the background; scrolling grows as indexing progresses.
+    """
+
+    cursorPositionChanged = pyqtSignal()
+    indexProgress = pyqtSignal("qint64", "qint64")
+    findFinished = pyqtSignal(bool)  # whether the last find() matched
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setObjectName("HugeFileView")
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.path: str | None = None
+        self.encoding = "utf-8"
+        self.index: LineIndex | None = None
+        self._file = None
+        self._map: mmap.mmap | None = None
+        self._indexer: LineIndexer | None = None
+        self._finder: HugeFinder | None = None
+        self._find_length = 0
+        self._line = 0
+        self._col = 0
+        self._match: tuple[int, int, int] | None = None  # line, col, length
+        self._match_offset = 0  # byte offset of _match, which may lie past a cut line
+        self._max_width = 0
+        self._scale = 1
+
+    # ----- lifecycle -----
+    def open(self, path: str, encoding: str = "utf-8", line_index: bytes | None = None) -> None:
+        """Map ``path``; ``line_index`` (from ``LineIndex.export``) skips indexing."""
+        self.close_file()
+        self.path = path
+        self.encoding = encoding
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.index = LineIndex(self._map if self._map is not None else b"")
+        self._line = self._col = 0
+        self._match = None
+        self._max_width = 0
+        if line_index is None or not self.index.restore(line_index):
+            self._indexer = LineIndexer(self.index, self)
+            self._indexer.progress.connect(self._on_index_progress)
+            self._indexer.finished.connect(self._update_scrollbars)
+            self._indexer.start(QThread.Priority.LowPriority)
+        self._update_scrollbars()
+        self.verticalScrollBar().setValue(0)
+        self.viewport().update()
+        self.cursorPositionChanged.emit()
+
+    def close_file(self) -> None:
+        self._stop_find()
+        if self._indexer is not None:
+            self._indexer.requestInterruption()
+            self._indexer.wait()
+            self._indexer.deleteLater()
+            self._indexer = None
+        self.index = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.path = None
+
+    # ----- queries -----
+    def cursor_position(self) -> tuple[int, int]:
+        """0-based (line, column) of the caret."""
+        return self._line, self._col
+
+    def line_count(self) -> int:
+        return self.index.line_count if self.index is not None else 0
+
+    def first_visible_line(self) -> int:
+        return self._top_line()
+
+    def line_text(self, line: int) -> str:
+        if self.index is None:
+            return ""
+        raw, truncated = self.index.line_bytes(line)
+        text = raw.decode(self.encoding, errors="replace")
+        return text + "…" if truncated else text
+
+    # ----- navigation -----
+    def goto_line(self, line: int, col: int = 0) -> None:
+        """Move the caret to 0-based ``line`` and scroll it into view."""
+        self._move_caret(line, col, center=True)
+
+    def scroll_to_line(self, line: int) -> None:
+        """Make 0-based ``line`` the first visible one (as far as possible)."""
+        self.verticalScrollBar().setValue(max(0, line) // self._scale)
+
+    def find(self, query: SearchQuery, forward: bool = True) -> None:
+        """Search the raw bytes from the caret in the background; no full decode.
+
+        The pattern is always literal. Case folding only covers ASCII letters,
+        since it works on the encoded bytes. The result is reported through
+        ``findFinished``, and a new call cancels one still running.
+        """
+        self._stop_find()
+        try:
+            pattern = query.pattern.encode(self.encoding)
+        except UnicodeEncodeError:  # cannot occur in this file
+            pattern = b""
+        if self.index is None or self._map is None or not pattern:
+            self.findFinished.emit(False)
+            return
+        source = re.escape(pattern)
+        if query.whole_word:
+            source = rb"\b(?:" + source + rb")\b"
+        rx = re.compile(source, 0 if query.case_sensitive else re.IGNORECASE)
+        if self._match is not None and self._match[:2] == (self._line, self._col):
+            here = self._match_offset
+        else:
+            start = self.index.line_start(self._line) or 0
+            prefix = self.line_text(self._line)[: self._col]
+            here = start + len(prefix.encode(self.encoding, errors="replace"))
+        if forward and self._match is not None:
+            here += 1
+        self._find_length = len(query.pattern)
+        self._finder = HugeFinder(self._map, self.index, rx, self.encoding, here, forward, self)
+        self._finder.found.connect(self._on_found)
+        self._finder.notFound.connect(self._on_not_found)
+        self._finder.start()
+
+    def _stop_find(self) -> None:
+        if self._finder is not None:
+            self._finder.requestInterruption()
+            self._finder.wait()
+            self._finder.deleteLater()
+            self._finder = None
+
+    def _on_found(self, hit: int, line: int, line_start: int) -> None:
+        if self.sender() is not self._finder:  # queued from a cancelled find
+            return
+        # Lines are shown cut at MAX_LINE_BYTES; a hit beyond puts the caret at the cut
+        end = min(hit, line_start + MAX_LINE_BYTES)
+        col = len(self._map[line_start:end].decode(self.encoding, errors="replace"))
+        self._match = (line, col, self._find_length)
+        self._match_offset = hit
+        self.goto_line(line, col)
+        self.findFinished.emit(True)
+
+    def _on_not_found(self) -> None:
+        if self.sender() is self._finder:
+            self.findFinished.emit(False)
+
+    # ----- painting -----
+    def paintEvent(self, event) -> None:  # noqa: N802
+        painter = QPainter(self.viewport())
+        pal = self.palette()
+        painter.fillRect(event.rect(), pal.base())
+        if self.index is None:
+            return
+        fm = self.fontMetrics()
+        height = fm.lineSpacing()
+        top = self._top_line()
+        x0 = 4 - self.horizontalScrollBar().value()
+        rows = self.viewport().height() // height + 1
+        total = self.line_count()
+        widest = self._max_width
+        painter.setPen(pal.text().color())
+        for row in range(rows):
+            line = top + row
+            if line >= total:
+                break
+            y = row * height
+            text = self.line_text(line)
+            if line == self._line:
+                painter.fillRect(0, y, self.viewport().width(), height, pal.alternateBase())
+            if self._match is not None and self._match[0] == line:
+                _, col, length = self._match
+                mx = x0 + fm.horizontalAdvance(text[:col])
+                painter.fillRect(mx, y, fm.horizontalAdvance(text[col:col + length]), height, pal.highlight())
+            painter.drawText(x0, y + fm.ascent(), text)
+            widest = max(widest, fm.horizontalAdvance(text))
+        if widest != self._max_width:
+            self._max_width = widest
+            self._update_scrollbars()
+
+    # ----- input -----
+    def mousePressEvent(self, event) -> None:  # noqa: N802
+        fm = self.fontMetrics()
+        line = self._top_line() + int(event.position().y()) // fm.lineSpacing()
+        if line >= self.line_count():
+            return
+        text = self.line_text(line)
+        x = event.position().x() - 4 + self.horizontalScrollBar().value()
+        col = 0
+        while col < len(text) and fm.horizontalAdvance(text[: col + 1]) <= x:
+            col += 1
+        self._line, self._col = line, col
+        self._match = None
+        self.viewport().update()
+        self.cursorPositionChanged.emit()
+
+    def keyPressEvent(self, event) -> None:  # noqa: N802
+        key = event.key()
+        page = max(1, self.viewport().height() // self.fontMetrics().lineSpacing() - 1)
+        ctrl = bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+        moves = {
+            Qt.Key.Key_Up: self._line - 1,
+            Qt.Key.Key_Down: self._line + 1,
+            Qt.Key.Key_PageUp: self._line - page,
+            Qt.Key.Key_PageDown: self._line + page,
+        }
+        if key in moves:
+            self._move_caret(moves[key], 0, center=False)
+        elif key == Qt.Key.Key_Home and ctrl:
+            self.goto_line(0)
+        elif key == Qt.Key.Key_End and ctrl:
+            self.goto_line(self.line_count() - 1)
+        else:
+            super().keyPressEvent(event)
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:  # noqa: N802
+        self.viewport().update()
+
+    def resizeEvent(self, event) -> None:  # noqa: N802
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    # ----- internals -----
+    def _move_caret(self, line: int, col: int, center: bool) -> None:
+        total = self.line_count()
+        if total <= 0:
+            return
+        self._line = max(0, min(line, total - 1))
+        self._col = max(0, col)
+        self._ensure_visible(center=center)
+        self.viewport().update()
+        self.cursorPositionChanged.emit()
+
+    def _top_line(self) -> int:
+        return self.verticalScrollBar().value() * self._scale
+
+    def _visible_rows(self) -> int:
+        return max(1, self.viewport().height() // self.fontMetrics().lineSpacing())
+
+    def _ensure_visible(self, center: bool) -> None:
+        top = self._top_line()
+        rows = self._visible_rows()
+        if center and not (top <= self._line < top + rows):
+            self.verticalScrollBar().setValue(max(0, self._line - rows // 2) // self._scale)
+        elif self._line < top:
+            self.verticalScrollBar().setValue(self._line // self._scale)
+        elif self._line >= top + rows:
+            self.verticalScrollBar().setValue((self._line - rows + 1) // self._scale)
+
+    def _on_index_progress(self, done: int, total: int) -> None:
+        self._update_scrollbars()
+        self.indexProgress.emit(done, total)
+
+    def _update_scrollbars(self) -> None:
+        total = self.line_count()
+        rows = self._visible_rows()
+        span = max(0, total - rows)
+        self._scale = max(1, -(-span // _SCROLL_MAX))
+        vbar = self.verticalScrollBar()
+        vbar.setRange(0, span // self._scale)
+        vbar.setPageStep(max(1, rows // self._scale))
+        hbar = self.horizontalScrollBar()
+        hbar.setRange(0, max(0, self._max_width + 8 - self.viewport().width()))
+        hbar.setPageStep(self.viewport().width())
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+from ..utils.single_instance import MAX_REQUEST_BYTES, decode_request, server_name
+
+# How long a starting instance probes an existing socket before calling it stale
+_PROBE_MS = 200
+
+
+class InstanceServer(QObject):
+    """Accept command lines handed over by later ``scribeone`` invocations.
+
+    Each connection carries one request line (see ``utils.single_instance``);
+    it is acknowledged immediately and then emitted as
+    ``requestReceived(cwd, argv)``, so a slow open or a modal prompt in this
+    instance never keeps the other process waiting.
+    """
+
+    requestReceived = pyqtSignal(str, list)  # cwd, argv
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._server = QLocalServer(self)
+        # Only the current user may connect (socket file mode 0600 on Unix)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers: dict[QLocalSocket, bytearray] = {}
+
+    def listen(self) -> bool:
+        """Start serving; False if another live instance already is."""
+        name = server_name()
+        if name is None:
+            return False
+        # Probe first: with UserAccessOption Qt binds in a temp dir and renames
+        # the socket into place, which would silently replace a live server
+        if self._is_alive(name):
+            return False
+        # Whatever is left is a socket file from a crashed instance
+        QLocalServer.removeServer(name)
+        return self._server.listen(name)
+
+    def close(self) -> None:
+        self._server.close()
+
+    @staticmethod
+    def _is_alive(name: str) -> bool:
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        alive = probe.waitForConnected(_PROBE_MS)
+        probe.abort()
+        return alive
+
+    def _on_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            sock = self._server.nextPendingConnection()
+            if sock is None:
+                break
+            self._buffers[sock] = bytearray()
+            sock.readyRead.connect(lambda s=sock: self._on_ready_read(s))
+            sock.disconnected.connect(lambda s=sock: self._drop(s))
+
+    def _on_ready_read(self, sock: QLocalSocket) -> None:
+        buf = self._buffers.get(sock)
+        if buf is None:
+            return
+        buf += bytes(sock.readAll())
+        if len(buf) > MAX_REQUEST_BYTES:
+            sock.abort()
+            return
+        end = buf.find(b"\n")
+        if end < 0:
+            return
+        try:
+            cwd, argv = decode_request(bytes(buf[:end]))
+        except ValueError:
+            sock.abort()
+            return
+        sock.write(b"ok\n")
+        sock.flush()
+        sock.disconnectFromServer()
+        self.requestReceived.emit(cwd, argv)
+
+    def _drop(self, sock: QLocalSocket) -> None:
+        self._buffers.pop(sock, None)
+        sock.deleteLater()
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import itertools
+import os
+import time
+from collections import deque
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from PyQt6.QtCore import Qt, QSettings, QPropertyAnimation, QParallelAnimationGroup, QEasingCurve, QRect
-from PyQt6.QtGui import QAction, QKeySequence
+from PyQt6.QtCore import Qt, QAbstractAnimation, QEvent, QPropertyAnimation, QParallelAnimationGroup, QEasingCurve, QRect, QThread, QTimer, QEventLoop, pyqtSignal
+from PyQt6.QtGui import QAction, QKeySequence, QTextCursor, QTextDocument
 from PyQt6.QtWidgets import (
     QApplication,
     QFileDialog,
     QMainWindow,
+    QPlainTextDocumentLayout,
     QPlainTextEdit,
     QStatusBar,
     QMenuBar,
@@ -15,24 +21,113 @@ from PyQt6.QtWidgets import (
     QGraphicsOpacityEffect,
     QToolBar,
     QLabel,
+    QProgressBar,
+    QToolButton,
+    QStackedWidget,
+    QTabBar,
+    QInputDialog,
+    QVBoxLayout,
+    QWidget,
 )
 
 from ..core.document import Document
-from .dialogs import confirm_close_unsaved
-from .encoding_prompt import choose_encoding
-from ..utils.recent_files import add_recent, list_recent
-from .snackbar import Snackbar
-from .about import AboutDialog
+from ..core.text_stats import TextStats
+from ..core.fileio import (
+    DURABILITY_LEVELS,
+    compression_for_name,
+    detect_compression,
+    detect_encoding,
+    detect_newline,
+    is_ascii_compatible,
+)
+from ..utils.recent_files import list_recent, recent_files
+from ..utils.app_paths import app_data_dir
+from ..utils.settings import (
+    COMPRESSION_LEVEL,
+    DURABILITY,
+    FOLLOW_MAX_LINES,
+    HUGE_FILE_THRESHOLD,
+    REDUCED_EFFECTS,
+    SIDEBAR_VISIBLE,
+    SESSION_RESTORE,
+    SIDEBAR_WIDTH,
+    TAB_MEMORY_BUDGET,
+    WORD_WRAP,
+    settings,
+)
+from ..utils.workspace_settings import workspace_root
+from .chrome_scheduler import ChromeScheduler
+from .document_tabs import DocumentTab
+from .effects import reduced_effects
 from .theme_manager import ThemeManager
 # from .sidebar import SidebarDock  # deprecated dock version
-from .sidebar_panel import SidebarPanel
-from .messages import MSG_SAVED, ERR_OPEN_FAILED, ERR_SAVE_FAILED, WARN_OVERWRITE
+from .messages import (
+    MSG_SAVED,
+    MSG_SAVING,
+    MSG_LOADING,
+    MSG_OPEN_CANCELLED,
+    MSG_READ_ONLY,
+    MSG_FOLLOWING,
+    MSG_FOLLOW_RESTARTED,
+    MSG_FOLLOW_COMPRESSED,
+    MSG_NOT_FOUND,
+    MSG_REPLACED,
+    MSG_RECOVER,
+    MSG_RELOADED,
+    MSG_RELOAD_CONFLICT,
+    MSG_FILE_GONE,
+    WARN_MIXED_NEWLINES,
+    WARN_RECOVER_BASE_CHANGED,
+    ERR_OPEN_FAILED,
+    ERR_SAVE_FAILED,
+    WARN_OVERWRITE,
+)
+
+# Everything below is imported where first used, so a cold start only loads
+# what the first paint needs (see ``python -m scribeone.main --startup-profile``)
+if TYPE_CHECKING:
+    from ..core.file_diff import Hunk
+    from ..core.journal import EditJournal, RecoveredDocument
+    from ..utils.session import Session, SessionTab
+    from .file_loader import FileLoader
+    from .file_saver import FileSaver
+    from .file_watcher import ExternalChange, FileWatcher
+    from .find_bar import FindBar
+    from .huge_viewer import HugeFileView
+    from .quick_open import QuickOpen
+    from .search_session import SearchSession
+    from .tail_follower import TailFollower
+    from .sidebar_panel import SidebarPanel
+    from .snackbar import Snackbar
+
+# Files at least this large are decoded on a worker and streamed into the editor
+ASYNC_OPEN_THRESHOLD = 4 * 1024 * 1024
+# GUI time spent inserting streamed text per tick, and the largest single insert
+_FEED_BUDGET_S = 0.008
+_FEED_SLICE = 64 * 1024
+# Line break styles as shown in the status bar
+_NEWLINE_NAMES = {"\n": "LF", "\r\n": "CRLF", "\r": "CR"}
+# Idle time before pending journal records are handed to the writer
+_JOURNAL_DEBOUNCE_MS = 1000
+# Idle time before the session (open tabs, carets) is stored again
+_SESSION_DEBOUNCE_MS = 1000
+# Run the deferred startup stage even if no paint was observed by then
+_STARTUP_FALLBACK_MS = 250
+# Hover edge reveal: the pointer opens the sidebar within this many pixels of
+# the left edge, and closes it only this far past its right edge
+_EDGE_REVEAL_PX = 6
+_EDGE_HIDE_MARGIN_PX = 40
 
 
 class MainWindow(QMainWindow):
+    documentLoaded = pyqtSignal(str)
+    saveFinished = pyqtSignal(str, bool)  # path, succeeded
+    firstPainted = pyqtSignal()
+    startupFinished = pyqtSignal()  # the deferred startup stage has run
+
     # Declare attribute types for analyzers
-    sidebar: SidebarPanel
-    _sidebar_effect: QGraphicsOpacityEffect
+    sidebar: SidebarPanel | None
+    _sidebar_effect: QGraphicsOpacityEffect | None  # None with reduced effects
     _sidebar_target_width: int
     _sidebar_anim: QParallelAnimationGroup | None
     _sidebar_visible: bool
@@ -41,14 +136,72 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("ScribeOne — untitled [○]")
         self.resize(900, 640)
 
-        # Document model
-        self.doc = Document()
-
         # Editor
         self.editor = QPlainTextEdit(self)
         self.editor.setTabStopDistance(4 * self.editor.fontMetrics().horizontalAdvance(" "))
-        self.editor.textChanged.connect(self._on_text_changed)
-        self.setCentralWidget(self.editor)
+        self._suppress_edits = False
+
+        # Open documents, one tab each, with their own model and QTextDocument;
+        # self.doc, self._journal and self._stats are the current tab's
+        self._tabs = QTabBar(self)
+        self._tabs.setAutoHide(True)  # a single document looks as it always did
+        self._tabs.setDocumentMode(True)
+        self._tabs.setTabsClosable(True)
+        self._tabs.setMovable(True)
+        self._tabs.setExpanding(False)
+        self._tabs.currentChanged.connect(self._on_tab_changed)
+        self._tabs.tabCloseRequested.connect(self._on_tab_close_requested)
+        self._tabs.tabMoved.connect(self._schedule_session)
+        self._tab_clock = itertools.count(1)
+        self._tab = self._add_tab()
+        self._show_tab(self._tab)
+        self._loader: FileLoader | None = None
+        self._pending_chunks: deque[str] = deque()
+        self._pending_offset = 0
+        self._feed_timer = QTimer(self)
+        self._feed_timer.setInterval(0)
+        self._feed_timer.timeout.connect(self._feed_editor)
+        self._huge_view: HugeFileView | None = None
+        # Follow (tail -f) mode: appended text waits here to be fed in slices
+        self._follower: TailFollower | None = None
+        self._tail_pending: deque[str] = deque()
+        self._tail_pending_lines = 0
+        self._tail_max_lines = 0
+        self._tail_timer = QTimer(self)
+        self._tail_timer.setInterval(0)
+        self._tail_timer.timeout.connect(self._feed_tail)
+        self._saver: FileSaver | None = None
+        self._file_watcher: FileWatcher | None = None  # created for the first file opened
+        self._saving_doc: Document | None = None
+        self._last_save_ok = True
+        self._journal_dir = app_data_dir("journal")
+        self._journal: EditJournal | None = None
+        self._journal_timer = QTimer(self)
+        self._journal_timer.setSingleShot(True)
+        self._journal_timer.setInterval(_JOURNAL_DEBOUNCE_MS)
+        self._journal_timer.timeout.connect(self._flush_journal)
+        # Set up by restore_session(); a window without one forgets its tabs
+        self._session_enabled = False
+        self._session_saved = ""
+        self._session_timer = QTimer(self)
+        self._session_timer.setSingleShot(True)
+        self._session_timer.setInterval(_SESSION_DEBOUNCE_MS)
+        self._session_timer.timeout.connect(self._write_session)
+        self._find_bar: FindBar | None = None
+        self._search: SearchSession | None = None
+        self._quick_open: QuickOpen | None = None
+        # path, 1-based line and column, and the first visible line to restore (or None)
+        self._pending_goto: tuple[str, int, int, int | None] | None = None
+        self._stack = QStackedWidget(self)
+        self._stack.addWidget(self.editor)
+        # The find bar is added under the editor stack when first opened
+        central = QWidget(self)
+        self._central_layout = QVBoxLayout(central)
+        self._central_layout.setContentsMargins(0, 0, 0, 0)
+        self._central_layout.setSpacing(0)
+        self._central_layout.addWidget(self._tabs)
+        self._central_layout.addWidget(self._stack)
+        self.setCentralWidget(central)
 
         # Actions and Menus
         self._build_actions()
@@ -57,30 +210,423 @@ class MainWindow(QMainWindow):
         # Status bar + indicators
         self.status = QStatusBar(self)
         self.setStatusBar(self.status)
+        # The path sits in a normal (non-permanent) widget so transient
+        # messages temporarily cover it instead of being overwritten by it
+        self._path_label = QLabel(self)
+        self.status.addWidget(self._path_label, 1)
+        self._stats_label = QLabel(self)
         self._pos_label = QLabel("Ln 1, Col 1", self)
         self._wrap_label = QLabel("Wrap: On", self)
+        # Line breaks written on save: as found in the file, or chosen here
+        self._newline_button = QToolButton(self)
+        self._newline_button.setToolTip("保存时使用的换行符")
+        self._newline_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        newline_menu = QMenu(self._newline_button)
+        for newline, name in _NEWLINE_NAMES.items():
+            newline_menu.addAction(name, lambda nl=newline: self._set_newline(nl))
+        self._newline_button.setMenu(newline_menu)
+        self.status.addPermanentWidget(self._stats_label)
         self.status.addPermanentWidget(self._pos_label)
+        self.status.addPermanentWidget(self._newline_button)
         self.status.addPermanentWidget(self._wrap_label)
+        self._load_progress = QProgressBar(self)
+        self._load_progress.setRange(0, 1000)
+        self._load_progress.setFixedWidth(160)
+        self._load_progress.setTextVisible(False)
+        self._load_cancel = QToolButton(self)
+        self._load_cancel.setText("取消")
+        self._load_cancel.clicked.connect(self._cancel_open)
+        self.status.addPermanentWidget(self._load_progress)
+        self.status.addPermanentWidget(self._load_cancel)
+        self._load_progress.hide()
+        self._load_cancel.hide()
+        # Title, path, Ln/Col and counters are redrawn at most once per frame
+        self._chrome = ChromeScheduler(self)
+        self._chrome.add("title", self._render_title)
+        self._chrome.add("status", self._render_status)
+        self._chrome.add("cursor", self._render_cursor_pos)
+        self._chrome.add("stats", self._render_stats)
         self.editor.cursorPositionChanged.connect(self._update_cursor_pos)
-        self._update_chrome()
+        self._chrome.flush()
 
-        # Preferences and helpers
+        # Preferences and theme; the stylesheet is applied before the first
+        # paint so the window never flashes unstyled
         self._restore_prefs()
-        self._snackbar = Snackbar(self)
+        self._snackbar_widget: Snackbar | None = None
         self._theme_manager = ThemeManager(QApplication.instance())
         self._theme_manager.restore()
 
-        # Sidebar panel (non-dock overlay)
-        self.sidebar = SidebarPanel(self)
-        self.sidebar.set_root(str(Path.home()))
-        self.sidebar.fileOpenRequested.connect(self._open_path)
-        self._sidebar_effect = QGraphicsOpacityEffect(self.sidebar)
-        self.sidebar.setGraphicsEffect(self._sidebar_effect)
+        # The sidebar, crash recovery and the blank document's journal are
+        # set up by _finish_startup() once the editor has been painted
+        self.sidebar = None
+        self._sidebar_effect = None
+        self._sidebar_anim = None
         self._sidebar_target_width = 260
         self._sidebar_visible = True
-        self._install_sidebar_overlay()
-        self._init_sidebar_state()
+        self._sidebar_hover_revealed = False  # opened by the edge, so the edge may close it
+        self._startup_done = False
+        self.act_toggle_sidebar.blockSignals(True)
+        self.act_toggle_sidebar.setChecked(settings().get(SIDEBAR_VISIBLE))
+        self.act_toggle_sidebar.blockSignals(False)
+
+    def showEvent(self, event) -> None:  # noqa: N802
+        super().showEvent(event)
+        if not self._startup_done:
+            self.editor.viewport().installEventFilter(self)
+            QTimer.singleShot(_STARTUP_FALLBACK_MS, self._finish_startup)
+
+    def _finish_startup(self) -> None:
+        """Second startup stage: everything the first paint does not need."""
+        if self._startup_done:
+            return
+        self._startup_done = True
+        self.editor.viewport().removeEventFilter(self)
+        self._build_sidebar()
+        # Crash recovery: attach a journal to the blank document, then look for leftovers
+        if self._journal is None:
+            self._attach_journal()
+        self.startupFinished.emit()
+        QTimer.singleShot(0, self._offer_recovery)
+
+    def bring_to_front(self) -> None:
+        """Raise the window, e.g. when another invocation handed over files."""
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    @property
+    def _snackbar(self) -> Snackbar:
+        if self._snackbar_widget is None:
+            from .snackbar import Snackbar
+
+            self._snackbar_widget = Snackbar(self)
+        return self._snackbar_widget
+
+
+    # ----- Tabs -----
+    # The current tab's model, journal and counters; the rest of the window
+    # works on these and never needs to know about the other tabs
+    @property
+    def doc(self) -> Document:
+        return self._tab.doc
+
+    @doc.setter
+    def doc(self, doc: Document) -> None:
+        self._tab.doc = doc
+
+    @property
+    def _journal(self) -> EditJournal | None:
+        return self._tab.journal
+
+    @_journal.setter
+    def _journal(self, journal: EditJournal | None) -> None:
+        self._tab.journal = journal
+
+    @property
+    def _stats(self) -> TextStats:
+        return self._tab.stats
+
+    @_stats.setter
+    def _stats(self, stats: TextStats) -> None:
+        self._tab.stats = stats
+
+    def _all_tabs(self) -> list[DocumentTab]:
+        return [self._tabs.tabData(i) for i in range(self._tabs.count())]
+
+    def _tab_index(self, tab: DocumentTab) -> int:
+        return next(i for i in range(self._tabs.count()) if self._tabs.tabData(i) is tab)
+
+    def _find_tab(self, path: str) -> DocumentTab | None:
+        return next((t for t in self._all_tabs() if t.is_for(path)), None)
+
+    def _new_qdoc(self) -> QTextDocument:
+        qdoc = QTextDocument(self)
+        qdoc.setDocumentLayout(QPlainTextDocumentLayout(qdoc))
+        qdoc.contentsChange.connect(self._on_contents_change)
+        return qdoc
+
+    def _add_tab(self) -> DocumentTab:
+        """Append a tab holding a blank document (not activated)."""
+        tab = DocumentTab(Document(), self._new_qdoc(), TextStats())
+        self._tabs.blockSignals(True)
+        try:
+            self._tabs.setTabData(self._tabs.addTab(tab.title()), tab)
+        finally:
+            self._tabs.blockSignals(False)
+        return tab
+
+    def _on_tab_changed(self, index: int) -> None:
+        if index >= 0:
+            self._activate_tab(self._tabs.tabData(index))
+
+    def _on_tab_close_requested(self, index: int) -> None:
+        self._close_tab(self._tabs.tabData(index))
+
+    def _prepare_tab(self, path: str | None = None) -> DocumentTab | None:
+        """Make the current tab free for a document about to be loaded.
+
+        A blank tab, or the tab of ``path`` itself, is reused; otherwise a new
+        tab is activated and the one left is returned (see ``_abandon_tab``).
+        """
+        tab = self._tab
+        if tab.blank or (path and tab.is_for(path)):
+            self._stop_loader()
+            self._leave_huge_mode()
+            return None
+        self._activate_tab(self._add_tab())
+        return tab
+
+    def _abandon_tab(self, previous: DocumentTab | None) -> None:
+        """Go back to ``previous`` after opening into a new tab failed."""
+        if previous is not None and self._tab.blank:
+            failed = self._tab
+            self._activate_tab(previous)
+            self._drop_tab(failed)
+
+    def _activate_tab(self, tab: DocumentTab, line: int = 0, column: int = 0) -> None:
+        """Show ``tab`` (waking it if hibernated) at 1-based ``line``/``column`` if given."""
+        if tab is self._tab:
+            return
+        self._park_tab(self._tab)
+        self._tab = tab
+        tab.used = next(self._tab_clock)
+        self._tabs.blockSignals(True)
+        self._tabs.setCurrentIndex(self._tab_index(tab))
+        self._tabs.blockSignals(False)
+        if tab.resident:
+            self._show_tab(tab)
+            self._watch_file()
+            if tab.baseline is not None and self._file_watcher is not None and self._file_watcher.path:
+                # Catch up with changes made while the tab was in the background
+                self._file_watcher.set_baseline(tab.baseline)
+                self._file_watcher.check()
+            if line:
+                self.goto_line(line, column)
+        else:
+            self._wake_tab(tab, line, column)
+        self._sync_search()
+        self._update_chrome()
+        self._chrome.invalidate("cursor")
+        self._enforce_memory_budget()
+
+    def _show_tab(self, tab: DocumentTab) -> None:
+        # Tab stops, wrapping and font live on the document: carry them over
+        current = self.editor.document()
+        tab.qdoc.setDefaultTextOption(current.defaultTextOption())
+        tab.qdoc.setDefaultFont(current.defaultFont())
+        self.editor.setDocument(tab.qdoc)
+        self._restore_view(tab)
+
+    def _restore_view(self, tab: DocumentTab) -> None:
+        """Put the caret and scroll position back where ``tab`` had them."""
+        end = tab.qdoc.characterCount() - 1
+        cur = QTextCursor(tab.qdoc)
+        cur.setPosition(min(tab.anchor, end))
+        cur.setPosition(min(tab.position, end), QTextCursor.MoveMode.KeepAnchor)
+        self.editor.setTextCursor(cur)
+        self.editor.verticalScrollBar().setValue(tab.scroll)
+
+    def _park_tab(self, tab: DocumentTab) -> None:
+        """Keep what is needed to show the current ``tab`` again later."""
+        self._remember_position()
+        watcher = self._file_watcher
+        tab.baseline = watcher.baseline if watcher is not None and watcher.path else None
+        if self._loader is not None or self._follower is not None or self._in_huge_mode():
+            # Streamed, followed or mapped: the tab does not hold the file; reopen it later
+            self._stop_loader()
+            self._leave_huge_mode()
+            self._hibernate_tab(tab)
+            return
+        self._flush_journal()
+        self._journal_timer.stop()
+        cur = self.editor.textCursor()
+        tab.anchor, tab.position = cur.anchor(), cur.position()
+        tab.scroll = self.editor.verticalScrollBar().value()
+
+    def _hibernate_tab(self, tab: DocumentTab) -> None:
+        """Drop an inactive tab's text: a clean one is reloaded, a dirty one is spilled."""
+        doc = tab.doc
+        if doc is None or doc is self._saving_doc:
+            return
+        if doc.is_dirty:
+            if tab.journal is None:
+                return  # nowhere to keep the changes
+            tab.journal.spill(doc.snapshot().pieces)
+            tab.spill = tab.journal.file
+        elif tab.journal is not None:
+            tab.journal.discard()
+            tab.journal.close()
+        tab.path, tab.encoding, tab.dirty = doc.path, doc.encoding, doc.is_dirty
+        tab.qdoc.deleteLater()
+        tab.doc = tab.qdoc = tab.stats = tab.journal = None
+
+    def _wake_tab(self, tab: DocumentTab, line: int, column: int) -> None:
+        tab.doc, tab.qdoc, tab.stats = Document(), self._new_qdoc(), TextStats()
+        self._show_tab(tab)
+        spill, tab.spill = tab.spill, None
+        if spill is not None:
+            from ..core.journal import recover
+
+            try:
+                rec = recover(spill, with_base=tab.spill_base)
+            except (OSError, ValueError):
+                self.status.showMessage(ERR_OPEN_FAILED.format(path=spill), 5000)
+            else:
+                self._restore_recovered(rec)
+                self._show_tab(tab)  # the caret and view as they were
+                if line:
+                    self.goto_line(line, column)
+                return
+        elif tab.path:
+            self._open_path(tab.path, line, column, tab.encoding)
+            if not line and self._tab is tab and self._loader is None and not self._in_huge_mode():
+                self._restore_view(tab)  # also for files that dropped out of the recent list
+        if self._journal is None and self._loader is None:
+            # Reopening failed: what is left is a blank document
+            self._attach_journal()
+            self._watch_file()
+
+    def _close_tab(self, tab: DocumentTab) -> bool:
+        """Close ``tab`` after the unsaved-changes prompt; False if the user cancelled."""
+        if tab.is_dirty:
+            self._activate_tab(tab)
+            if not self._maybe_save():
+                return False
+        if self._tabs.count() == 1:
+            self._add_tab()  # there is always a document to type into
+        if tab is self._tab:
+            i = self._tab_index(tab)
+            self._activate_tab(self._tabs.tabData(i + 1 if i + 1 < self._tabs.count() else i - 1))
+        self._drop_tab(tab)
+        return True
+
+    def _drop_tab(self, tab: DocumentTab) -> None:
+        """Remove an inactive tab, discarding its journal."""
+        self._release_tab(tab)
+        self._tabs.blockSignals(True)
+        self._tabs.removeTab(self._tab_index(tab))
+        self._tabs.blockSignals(False)
+        self._schedule_session()
+
+    def _release_tab(self, tab: DocumentTab) -> None:
+        if tab.journal is not None:
+            tab.journal.discard()
+            tab.journal.close()
+        if tab.spill is not None:
+            from ..core.journal import delete_journal
+
+            delete_journal(tab.spill)
+        if tab.qdoc is not None:
+            tab.qdoc.deleteLater()
+        tab.doc = tab.qdoc = tab.stats = tab.journal = tab.spill = None
+
+    # ----- Session -----
+    def restore_session(self) -> None:
+        """Reopen the documents of the last session and keep the session up to date.
+
+        Only the active document is loaded; the others come back as
+        hibernated tabs and are read when first shown.
+        """
+        if not settings().get(SESSION_RESTORE):
+            return
+        from ..utils.session import load_session
+
+        self._session_enabled = True
+        session = load_session()
+        if not session.tabs:
+            return
+        blank = self._tab if self._tab.blank else None
+        stubs = [self._add_stub(entry) for entry in session.tabs]
+        self._activate_tab(stubs[session.active])
+        if blank is not None:
+            self._drop_tab(blank)
+
+    def _add_stub(self, entry: SessionTab) -> DocumentTab:
+        """Append a hibernated tab for a session entry."""
+        journal = Path(entry.journal) if entry.journal else None
+        if journal is not None and not journal.exists():
+            journal = None  # its changes are gone; the file is all there is
+        tab = DocumentTab(
+            None, None, None,
+            path=entry.path, encoding=entry.encoding, dirty=journal is not None,
+            spill=journal, spill_base=journal is not None and not entry.spilled,
+            anchor=entry.anchor, position=entry.position, scroll=entry.scroll,
+        )
+        self._tabs.blockSignals(True)
+        try:
+            index = self._tabs.addTab(tab.title())
+            self._tabs.setTabData(index, tab)
+            self._tabs.setTabToolTip(index, entry.path or "")
+        finally:
+            self._tabs.blockSignals(False)
+        return tab
+
+    def _schedule_session(self, *_args) -> None:
+        if self._session_enabled:
+            self._session_timer.start()
+
+    def _write_session(self) -> None:
+        from ..utils.session import save_session, session_json
+
+        session = self._session_state()
+        text = session_json(session)
+        if text != self._session_saved:
+            self._session_saved = text
+            save_session(session)
+
+    def _session_state(self) -> Session:
+        from ..utils.session import Session, SessionTab
+
+        entries: list[SessionTab] = []
+        active = 0
+        streamed = self._loader is not None or self._follower is not None or self._in_huge_mode()
+        for tab in self._all_tabs():
+            path = tab.file_path
+            journal = tab.spill or (tab.journal.file if tab.is_dirty and tab.journal is not None else None)
+            if not path and journal is None:
+                continue  # an untitled tab with nothing in it
+            if tab is self._tab:
+                active = len(entries)
+                if streamed:
+                    anchor = position = scroll = 0  # the recent files have the file's position
+                else:
+                    cur = self.editor.textCursor()
+                    anchor, position = cur.anchor(), cur.position()
+                    scroll = self.editor.verticalScrollBar().value()
+            else:
+                anchor, position, scroll = tab.anchor, tab.position, tab.scroll
+            encoding = tab.doc.encoding if tab.doc is not None else tab.encoding
+            entries.append(SessionTab(
+                path, encoding, str(journal) if journal else None,
+                tab.spill is not None and not tab.spill_base, anchor, position, scroll,
+            ))
+        return Session(tuple(entries), active)
+
+    def _keeps_for_session(self, tab: DocumentTab) -> bool:
+        """Whether closing may keep a dirty tab's changes for the next session instead of asking."""
+        if not self._session_enabled:
+            return False
+        return tab.spill is not None or (tab.journal is not None and tab.doc is not self._saving_doc)
 
+    def _spill_for_session(self, tab: DocumentTab) -> None:
+        if tab is self._tab:
+            self._journal_timer.stop()
+        tab.journal.spill(tab.doc.snapshot().pieces)
+        tab.spill, tab.spill_base, tab.journal = tab.journal.file, False, None
+
+    def _enforce_memory_budget(self) -> None:
+        """Hibernate the least recently used inactive tabs until the open text fits the budget."""
+        budget = max(1, settings().get(TAB_MEMORY_BUDGET)) << 20
+        resident = [t for t in self._all_tabs() if t.resident]
+        total = sum(t.cost() for t in resident)
+        for tab in sorted(resident, key=lambda t: t.used):
+            if total <= budget:
+                break
+            if tab is not self._tab:
+                total -= tab.cost()
+                self._hibernate_tab(tab)
 
     # ----- UI Build -----
     def _build_actions(self) -> None:
@@ -92,6 +638,9 @@ class MainWindow(QMainWindow):
         self.act_open.setShortcut(QKeySequence.StandardKey.Open)
         self.act_open.triggered.connect(self._open_file)
 
+        self.act_open_folder = QAction("Open Folder…", self)
+        self.act_open_folder.triggered.connect(self._open_folder)
+
         self.act_save = QAction("Save", self)
         self.act_save.setShortcut(QKeySequence.StandardKey.Save)
         self.act_save.triggered.connect(self._save_file)
@@ -110,6 +659,16 @@ class MainWindow(QMainWindow):
         self.act_toggle_wrap.setShortcut("Alt+Z")
         self.act_toggle_wrap.toggled.connect(self._toggle_wrap)
 
+        self.act_follow = QAction("Follow", self)
+        self.act_follow.setCheckable(True)
+        self.act_follow.setShortcut("Ctrl+Shift+L")
+        self.act_follow.setToolTip("Follow the file as it grows (tail -f)")
+        self.act_follow.toggled.connect(self._toggle_follow)
+
+        self.act_reduce_effects = QAction("Reduce Animations", self)
+        self.act_reduce_effects.setCheckable(True)
+        self.act_reduce_effects.toggled.connect(self._set_reduced_effects)
+
         # Help and Theme
         self.act_about = QAction("About", self)
         self.act_about.setShortcut("F1")
@@ -120,6 +679,45 @@ class MainWindow(QMainWindow):
         self.act_theme_light.triggered.connect(lambda: self._apply_theme("light"))
         self.act_theme_dark.triggered.connect(lambda: self._apply_theme("dark"))
 
+        # Navigation (shortcut-only; not on the toolbar)
+        self.act_goto_line = QAction("Go to Line…", self)
+        self.act_goto_line.setShortcut("Ctrl+G")
+        self.act_goto_line.triggered.connect(self._goto_line)
+
+        self.act_find = QAction("Find…", self)
+        self.act_find.setShortcut(QKeySequence.StandardKey.Find)
+        self.act_find.triggered.connect(lambda: self._find())
+
+        self.act_replace = QAction("Replace…", self)
+        self.act_replace.setShortcut(QKeySequence.StandardKey.Replace)
+        self.act_replace.triggered.connect(lambda: self._find(replace=True))
+
+        self.act_find_next = QAction("Find Next", self)
+        self.act_find_next.setShortcut(QKeySequence.StandardKey.FindNext)
+        self.act_find_next.triggered.connect(lambda: self._find_again(forward=True))
+
+        self.act_find_prev = QAction("Find Previous", self)
+        self.act_find_prev.setShortcut(QKeySequence.StandardKey.FindPrevious)
+        self.act_find_prev.triggered.connect(lambda: self._find_again(forward=False))
+
+        self.act_quick_open = QAction("Go to File…", self)
+        self.act_quick_open.setShortcut("Ctrl+P")
+        self.act_quick_open.triggered.connect(self._show_quick_open)
+
+        self.act_close_tab = QAction("Close Tab", self)
+        self.act_close_tab.setShortcut(QKeySequence.StandardKey.Close)
+        self.act_close_tab.triggered.connect(lambda: self._close_tab(self._tab))
+
+        self.addActions([
+            self.act_close_tab,
+            self.act_goto_line,
+            self.act_quick_open,
+            self.act_find,
+            self.act_replace,
+            self.act_find_next,
+            self.act_find_prev,
+        ])
+
         # Sidebar toggle
         self.act_toggle_sidebar = QAction("Toggle Sidebar", self)
         self.act_toggle_sidebar.setCheckable(True)
@@ -135,9 +733,12 @@ class MainWindow(QMainWindow):
         tb.setIconSize(tb.iconSize())
         tb.addAction(self.act_new)
         tb.addAction(self.act_open)
+        tb.addAction(self.act_open_folder)
         tb.addAction(self.act_save)
         tb.addSeparator()
         tb.addAction(self.act_toggle_wrap)
+        tb.addAction(self.act_follow)
+        tb.addAction(self.act_reduce_effects)
         tb.addAction(self.act_toggle_sidebar)
         tb.addSeparator()
         tb.addAction(self.act_theme_light)
@@ -149,47 +750,155 @@ class MainWindow(QMainWindow):
 
     # ----- Events -----
     def closeEvent(self, event) -> None:  # noqa: N802
-        if self.doc.is_dirty:
+        for tab in self._all_tabs():
+            if not tab.is_dirty or self._keeps_for_session(tab):
+                continue
+            from .dialogs import confirm_close_unsaved
+
+            self._activate_tab(tab)
             choice = confirm_close_unsaved(self)
             if choice == "save":
-                if not self._ensure_saved():
+                if not self._ensure_saved(wait=True):
                     event.ignore()
                     return
             elif choice == "cancel":
                 event.ignore()
                 return
-            # discard → accept
-        # Persist sidebar state
-        s = QSettings()
-        s.setValue("ui/sidebarVisible", self.sidebar.isVisible())
-        s.setValue("ui/sidebarWidth", max(0, self.sidebar.width()))
+            # discard → go on
+        if self._session_enabled:
+            # Unsaved changes wait in their journals for the next session
+            for tab in self._all_tabs():
+                if tab.is_dirty and tab.spill is None and self._keeps_for_session(tab):
+                    self._spill_for_session(tab)
+            self._session_timer.stop()
+            self._write_session()
+        self._remember_position()
+        self._wait_for_save()
+        self._stop_loader()
+        if self._search is not None:
+            self._search.cancel()
+        if self._quick_open is not None:
+            self._quick_open.stop()
+        if self._file_watcher is not None:
+            self._file_watcher.shutdown()
+        if self.sidebar is not None:
+            self.sidebar.shutdown()
+        self._leave_huge_mode()
+        self._close_journal()
+        for tab in self._all_tabs():
+            if tab is not self._tab and tab.spill is None:
+                self._release_tab(tab)  # spills stay for the next session
+        # Persist sidebar state; everything pending is written before the window goes
+        s = settings()
+        if self.sidebar is not None:
+            s.set(SIDEBAR_VISIBLE, self.sidebar.isVisible())
+            s.set(SIDEBAR_WIDTH, max(0, self.sidebar.width()))
+        s.flush()
         event.accept()
 
     # ----- Slots -----
-    def _on_text_changed(self) -> None:
-        current = self.editor.toPlainText()
-        if current != self.doc.text:
-            self.doc.set_text(current)
-            self._update_chrome()
+    def _on_contents_change(self, position: int, removed: int, added: int) -> None:
+        qdoc = self.editor.document()
+        if self._suppress_edits or self.sender() is not qdoc:
+            return
+        old_len = len(self.doc)
+        new_len = qdoc.characterCount() - 1
+        # Qt may count the trailing block separator in removed/added; clamp
+        # both so the delta is consistent with the two buffer lengths.
+        removed = min(removed, old_len - position)
+        added = new_len - old_len + removed
+        if position < 0 or removed < 0 or added < 0 or position + added > new_len:
+            self._resync_document()
+            return
+        text = ""
+        if added:
+            cur = QTextCursor(qdoc)
+            cur.setPosition(position)
+            cur.setPosition(position + added, QTextCursor.MoveMode.KeepAnchor)
+            text = cur.selectedText().replace("\u2029", "\n")
+        old = self.doc.apply_edit(position, removed, text)
+        buf = self.doc.buffer
+        end = position + added
+        self._stats.apply_edit(buf.slice(position - 1, position), old, text, buf.slice(end, end + 1))
+        if self._journal is not None:
+            self._journal.record(position, removed, text)
+            self._journal_timer.start()
+        if self._search is not None:
+            self._search.on_edit(position, removed, added)
+        self._chrome.invalidate("title", "stats")
+
+    def _resync_document(self) -> None:
+        # Fallback for deltas Qt reports inconsistently: rebuild from the widget
+        self.doc.set_text(self.editor.document().toRawText().replace("\u2029", "\n"))
+        self._stats.reset(self.doc.text)
+        self._sync_search()
+        self._update_chrome()
+
+    def _set_editor_text(self, text: str) -> None:
+        # Programmatic loads must not be recorded as edits of the document
+        self._suppress_edits = True
+        try:
+            self.editor.setPlainText(text)
+        finally:
+            self._suppress_edits = False
+        self._stats.reset(text)
+        self._chrome.invalidate("stats")
+        self._sync_search()
 
-    # ----- Helpers -----
+    # ----- Chrome (window title, status bar) -----
     def _update_chrome(self) -> None:
-        name = Path(self.doc.path).name if self.doc.path else "untitled"
+        """Schedule a redraw of everything that depends on the document."""
+        self._chrome.invalidate("title", "status", "stats")
+
+    def _render_title(self) -> None:
+        name = os.path.basename(self.doc.path) if self.doc.path else "untitled"
         dot = "●" if self.doc.is_dirty else "○"
-        self.setWindowTitle(f"ScribeOne — {name} [{dot}]")
-        self.status.showMessage(self.doc.path or "(unsaved)")
+        title = f"ScribeOne — {name} [{dot}]"
+        if title != self.windowTitle():
+            self.setWindowTitle(title)
+        index = self._tab_index(self._tab)
+        self._tabs.setTabText(index, self._tab.title())
+        self._tabs.setTabToolTip(index, self.doc.path or "")
+        self._schedule_session()
+
+    def _render_status(self) -> None:
+        self._path_label.setText(self.doc.path or "(unsaved)")
+        self._newline_button.setText(_NEWLINE_NAMES.get(self.doc.newline, "LF"))
+        self._newline_button.setEnabled(not self._in_huge_mode() and self._follower is None)
+
+    def _set_newline(self, newline: str) -> None:
+        """Write the current document with ``newline`` line breaks from now on."""
+        if newline == self.doc.newline or self._in_huge_mode() or self._follower is not None:
+            return
+        self.doc.newline = newline
+        self.doc.mark_dirty()  # the file differs from what is on disk now
+        self._update_chrome()
+
+    def _render_stats(self) -> None:
+        if self._in_huge_mode():
+            self._stats_label.hide()
+            return
+        st = self._stats
+        self._stats_label.setText(f"{st.lines:,} lines · {st.words:,} words · {st.chars:,} chars")
+        self._stats_label.show()
+
+    def _maybe_save(self) -> bool:
+        """Ask about unsaved changes; False if the user cancelled."""
+        if not self.doc.is_dirty:
+            return True
+        from .dialogs import confirm_close_unsaved
+
+        choice = confirm_close_unsaved(self)
+        if choice == "save":
+            return self._ensure_saved(wait=True)
+        return choice != "cancel"
 
     def _new_file(self) -> None:
-        if self.doc.is_dirty:
-            choice = confirm_close_unsaved(self)
-            if choice == "save" and not self._ensure_saved():
-                return
-            if choice == "cancel":
-                return
+        self._prepare_tab()
         self.doc = Document()
-        self.editor.blockSignals(True)
-        self.editor.setPlainText("")
-        self.editor.blockSignals(False)
+        self._set_editor_text("")
+        self._attach_journal()
+        self._watch_file()
         self._update_chrome()
 
     def _open_file(self) -> None:
@@ -197,52 +906,594 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getOpenFileName(self, "Open", "", "Text Files (*.txt);;All Files (*)")
         if not path:
             return
-        self._open_path(path)
+        self.open_location(path)
+
+    def _open_folder(self) -> None:
+        self._build_sidebar()
+        self.sidebar.choose_root()
+
+    def open_location(self, path: str, line: int = 0, column: int = 0) -> None:
+        """Open ``path`` in a tab of its own at 1-based ``line``/``column``.
+
+        Used for command lines, including ones handed over by a later
+        invocation; a file that is already open only has its tab brought
+        forward and the caret moved.
+        """
+        tab = self._find_tab(path)
+        if tab is not None and not (tab is self._tab and self._loader is not None):
+            if tab is not self._tab:
+                self._activate_tab(tab, line, column)
+            elif line:
+                self.goto_line(line, column)
+            return
+        self._open_path(path, line, column)
 
-    def _open_path(self, path: str) -> None:
+    def _open_path(self, path: str, line: int = 0, column: int = 0, encoding: str | None = None) -> None:
+        """Open ``path`` into a tab; ``encoding`` (a tab being rehydrated) skips detection."""
         if not path:
             return
+        self._remember_position()
+        try:
+            st = os.stat(path)
+            # An unchanged recent file keeps its encoding and position
+            known = recent_files().lookup(path, st)
+            guess = None if encoding or (known is not None and known.encoding) else detect_encoding(path)
+            compression = detect_compression(path)
+        except OSError:
+            self.status.showMessage(ERR_OPEN_FAILED.format(path=path), 5000)
+            return
+        size = st.st_size
+        # Applied by _finish_open once the text (possibly streamed) is in place
+        if line:
+            self._pending_goto = (path, line, column, None)
+        elif known is not None and known.line:
+            self._pending_goto = (path, known.line, known.column, known.scroll)
+        else:
+            self._pending_goto = None
+        if guess is None:
+            encoding = encoding or known.encoding
+        else:
+            encoding = guess.encoding
+            if not guess.confident:
+                from .encoding_prompt import choose_encoding
+
+                encoding = choose_encoding(self, path, suggested=guess.encoding)
+                if not encoding:
+                    return
+        left = self._prepare_tab(path)
+        if size >= self._huge_threshold() and is_ascii_compatible(encoding) and compression is None:
+            self._open_huge(path, encoding, recent_files().line_index(path) if known is not None else None)
+            self._abandon_tab(left)  # only if the viewer could not open it
+            return
+        self._leave_huge_mode()
+        if size >= ASYNC_OPEN_THRESHOLD or compression is not None:
+            # Compressed files are decompressed as they stream in, whatever their size
+            self._start_loader(path, encoding)
+            return
         try:
-            self.doc.load_from_path(path)
+            self.doc.load_from_path(path, encoding=encoding)
         except UnicodeDecodeError as e:
+            # Samples looked fine but the full decode did not; ask the user
+            from .encoding_prompt import choose_encoding
+
             enc = choose_encoding(self, path, e)
             if not enc:
+                self._abandon_tab(left)
                 return
             try:
                 self.doc.load_from_path(path, encoding=enc)
             except Exception as e2:
                 self.status.showMessage(ERR_OPEN_FAILED.format(path=path), 5000)
+                self._abandon_tab(left)
                 return
         except Exception as e:
             self.status.showMessage(ERR_OPEN_FAILED.format(path=path), 5000)
+            self._abandon_tab(left)
             return
-        self.editor.blockSignals(True)
-        self.editor.setPlainText(self.doc.text)
-        self.editor.blockSignals(False)
+        self._set_editor_text(self.doc.text)
+        self._finish_open(path)
+
+    def _finish_open(self, path: str) -> None:
+        self._attach_journal()
+        self._watch_file()
+        self._sync_search()
         self._update_chrome()
-        add_recent(path)
+        self._record_recent(path)
         self._rebuild_recent_menu()
         self._snackbar.show_message("已打开")
-        if hasattr(self, "sidebar"):
+        if self.doc.mixed_newlines:
+            self.status.showMessage(WARN_MIXED_NEWLINES.format(newline=_NEWLINE_NAMES[self.doc.newline]), 8000)
+        if self.sidebar is not None:
             self.sidebar.refresh_recent()
+        if self._pending_goto is not None and self._pending_goto[0] == path:
+            _, line, column, scroll = self._pending_goto
+            if scroll is None:
+                self.goto_line(line, column)
+            else:
+                self._restore_position(line, column, scroll)
+        self._pending_goto = None
+        self._enforce_memory_budget()
+        self.documentLoaded.emit(path)
 
-    def _ensure_saved(self) -> bool:
-        if not self.doc.path:
-            return self._save_file_as()
+    # ----- Recent files -----
+    def _record_recent(self, path: str, encoding: str | None = None) -> None:
+        """Put ``path`` first in the recent files, with the version just opened or saved."""
+        if encoding is None:
+            encoding = self._huge_view.encoding if self._in_huge_mode() else self.doc.encoding
+        store = recent_files()
+        try:
+            st = os.stat(path)
+            known = store.lookup(path, st)
+            newline = known.newline if known is not None and known.encoding == encoding else detect_newline(path, encoding)
+        except (OSError, LookupError):
+            store.add(path)
+            return
+        store.add(path, encoding=encoding, newline=newline, size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+    def _remember_position(self) -> None:
+        """Save where the caret and view are in the current file, for its next opening."""
+        path = self.doc.path
+        if not path or self._loader is not None or self._pending_chunks or self._follower is not None:
+            return  # lines of a followed tail are not lines of the file
+        if self._in_huge_mode():
+            line, column = self._huge_view.cursor_position()
+            scroll = self._huge_view.first_visible_line()
+        else:
+            cur = self.editor.textCursor()
+            line, column = cur.blockNumber(), cur.positionInBlock()
+            scroll = self.editor.verticalScrollBar().value()  # first visible block
+        recent_files().update(path, line=line + 1, column=column + 1, scroll=scroll)
+
+    def _restore_position(self, line: int, column: int, scroll: int) -> None:
+        if self._in_huge_mode():
+            self._huge_view.scroll_to_line(scroll)
+            self._huge_view.goto_line(line - 1, column - 1)
+            return
+        block = self.editor.document().findBlockByNumber(max(0, line - 1))
+        if block.isValid():
+            cur = QTextCursor(block)
+            cur.setPosition(block.position() + min(max(0, column - 1), block.length() - 1))
+            self.editor.setTextCursor(cur)
+        self.editor.verticalScrollBar().setValue(scroll)
+
+    # ----- Huge file (read-only mmap) mode -----
+    def _huge_threshold(self) -> int:
+        return max(1, settings().get(HUGE_FILE_THRESHOLD)) * 1024 * 1024
+
+    def _in_huge_mode(self) -> bool:
+        return self._huge_view is not None and self._stack.currentWidget() is self._huge_view
+
+    def _open_huge(self, path: str, encoding: str = "utf-8", line_index: bytes | None = None) -> None:
+        if self._huge_view is None:
+            from .huge_viewer import HugeFileView
+
+            self._huge_view = HugeFileView(self)
+            self._huge_view.cursorPositionChanged.connect(self._update_cursor_pos)
+            self._huge_view.indexProgress.connect(self._on_index_progress)
+            self._huge_view.findFinished.connect(self._on_huge_find_finished)
+            self._stack.addWidget(self._huge_view)
+        try:
+            self._huge_view.open(path, encoding, line_index)
+        except OSError:
+            self.status.showMessage(ERR_OPEN_FAILED.format(path=path), 5000)
+            return
+        self.doc = Document(path=path, encoding=encoding)
+        self._set_editor_text("")
+        self._stack.setCurrentWidget(self._huge_view)
+        self._huge_view.setFocus()
+        if not self._huge_view.index.complete:
+            self._load_progress.setValue(0)
+            self._load_progress.show()
+        self._finish_open(path)
+        self.status.showMessage(MSG_READ_ONLY, 5000)
+
+    def _on_index_progress(self, done: int, total: int) -> None:
+        self._load_progress.setValue(int(done * 1000 / total) if total else 1000)
+        if done >= total:
+            self._load_progress.hide()
+            blob = self._huge_view.index.export() if self._huge_view.index is not None else None
+            if blob is not None and self._huge_view.path:
+                # Reopening this version maps the file without indexing it again
+                recent_files().save_line_index(self._huge_view.path, blob)
+
+    def _leave_huge_mode(self) -> None:
+        if self._huge_view is None:
+            return
+        self._huge_view.close_file()
+        self._load_progress.hide()
+        self._stack.setCurrentWidget(self.editor)
+
+    # ----- Follow (tail -f) mode -----
+    def _toggle_follow(self, checked: bool) -> None:
+        if checked:
+            self._start_follow()
+        elif self._follower is not None and self.doc.path:
+            # Back to the whole file, opened the usual way
+            tail = self.doc
+            self._open_path(tail.path)
+            if self.doc is tail:
+                # Not reopened: what is left is only part of the file, never to be saved over it
+                self._stop_follow()
+                tail.path = None
+                self._attach_journal()
+                self._update_chrome()
+
+    def _start_follow(self) -> None:
+        """Show the end of the current file and keep appending what is written to it."""
+        huge = self._in_huge_mode()
+        path = self._huge_view.path if huge else self.doc.path
+        encoding = self._huge_view.encoding if huge else self.doc.encoding
+        if not path or self._loader is not None or not self._maybe_save():
+            self._set_follow_checked(False)
+            return
+        if self.doc.compression is not None:
+            self.status.showMessage(MSG_FOLLOW_COMPRESSED.format(path=path), 5000)
+            self._set_follow_checked(False)
+            return
+        from ..core.tail import read_tail
+        from .tail_follower import TailFollower
+
+        self._tail_max_lines = max(100, settings().get(FOLLOW_MAX_LINES))
+        try:
+            text, offset = read_tail(path, self._tail_max_lines, encoding)
+        except (OSError, LookupError):
+            self.status.showMessage(ERR_OPEN_FAILED.format(path=path), 5000)
+            self._set_follow_checked(False)
+            return
+        self._remember_position()
+        self._stop_loader()
+        self._leave_huge_mode()
+        self._close_journal()  # nothing here is edited
+        self.doc = Document(path=path, text=text, encoding=encoding)
+        self.doc.mark_saved()
+        self._set_editor_text(text)
+        # Appends are not edits: keep them out of the undo stack, and the text read-only
+        self.editor.document().setUndoRedoEnabled(False)
+        self.editor.setReadOnly(True)
+        self.editor.moveCursor(QTextCursor.MoveOperation.End)
+        follower = TailFollower(path, encoding, offset, self)
+        follower.appended.connect(self._on_tail_text)
+        follower.restarted.connect(self._on_tail_restarted)
+        self._follower = follower
+        self._set_follow_checked(True)
+        self._watch_file()  # the follower sees changes instead
+        self._sync_search()
+        self._update_chrome()
+        self.status.showMessage(MSG_FOLLOWING, 5000)
+        follower.start(QThread.Priority.LowPriority)
+
+    def _stop_follow(self) -> None:
+        follower, self._follower = self._follower, None
+        if follower is None:
+            return
+        follower.cancel()
+        follower.wait()
+        follower.deleteLater()
+        self._tail_timer.stop()
+        self._tail_pending.clear()
+        self._tail_pending_lines = 0
+        self._set_follow_checked(False)
+
+    def _set_follow_checked(self, checked: bool) -> None:
+        self.act_follow.blockSignals(True)
+        self.act_follow.setChecked(checked)
+        self.act_follow.blockSignals(False)
+
+    def _on_tail_text(self, text: str) -> None:
+        if self.sender() is not self._follower:
+            return
+        # Queue in editor-sized slices; text that would be trimmed right
+        # after insertion is dropped before it costs anything
+        for i in range(0, len(text), _FEED_SLICE):
+            piece = text[i:i + _FEED_SLICE]
+            self._tail_pending.append(piece)
+            self._tail_pending_lines += piece.count("\n")
+        while len(self._tail_pending) > 1:
+            first = self._tail_pending[0].count("\n")
+            if self._tail_pending_lines - first <= self._tail_max_lines:
+                break
+            self._tail_pending.popleft()
+            self._tail_pending_lines -= first
+        if not self._tail_timer.isActive():
+            self._tail_timer.start()
+
+    def _on_tail_restarted(self) -> None:
+        if self.sender() is self._follower:
+            self.status.showMessage(MSG_FOLLOW_RESTARTED.format(path=self.doc.path), 5000)
+
+    def _feed_tail(self) -> None:
+        """Append queued text within this tick's budget, then trim to the line cap.
+
+        The view follows the end unless it has been scrolled away from it.
+        """
+        bar = self.editor.verticalScrollBar()
+        at_end = bar.value() >= bar.maximum()
+        deadline = time.perf_counter() + _FEED_BUDGET_S
+        buf = self.doc.buffer
+        cur = QTextCursor(self.editor.document())
+        cur.movePosition(QTextCursor.MoveOperation.End)
+        self._suppress_edits = True
+        try:
+            while self._tail_pending and time.perf_counter() < deadline:
+                text = self._tail_pending.popleft()
+                self._tail_pending_lines -= text.count("\n")
+                end = len(buf)
+                self._stats.apply_edit(buf.slice(end - 1, end), "", text, "")
+                buf.append(text)
+                cur.insertText(text)
+                if self._search is not None:
+                    self._search.on_edit(end, 0, len(buf) - end)
+            trimmed = self._trim_tail()
+        finally:
+            self._suppress_edits = False
+        if not self._tail_pending:
+            self._tail_timer.stop()
+        if at_end:
+            bar.setValue(bar.maximum())
+        elif trimmed:
+            bar.setValue(bar.value() - trimmed)  # keep showing the same lines
+        self._chrome.invalidate("stats")
+
+    def _trim_tail(self) -> int:
+        """Drop the oldest lines beyond the cap (in batches); returns how many."""
+        qdoc = self.editor.document()
+        excess = qdoc.blockCount() - self._tail_max_lines
+        if excess < max(1, self._tail_max_lines // 20):
+            return 0
+        units = qdoc.findBlockByNumber(excess).position()
+        cur = QTextCursor(qdoc)
+        cur.setPosition(units, QTextCursor.MoveMode.KeepAnchor)
+        cur.removeSelectedText()
+        buf = self.doc.buffer
+        old = buf.replace(0, units, "")
+        self._stats.apply_edit("", old, "", buf.slice(0, 1))
+        if self._search is not None:
+            self._search.on_edit(0, units, 0)
+        return excess
+
+    # ----- Go to line / find -----
+    def _goto_line(self) -> None:
+        if self._in_huge_mode():
+            line, _ = self._huge_view.cursor_position()
+            total = self._huge_view.line_count()
+        else:
+            line = self.editor.textCursor().blockNumber()
+            total = self.editor.document().blockCount()
+        target, ok = QInputDialog.getInt(self, "跳转到行", f"行号 (1–{total})：", line + 1, 1, max(1, total))
+        if ok:
+            self.goto_line(target)
+
+    def goto_line(self, line: int, column: int = 1) -> None:
+        """Move the caret to 1-based ``line``/``column`` in whichever view is active."""
+        if self._in_huge_mode():
+            self._huge_view.goto_line(line - 1, max(0, column - 1))
+            return
+        block = self.editor.document().findBlockByNumber(max(0, line - 1))
+        if block.isValid():
+            cur = QTextCursor(block)
+            cur.setPosition(block.position() + min(max(0, column - 1), block.length() - 1))
+            self.editor.setTextCursor(cur)
+            self.editor.centerCursor()
+
+    def _find(self, replace: bool = False) -> None:
+        huge = self._in_huge_mode()
+        if self._find_bar is None:
+            from .find_bar import FindBar
+            from .search_session import SearchSession
+
+            self._find_bar = FindBar(self)
+            self._search = SearchSession(self.editor, self._find_bar, lambda: self.doc, self._chrome, self)
+            self._find_bar.findNext.connect(lambda: self._find_again(forward=True))
+            self._find_bar.findPrevious.connect(lambda: self._find_again(forward=False))
+            self._find_bar.replaceAll.connect(self._replace_all)
+            self._find_bar.closed.connect(self._on_find_closed)
+            self._central_layout.addWidget(self._find_bar)
+            self._sync_search()
+        selected = "" if huge else self.editor.textCursor().selectedText()
+        if "\u2029" in selected:
+            selected = ""  # a multi-line selection is not a useful query
+        self._find_bar.open(selected, replace=replace and not huge)
+
+    def _workspace_root(self) -> str:
+        """The folder the sidebar explores."""
+        if self.sidebar is not None:
+            return self.sidebar.root
+        return workspace_root()
+
+    def _show_quick_open(self) -> None:
+        from ..core.workspace_search import DEFAULT_IGNORE, DEFAULT_NAME_FILTERS
+
+        if self._quick_open is None:
+            from .quick_open import QuickOpen
+
+            self._quick_open = QuickOpen(self)
+            self._quick_open.fileChosen.connect(self.open_location)
+        filters, ignore = DEFAULT_NAME_FILTERS, DEFAULT_IGNORE
+        index_db = None
+        if self.sidebar is not None:
+            filters, ignore = self.sidebar.find_in_files.filters()
+            index_db = self.sidebar.indexer.db_path
+        self._quick_open.popup(self._workspace_root(), filters, ignore, index_db)
+
+    def _find_again(self, forward: bool) -> None:
+        query = self._find_bar.query() if self._find_bar is not None else None
+        if query is None:
+            self._find()
+            return
+        if self._in_huge_mode():
+            self._huge_view.find(query, forward=forward)  # answers via findFinished
+        elif not self._search.next(forward) and self._search.complete:
+            self.status.showMessage(MSG_NOT_FOUND.format(text=query.pattern), 3000)
+
+    def _on_huge_find_finished(self, found: bool) -> None:
+        query = self._find_bar.query() if self._find_bar is not None else None
+        if not found and query is not None:
+            self.status.showMessage(MSG_NOT_FOUND.format(text=query.pattern), 3000)
+
+    def _replace_all(self, replacement: str) -> None:
+        count = self._search.replace_all(replacement)
+        self.status.showMessage(MSG_REPLACED.format(count=count), 3000)
+
+    def _on_find_closed(self) -> None:
+        (self._huge_view if self._in_huge_mode() else self.editor).setFocus()
+
+    def _sync_search(self) -> None:
+        """Point the search at the current document (none in the huge viewer)."""
+        if self._search is None:
+            return
+        huge = self._in_huge_mode()
+        self._find_bar.set_replace_enabled(not huge and self._follower is None)
+        self._search.set_active(not huge)
+
+    # ----- Chunked background open -----
+    def _start_loader(self, path: str, encoding: str = "utf-8") -> None:
+        self.doc = Document(path=path, encoding=encoding)
         try:
-            self.doc.save_to_path()
-            self._update_chrome()
-            self._snackbar.show_message("已保存")
+            self.doc.read_format()
+        except OSError:
+            pass  # the loader reports it
+        self._set_editor_text("")
+        # Streamed inserts are not user edits: keep them out of the undo stack
+        self.editor.document().setUndoRedoEnabled(False)
+        self.editor.setReadOnly(True)
+        from .file_loader import FileLoader
+
+        loader = FileLoader(path, encoding, self)
+        loader.chunkLoaded.connect(self._on_chunk_loaded)
+        loader.progress.connect(self._on_load_progress)
+        loader.failed.connect(self._on_load_failed)
+        loader.finished.connect(self._on_loader_finished)
+        self._loader = loader
+        self._load_progress.setValue(0)
+        self._load_progress.show()
+        self._load_cancel.show()
+        self._update_chrome()
+        self.status.showMessage(MSG_LOADING.format(path=path))
+        loader.start()
+
+    def _on_chunk_loaded(self, text: str) -> None:
+        if self.sender() is not self._loader:
+            return
+        buf = self.doc.buffer
+        self._stats.apply_edit(buf.slice(len(buf) - 1, len(buf)), "", text, "")
+        self._chrome.invalidate("stats")
+        buf.append(text)
+        self._pending_chunks.append(text)
+        if not self._feed_timer.isActive():
+            self._feed_timer.start()
+
+    def _feed_editor(self) -> None:
+        # Insert queued text in slices until this tick's frame budget is spent
+        deadline = time.perf_counter() + _FEED_BUDGET_S
+        cur = QTextCursor(self.editor.document())
+        cur.movePosition(QTextCursor.MoveOperation.End)
+        self._suppress_edits = True
+        try:
+            while self._pending_chunks and time.perf_counter() < deadline:
+                chunk = self._pending_chunks[0]
+                end = self._pending_offset + _FEED_SLICE
+                cur.insertText(chunk[self._pending_offset:end])
+                if end >= len(chunk):
+                    self._pending_chunks.popleft()
+                    self._pending_offset = 0
+                else:
+                    self._pending_offset = end
+        finally:
+            self._suppress_edits = False
+        if not self._pending_chunks:
+            self._feed_timer.stop()
+            if self._loader is not None and self._loader.isFinished() and self._loader.succeeded:
+                self._complete_load()
+
+    def _on_load_progress(self, done: int, total: int) -> None:
+        if self.sender() is self._loader:
+            self._load_progress.setValue(int(done * 1000 / total) if total else 1000)
+
+    def _on_loader_finished(self) -> None:
+        loader = self.sender()
+        if loader is self._loader and loader.succeeded and not self._pending_chunks:
+            self._complete_load()
+
+    def _on_load_failed(self, error: Exception) -> None:
+        loader = self._loader
+        if self.sender() is not loader or loader is None:
+            return
+        path = loader.path
+        self._stop_loader()
+        self.doc = Document()
+        self._set_editor_text("")
+        self._attach_journal()
+        self._watch_file()
+        self._update_chrome()
+        if isinstance(error, UnicodeDecodeError):
+            from .encoding_prompt import choose_encoding
+
+            enc = choose_encoding(self, path, error)
+            if enc:
+                self._start_loader(path, enc)
+            return
+        self.status.showMessage(ERR_OPEN_FAILED.format(path=path), 5000)
+
+    def _complete_load(self) -> None:
+        path = self._loader.path if self._loader is not None else self.doc.path
+        self._stop_loader()
+        if path:
+            self._finish_open(path)
+
+    def _cancel_open(self) -> None:
+        if self._loader is None:
+            return
+        path = self._loader.path
+        self._stop_loader()
+        self.doc = Document()
+        self._set_editor_text("")
+        self._attach_journal()
+        self._watch_file()
+        self._update_chrome()
+        self.status.showMessage(MSG_OPEN_CANCELLED.format(path=path), 5000)
+
+    def _stop_loader(self) -> None:
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            loader.cancel()
+            loader.wait()
+            loader.deleteLater()
+            self.status.clearMessage()  # MSG_LOADING
+        self._stop_follow()
+        self._feed_timer.stop()
+        self._pending_chunks.clear()
+        self._pending_offset = 0
+        self._load_progress.hide()
+        self._load_cancel.hide()
+        self.editor.setReadOnly(False)
+        self.editor.document().setUndoRedoEnabled(True)
+
+    def _ensure_saved(self, wait: bool = False) -> bool:
+        """Save to the current path (Save As if none).
+
+        Saving runs on a worker; ``saveFinished`` reports the outcome. With
+        ``wait`` the call blocks (keeping the UI painted) and returns whether
+        the file was written, which the close/new-file guards rely on.
+        """
+        if self._in_huge_mode() or self._follower is not None:
+            # Nothing can change in the read-only viewer or a followed log
             return True
-        except Exception as e:
-            self.status.showMessage(ERR_SAVE_FAILED.format(path=self.doc.path or ""), 5000)
-            return False
+        if not self.doc.path:
+            return self._save_file_as(wait=wait)
+        self._start_save(self.doc.path)
+        return self._wait_for_save() if wait else True
 
     def _save_file(self) -> None:
         if not self._ensure_saved():
             return
 
-    def _save_file_as(self) -> bool:
+    def _save_file_as(self, wait: bool = False) -> bool:
+        if self._in_huge_mode():
+            self.status.showMessage(MSG_READ_ONLY, 5000)
+            return False
+        if self._follower is not None:
+            self.status.showMessage(MSG_FOLLOWING, 5000)
+            return False
         path, _ = QFileDialog.getSaveFileName(self, "Save As", self.doc.path or "untitled.txt", "Text Files (*.txt);;All Files (*)")
         if not path:
             return False
@@ -252,29 +1503,297 @@ class MainWindow(QMainWindow):
             res = QMessageBox.question(self, "Confirm Overwrite", WARN_OVERWRITE)
             if res != QMessageBox.StandardButton.Yes:
                 return False
+        self._start_save(path)
+        return self._wait_for_save() if wait else True
+
+    # ----- Background save -----
+    def _durability(self) -> str:
+        level = settings().get(DURABILITY)
+        return level if level in DURABILITY_LEVELS else "file"
+
+    def _start_save(self, path: str) -> None:
+        # One save at a time: a newer snapshot supersedes nothing in flight
+        self._wait_for_save()
+        from .file_saver import FileSaver
+
+        # Saving in place keeps the format; a new name picks it by its suffix
+        same = bool(self.doc.path) and os.path.abspath(path) == os.path.abspath(self.doc.path)
+        compression = self.doc.compression if same else compression_for_name(path)
+        saver = FileSaver(
+            self.doc.snapshot(),
+            path,
+            self.doc.encoding,
+            self._durability(),
+            compression,
+            settings().get(COMPRESSION_LEVEL),
+            self.doc.newline,
+            self.doc.bom,
+            self,
+        )
+        saver.saved.connect(self._on_saved)
+        saver.failed.connect(self._on_save_failed)
+        saver.finished.connect(saver.deleteLater)
+        if self._file_watcher is not None:
+            self._file_watcher.suspend()  # our own write is not an external change
+        self._saver = saver
+        self._saving_doc = self.doc
+        self.status.showMessage(MSG_SAVING.format(path=path))
+        saver.start()
+
+    def _wait_for_save(self) -> bool:
+        """Block until the running save (if any) ends; True if it succeeded."""
+        if self._saver is None:
+            return self._last_save_ok
+        loop = QEventLoop(self)
+        self.saveFinished.connect(loop.quit)
         try:
-            self.doc.save_to_path(path)
-            self._update_chrome()
-            add_recent(path)
-            self._rebuild_recent_menu()
-            self._snackbar.show_message("已保存")
-            if hasattr(self, "sidebar"):
-                self.sidebar.refresh_recent()
-            return True
-        except Exception as e:
-            self.status.showMessage(ERR_SAVE_FAILED.format(path=path), 5000)
-            return False
+            if self._saver is not None:
+                loop.exec()
+        finally:
+            self.saveFinished.disconnect(loop.quit)
+        return self._last_save_ok
+
+    def _on_saved(self, path: str, revision: int) -> None:
+        self.status.clearMessage()  # MSG_SAVING
+        doc, saver = self._saving_doc, self._saver
+        self._saver = self._saving_doc = None
+        self._last_save_ok = True
+        if self._file_watcher is not None:
+            self._file_watcher.resume(rebase=doc is self.doc)
+        # The tab may have been switched away from meanwhile
+        tab = next((t for t in self._all_tabs() if t.doc is doc), None) if doc is not None else None
+        if tab is not None:
+            first_path = doc.path != path
+            doc.path = path
+            if saver is not None:
+                doc.compression = saver.compression
+            doc.mark_saved(revision)
+            if tab.journal is not None and saver is not None:
+                # The saved snapshot is the journal's new base
+                live = doc.snapshot().pieces if doc.is_dirty else None
+                tab.journal.rebase(path, doc.encoding, saver.snapshot.pieces, live)
+            self._record_recent(path, doc.encoding)  # the new fingerprint, so reopening stays fast
+            if tab is self._tab:
+                self._update_chrome()
+                if first_path:
+                    self._watch_file()
+            else:
+                self._tabs.setTabText(self._tab_index(tab), tab.title())
+            if first_path:
+                self._rebuild_recent_menu()
+                if self.sidebar is not None:
+                    self.sidebar.refresh_recent()
+        self._snackbar.show_message("已保存")
+        self.saveFinished.emit(path, True)
+
+    def _on_save_failed(self, path: str, error: Exception) -> None:
+        self._saver = self._saving_doc = None
+        self._last_save_ok = False
+        if self._file_watcher is not None:
+            self._file_watcher.resume()
+        self.status.showMessage(ERR_SAVE_FAILED.format(path=path), 5000)
+        self.saveFinished.emit(path, False)
+
+    # ----- External changes -----
+    def _watch_file(self) -> None:
+        """Watch the current document's file for changes by other programs."""
+        if not self.doc.path or self._follower is not None:
+            if self._file_watcher is not None:
+                self._file_watcher.unwatch()
+            return
+        if self._file_watcher is None:
+            from .file_watcher import FileWatcher
+
+            self._file_watcher = FileWatcher(self)
+            self._file_watcher.changed.connect(self._on_external_change)
+            self._file_watcher.failed.connect(self._on_external_failure)
+        if self._in_huge_mode():
+            # The viewer maps the file: changes are reported, not diffed
+            self._file_watcher.watch(self.doc.path, self._huge_view.encoding, None)
+        else:
+            self._file_watcher.watch(self.doc.path, self.doc.encoding, self.doc.snapshot)
+
+    def _on_external_change(self, change: ExternalChange) -> None:
+        if change.path != os.path.abspath(self.doc.path or "") or self._loader is not None:
+            return
+        watcher = self._file_watcher
+        if change.hunks is None:
+            if self._in_huge_mode():
+                self._reload_huge()
+            watcher.set_baseline(change.fingerprint)
+            return
+        if change.revision != self.doc.revision:
+            watcher.check()  # edited meanwhile: diff against the current text
+            return
+        if self.doc.is_dirty:
+            from PyQt6.QtWidgets import QMessageBox
+
+            msg = MSG_RELOAD_CONFLICT.format(name=os.path.basename(change.path))
+            if QMessageBox.question(self, "文件已更改", msg) != QMessageBox.StandardButton.Yes:
+                watcher.set_baseline(change.fingerprint)  # keep ours; ask again on the next change
+                return
+        self._apply_hunks(change.hunks)
+        try:
+            self.doc.read_format()  # another program may have converted it
+        except OSError:
+            pass
+        self.doc.mark_saved()
+        if self._journal is not None:
+            self._journal.rebase(self.doc.path, self.doc.encoding, self.doc.snapshot().pieces, None)
+        watcher.set_baseline(change.fingerprint)
+        self._record_recent(self.doc.path)
+        self._update_chrome()
+        self.status.showMessage(MSG_RELOADED.format(path=self.doc.path), 5000)
+
+    def _apply_hunks(self, hunks: list[Hunk]) -> None:
+        """Edit just the changed regions, as one undoable step.
+
+        Cursors (the caret included) move with the text around them, and the
+        view keeps showing the same lines.
+        """
+        bar = self.editor.verticalScrollBar()
+        first = bar.value()  # first visible block
+        shift = sum(h.line_delta for h in hunks if h.old_line + h.old_lines <= first)
+        cur = QTextCursor(self.editor.document())
+        cur.beginEditBlock()
+        for h in reversed(hunks):
+            cur.setPosition(h.position)
+            cur.setPosition(h.position + h.removed, QTextCursor.MoveMode.KeepAnchor)
+            cur.insertText(h.text)
+        cur.endEditBlock()
+        bar.setValue(first + shift)
+
+    def _reload_huge(self) -> None:
+        view = self._huge_view
+        line, column = view.cursor_position()
+        scroll = view.first_visible_line()
+        try:
+            view.open(view.path, view.encoding)
+        except OSError:
+            self.status.showMessage(ERR_OPEN_FAILED.format(path=view.path), 5000)
+            return
+        view.goto_line(line, column)
+        view.scroll_to_line(scroll)
+        if not view.index.complete:
+            self._load_progress.setValue(0)
+            self._load_progress.show()
+        self.status.showMessage(MSG_RELOADED.format(path=view.path), 5000)
+
+    def _on_external_failure(self, path: str, error: Exception) -> None:
+        if isinstance(error, FileNotFoundError):
+            self.status.showMessage(MSG_FILE_GONE.format(path=path), 5000)
+        else:
+            self.status.showMessage(ERR_OPEN_FAILED.format(path=path), 5000)
+
+    # ----- Edit journal / crash recovery -----
+    def _attach_journal(self) -> None:
+        """Start a fresh journal whose base is the current (clean) buffer."""
+        self._close_journal()
+        from ..core.journal import EditJournal
+
+        self._journal = EditJournal(self._journal_dir, self.doc.path, self.doc.encoding, self.doc.buffer.snapshot())
+
+    def _close_journal(self) -> None:
+        # Called when the current buffer is saved or deliberately abandoned
+        self._journal_timer.stop()
+        if self._journal is not None:
+            self._journal.discard()
+            self._journal.close()
+            self._journal = None
+
+    def _flush_journal(self) -> None:
+        if self._journal is None:
+            return
+        if self._journal.needs_compaction:
+            self._journal.checkpoint(self.doc.snapshot().pieces)
+        else:
+            self._journal.flush()
+
+    def _offer_recovery(self) -> None:
+        from ..core.journal import delete_journal, journal_in_use, list_journals, recover
+        from ..utils.session import load_session
+
+        own = {t.journal.file for t in self._all_tabs() if t.journal is not None}
+        own.update(t.spill for t in self._all_tabs() if t.spill is not None)
+        own.update(load_session().journals())  # also when this window has no session
+        # Journals locked by a running instance (or this one) are not leftovers
+        leftovers = [j for j in list_journals(self._journal_dir) if j not in own and not journal_in_use(j)]
+        if not leftovers:
+            return
+        from PyQt6.QtWidgets import QMessageBox
+
+        for journal in leftovers:
+            try:
+                rec = recover(journal)
+            except (OSError, ValueError, UnicodeDecodeError):
+                delete_journal(journal)
+                continue
+            name = Path(rec.path).name if rec.path else "untitled"
+            msg = MSG_RECOVER.format(name=name)
+            if rec.base_changed:
+                msg += "\n\n" + WARN_RECOVER_BASE_CHANGED
+            res = QMessageBox.question(self, "恢复未保存的更改", msg)
+            if res != QMessageBox.StandardButton.Yes:
+                delete_journal(journal)
+                continue
+            self._restore_recovered(rec)
+
+    def _restore_recovered(self, rec: RecoveredDocument) -> None:
+        from ..core.journal import EditJournal
+        from ..core.piece_table import PieceTable
+
+        self._prepare_tab(rec.path)
+        self._close_journal()
+        doc = Document(path=rec.path, encoding=rec.encoding)
+        if rec.path:
+            try:
+                doc.read_format()
+            except OSError:
+                doc.compression = compression_for_name(rec.path)
+        doc.buffer = PieceTable.from_pieces(rec.pieces)
+        doc.mark_dirty()
+        self.doc = doc
+        self._set_editor_text(doc.text)
+        self._journal = EditJournal.adopt(self._journal_dir, rec, rec.base, rec.pieces)
+        self._watch_file()
+        self._update_chrome()
 
     # ----- Preferences -----
     def _restore_prefs(self) -> None:
-        s = QSettings()
-        wrap = s.value("editor/wordWrap", True, type=bool)
-        self.act_toggle_wrap.setChecked(bool(wrap))
-        self._apply_wrap(bool(wrap))
+        wrap = settings().get(WORD_WRAP)
+        self.act_toggle_wrap.setChecked(wrap)
+        self._apply_wrap(wrap)
+        self.act_reduce_effects.blockSignals(True)
+        self.act_reduce_effects.setChecked(reduced_effects())
+        self.act_reduce_effects.blockSignals(False)
 
     def _toggle_wrap(self, checked: bool) -> None:
         self._apply_wrap(checked)
-        QSettings().setValue("editor/wordWrap", bool(checked))
+        settings().set(WORD_WRAP, bool(checked))
+
+    def _set_reduced_effects(self, enabled: bool) -> None:
+        settings().set(REDUCED_EFFECTS, "on" if enabled else "off")
+        self._apply_effects_mode()
+
+    def _apply_effects_mode(self) -> None:
+        """Add or drop the sidebar's opacity effect to match ``reduced_effects()``."""
+        if self.sidebar is None:
+            return
+        if reduced_effects():
+            if self._sidebar_anim is not None:
+                self._sidebar_anim.stop()  # deletes it
+                self._sidebar_anim = None
+            if self._sidebar_effect is not None:
+                self.sidebar.setGraphicsEffect(None)  # deletes the effect
+                self._sidebar_effect = None
+            if self._sidebar_visible:
+                self.sidebar.resize(self._sidebar_target_width, self.height())
+            else:
+                self.sidebar.hide()
+        elif self._sidebar_effect is None:
+            self._sidebar_effect = QGraphicsOpacityEffect(self.sidebar)
+            self._sidebar_effect.setOpacity(1.0 if self._sidebar_visible else 0.0)
+            self.sidebar.setGraphicsEffect(self._sidebar_effect)
 
     def _apply_wrap(self, enabled: bool) -> None:
         mode = QPlainTextEdit.LineWrapMode.WidgetWidth if enabled else QPlainTextEdit.LineWrapMode.NoWrap
@@ -285,6 +1804,8 @@ class MainWindow(QMainWindow):
         self._theme_manager.apply(name)
 
     def _show_about(self) -> None:
+        from .about import AboutDialog
+
         AboutDialog(self).exec()
 
     def _rebuild_recent_menu(self) -> None:
@@ -292,38 +1813,88 @@ class MainWindow(QMainWindow):
         return
 
     def _open_recent(self, path: str) -> None:
-        self._open_path(path)
+        self.open_location(path)
 
     def _update_cursor_pos(self) -> None:
+        self._chrome.invalidate("cursor")
+        self._schedule_session()
+
+    def _render_cursor_pos(self) -> None:
+        if self._in_huge_mode():
+            line, col = self._huge_view.cursor_position()
+            self._pos_label.setText(f"Ln {line + 1}, Col {col + 1}")
+            return
         cur = self.editor.textCursor()
         # PyQt6 positions are 0-based; show as 1-based
         line = cur.blockNumber() + 1
         col = cur.columnNumber() + 1
-        self._pos_label.setText(f"Ln {line}, Col {col}")
+        text = f"Ln {line}, Col {col}"
+        if text != self._pos_label.text():
+            self._pos_label.setText(text)
 
     # ----- Sidebar visibility + animation -----
+    def _build_sidebar(self) -> None:
+        if self.sidebar is not None:
+            return
+        from .sidebar_panel import SidebarPanel
+
+        # Sidebar panel (non-dock overlay)
+        self.sidebar = SidebarPanel(self)
+        self.sidebar.set_root(workspace_root())
+        self.sidebar.fileOpenRequested.connect(self.open_location)
+        self.saveFinished.connect(self.sidebar.file_saved)
+        # Graphics effects render the whole panel offscreen; with reduced
+        # effects it gets none (this also drops the panel's drop shadow)
+        if reduced_effects():
+            self.sidebar.setGraphicsEffect(None)
+        else:
+            self._sidebar_effect = QGraphicsOpacityEffect(self.sidebar)
+            self.sidebar.setGraphicsEffect(self._sidebar_effect)
+        self._install_sidebar_overlay()
+        self._init_sidebar_state()
+
     def _init_sidebar_state(self) -> None:
-        s = QSettings()
-        default_width = int(s.value("ui/sidebarWidth", 260))
-        visible = bool(s.value("ui/sidebarVisible", True, type=bool))
+        default_width = settings().get(SIDEBAR_WIDTH)
+        # The action was restored from settings in __init__ (or toggled since)
+        visible = self.act_toggle_sidebar.isChecked()
         self._sidebar_target_width = max(180, int(default_width))
-        self.act_toggle_sidebar.setChecked(visible)
         self._sidebar_visible = visible
         if not visible:
             self.sidebar.hide()
-            self._sidebar_effect.setOpacity(0.0)
+            if self._sidebar_effect is not None:
+                self._sidebar_effect.setOpacity(0.0)
         else:
             self.sidebar.show()
             self.sidebar.resize(self._sidebar_target_width, self.height())
 
     def _toggle_sidebar(self, checked: bool) -> None:
+        self._sidebar_hover_revealed = False
+        if self.sidebar is None:
+            # Toggled before the deferred startup stage: build it now
+            self._build_sidebar()
+            return
         self._animate_sidebar(show=checked)
         self._sidebar_visible = checked
 
     def _animate_sidebar(self, show: bool) -> None:
+        running = self._sidebar_anim is not None and self._sidebar_anim.state() == QAbstractAnimation.State.Running
+        if running:
+            if self._sidebar_anim.property("show") == show:
+                return  # already heading there
+            self._sidebar_anim.stop()  # deletes it; reverse from wherever it got to
+            self._sidebar_anim = None
         current_w = self.sidebar.width() if self.sidebar.isVisible() else 0
         target_w = self._sidebar_target_width if show else 0
 
+        if self._sidebar_effect is None:
+            # Reduced effects: no animation, just the end state
+            if show:
+                self.sidebar.resize(target_w, self.height())
+                self.sidebar.show()
+                self.sidebar.raise_()
+            self._sidebar_finished(show, current_w)
+            return
+
         # Prepare conditions
         if show and not self.sidebar.isVisible():
             self.sidebar.show()
@@ -349,18 +1920,21 @@ class MainWindow(QMainWindow):
         group = QParallelAnimationGroup(self)
         group.addAnimation(fade)
         group.addAnimation(width_anim)
-
-        def _on_finished() -> None:
-            if not show:
-                self.sidebar.hide()
-                QSettings().setValue("ui/sidebarWidth", max(180, current_w))
-            else:
-                QSettings().setValue("ui/sidebarWidth", max(180, self.sidebar.width()))
-            QSettings().setValue("ui/sidebarVisible", show)
-
-        group.finished.connect(_on_finished)
+        group.setProperty("show", show)
+        group.finished.connect(lambda: self._sidebar_finished(show, current_w))
         self._sidebar_anim = group
-        group.start()
+        group.start(QAbstractAnimation.DeletionPolicy.DeleteWhenStopped)
+
+    def _sidebar_finished(self, show: bool, previous_width: int) -> None:
+        self._sidebar_anim = None
+        # Cached and written behind, so toggling does no disk I/O here
+        s = settings()
+        if not show:
+            self.sidebar.hide()
+            s.set(SIDEBAR_WIDTH, max(180, previous_width))
+        else:
+            s.set(SIDEBAR_WIDTH, max(180, self.sidebar.width()))
+        s.set(SIDEBAR_VISIBLE, show)
 
     # ----- Overlay install & edge gesture -----
     def _install_sidebar_overlay(self) -> None:
@@ -374,16 +1948,31 @@ class MainWindow(QMainWindow):
 
     def resizeEvent(self, event) -> None:  # noqa: N802
         super().resizeEvent(event)
-        if self.sidebar.isVisible():
+        if self.sidebar is not None and self.sidebar.isVisible():
             self.sidebar.resize(self._sidebar_target_width, self.height())
 
     def eventFilter(self, obj, ev):  # simplified hover edge reveal
-        from PyQt6.QtCore import QEvent
-        if ev.type() == QEvent.Type.MouseMove:
-            pos = self.mapFromGlobal(ev.globalPosition().toPoint()) if hasattr(ev, 'globalPosition') else self.mapFromGlobal(ev.globalPos())
-            if pos.x() < 6 and not self._sidebar_visible:
-                self.act_toggle_sidebar.setChecked(True)
-            elif pos.x() > self._sidebar_target_width + 40 and self._sidebar_visible:
-                # auto hide when cursor far from edge
-                self.act_toggle_sidebar.setChecked(False)
+        if ev.type() == QEvent.Type.Paint and obj is self.editor.viewport():
+            if not self._startup_done:
+                self.firstPainted.emit()
+                # Let this paint reach the screen before doing more work
+                QTimer.singleShot(0, self._finish_startup)
+                obj.removeEventFilter(self)
+            return False
+        if ev.type() == QEvent.Type.MouseMove and obj is self and self.sidebar is not None:
+            self._edge_hover(ev.position().x())  # already in window coordinates
         return super().eventFilter(obj, ev)
+
+    def _edge_hover(self, x: float) -> None:
+        """Reveal the sidebar at the left edge; hide it once the pointer is well clear.
+
+        The gap between the two thresholds keeps a pointer hovering near
+        either one from toggling back and forth, and a sidebar opened by
+        other means is never closed by hovering.
+        """
+        if not self._sidebar_visible:
+            if x < _EDGE_REVEAL_PX:
+                self.act_toggle_sidebar.setChecked(True)
+                self._sidebar_hover_revealed = True
+        elif self._sidebar_hover_revealed and x > self._sidebar_target_width + _EDGE_HIDE_MARGIN_PX:
+            self.act_toggle_sidebar.setChecked(False)
@@ -1,4 +1,28 @@
 MSG_SAVED = "已保存到：{path}"
+MSG_SAVING = "正在保存：{path}"
+MSG_LOADING = "正在加载：{path}"
+MSG_OPEN_CANCELLED = "已取消打开：{path}"
+MSG_READ_ONLY = "大文件只读模式：内容不可编辑或保存。"
+MSG_FOLLOWING = "跟随模式：内容只读，文件新写入的内容会自动追加。"
+MSG_FOLLOW_RESTARTED = "文件被截断或轮转，从头继续跟随：{path}"
+MSG_FOLLOW_COMPRESSED = "压缩文件无法跟随：{path}"
+MSG_NOT_FOUND = "未找到：{text}"
+MSG_RELOADED = "已重新载入（文件在外部被修改）：{path}"
+MSG_RELOAD_CONFLICT = "{name} 已在外部被修改。是否重新载入？（未保存的更改可以撤销找回）"
+MSG_FILE_GONE = "文件已在外部被删除：{path}"
+MSG_RECOVER = "发现 {name} 未保存的更改（程序上次异常退出）。是否恢复？"
 ERR_OPEN_FAILED = "无法打开文件：{path}。可能的编码/权限问题。"
 ERR_SAVE_FAILED = "无法保存到：{path}。请检查权限/磁盘空间。"
-WARN_OVERWRITE = "文件已存在，是否覆盖？"
\ No newline at end of file
+WARN_OVERWRITE = "文件已存在，是否覆盖？"
+WARN_MIXED_NEWLINES = "文件混用了多种换行符，保存时将统一为 {newline}。"
+WARN_RECOVER_BASE_CHANGED = "注意：原文件在此之后已被修改，恢复的内容可能不完整。"
+MSG_FIND_COUNT = "{current}/{total}"
+MSG_FIND_NONE = "无结果"
+MSG_FIND_SEARCHING = "搜索中… {total}"
+MSG_REPLACED = "已替换 {count} 处"
+ERR_BAD_REGEX = "正则表达式无效：{error}"
+MSG_FIND_IN_FILES_PROGRESS = "{hits} 处匹配 · 已搜索 {searched}/{files} 个文件"
+MSG_FIND_IN_FILES_DONE = "{hits} 处匹配，{matched} 个文件（共搜索 {files} 个）"
+MSG_FIND_IN_FILES_STOPPED = "已停止（{hits} 处匹配）"
+MSG_FIND_IN_FILES_TOO_MANY = "结果过多，仅显示前 {hits} 处"
+ERR_FIND_IN_FILES = "文件搜索失败：{error}"
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import os
+import time
+
+from PyQt6.QtCore import QEvent, Qt, QThread, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QFrame, QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout
+
+from ..core.fuzzy import FuzzyIndex
+from ..core.workspace_index import indexed_paths
+from ..core.workspace_search import iter_files
+from ..utils.recent_files import list_recent
+
+# Paths handed to the GUI per batch while a scan runs
+_BATCH = 2000
+# The path list is rescanned in the background when older than this on open
+_RESCAN_AFTER_S = 30.0
+# Rows listed, and the score added to recent files (most recent first)
+_RESULTS = 50
+_RECENT_BOOST = 40
+_PATH_ROLE = Qt.ItemDataRole.UserRole
+
+
+def _key(root: str, path: str) -> str:
+    """What is shown and matched: the path relative to ``root`` when inside it."""
+    if path.startswith(root + os.sep):
+        path = path[len(root) + 1:]
+    return path.replace(os.sep, "/")
+
+
+class PathScanner(QThread):
+    """Walk the workspace root, streaming paths and then a complete index.
+
+    ``pathsFound`` lets the palette list files while the walk is still
+    running, starting with the files in the workspace index at ``index_db``
+    if given; ``indexReady`` carries a fresh ``FuzzyIndex`` (built on this
+    thread) of the walked files that replaces the old one, so deleted files
+    drop out.
+    """
+
+    pathsFound = pyqtSignal(object)  # list[str]
+    indexReady = pyqtSignal(object)  # FuzzyIndex
+
+    def __init__(
+        self,
+        root: str,
+        name_filters: tuple[str, ...],
+        ignore: tuple[str, ...],
+        index_db: str | None = None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.root = root
+        self.name_filters = name_filters
+        self.ignore = ignore
+        self.index_db = index_db
+
+    def cancel(self) -> None:
+        self.requestInterruption()
+
+    def run(self) -> None:
+        cancelled = self.isInterruptionRequested
+        if self.index_db is not None:
+            known = [p for p in indexed_paths(self.index_db) if p.startswith(self.root + os.sep)]
+            if known:
+                self.pathsFound.emit(known)
+        index = FuzzyIndex()
+        batch: list[str] = []
+        for path in iter_files(self.root, self.name_filters, self.ignore, cancelled):
+            batch.append(path)
+            if len(batch) >= _BATCH:
+                index.extend((_key(self.root, p), p) for p in batch)
+                self.pathsFound.emit(batch)
+                batch = []
+        if cancelled():
+            return
+        index.extend((_key(self.root, p), p) for p in batch)
+        self.pathsFound.emit(batch)
+        self.indexReady.emit(index)
+
+
+class QuickOpen(QFrame):
+    """Ctrl+P palette: type part of a path, Enter opens the best match.
+
+    Paths under the workspace root are kept in memory between uses and
+    refreshed in the background; recent files are always included and rank
+    higher. With an empty query the recent files are listed.
+    """
+
+    fileChosen = pyqtSignal(str)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent, Qt.WindowType.Popup)
+        self.setObjectName("QuickOpen")
+        self.root: str | None = None
+        self.index = FuzzyIndex()
+        self._filters: tuple[tuple[str, ...], tuple[str, ...]] | None = None
+        self._scanned_at = 0.0
+        self._scanner: PathScanner | None = None
+        self._recent: list[str] = []
+
+        self.edit = QLineEdit(self)
+        self.edit.setPlaceholderText("按名称查找文件")
+        self.edit.installEventFilter(self)
+        self.results = QListWidget(self)
+        self.results.setUniformItemSizes(True)
+        self.results.itemActivated.connect(self._choose)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        layout.setSpacing(4)
+        layout.addWidget(self.edit)
+        layout.addWidget(self.results)
+
+        # Keystrokes arriving together are filtered once
+        self._refilter = QTimer(self)
+        self._refilter.setSingleShot(True)
+        self._refilter.timeout.connect(self._update_results)
+        self.edit.textChanged.connect(lambda _: self._refilter.start(0))
+
+    # ----- public API -----
+    def popup(
+        self,
+        root: str,
+        name_filters: tuple[str, ...],
+        ignore: tuple[str, ...],
+        index_db: str | None = None,
+    ) -> None:
+        """Show the palette over the parent window for files under ``root``.
+
+        The workspace index at ``index_db`` seeds an empty list (read by the
+        scanner, off this thread) so results appear before the walk is done.
+        """
+        root = os.path.abspath(root)
+        if (root, (name_filters, ignore)) != (self.root, self._filters):
+            self.stop()
+            self.root, self._filters = root, (name_filters, ignore)
+            self.index.clear()
+            self._scanned_at = 0.0
+        seed = index_db if not len(self.index) else None
+        self._recent = [p for p in list_recent() if os.path.isfile(p)]
+        self.index.extend((_key(root, p), p) for p in self._recent)
+        if self._scanner is None and time.monotonic() - self._scanned_at > _RESCAN_AFTER_S:
+            self._start_scan(seed)
+
+        host = self.parentWidget()
+        if host is not None:
+            width = min(640, max(360, host.width() * 2 // 3))
+            top = host.mapToGlobal(host.rect().topLeft())
+            self.setGeometry(top.x() + (host.width() - width) // 2, top.y() + 48, width, 360)
+        self.edit.clear()
+        self._update_results()
+        self.show()
+        self.edit.setFocus()
+
+    def stop(self) -> None:
+        scanner, self._scanner = self._scanner, None
+        if scanner is not None:
+            scanner.cancel()
+            scanner.wait()
+            scanner.deleteLater()
+
+    # ----- internals -----
+    def _start_scan(self, index_db: str | None = None) -> None:
+        assert self.root is not None and self._filters is not None
+        scanner = PathScanner(self.root, *self._filters, index_db, parent=self)
+        scanner.pathsFound.connect(self._on_paths)
+        scanner.indexReady.connect(self._on_index)
+        scanner.finished.connect(self._on_scan_finished)
+        self._scanner = scanner
+        scanner.start(QThread.Priority.LowPriority)
+
+    def _on_paths(self, paths: list[str]) -> None:
+        if self.sender() is not self._scanner or self.root is None:
+            return
+        self.index.extend((_key(self.root, p), p) for p in paths)
+        if self.isVisible() and self.edit.text().strip():
+            self._refilter.start(0)
+
+    def _on_index(self, index: FuzzyIndex) -> None:
+        if self.sender() is not self._scanner or self.root is None:
+            return
+        index.extend((_key(self.root, p), p) for p in self._recent)
+        self.index = index
+        self._scanned_at = time.monotonic()
+        if self.isVisible():
+            self._refilter.start(0)
+
+    def _on_scan_finished(self) -> None:
+        scanner = self.sender()
+        if scanner is self._scanner:
+            self._scanner = None
+            scanner.deleteLater()
+
+    def _update_results(self) -> None:
+        query = self.edit.text()
+        if query.strip():
+            boost = {p: _RECENT_BOOST - i for i, p in enumerate(self._recent)}
+            paths = self.index.search(query, _RESULTS, boost)
+        else:
+            paths = self._recent
+        self.results.clear()
+        for p in paths:
+            item = QListWidgetItem(_key(self.root or "", p))
+            item.setToolTip(p)
+            item.setData(_PATH_ROLE, p)
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+
+    def _choose(self, item: QListWidgetItem | None = None) -> None:
+        item = item or self.results.currentItem()
+        if item is None:
+            return
+        self.hide()
+        self.fileChosen.emit(item.data(_PATH_ROLE))
+
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self.edit and event.type() == QEvent.Type.KeyPress:
+            key = event.key()
+            if key in (Qt.Key.Key_Down, Qt.Key.Key_Up, Qt.Key.Key_PageDown, Qt.Key.Key_PageUp):
+                self.results.keyPressEvent(event)  # move the selection, keep typing focus
+                return True
+            if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+                if self._refilter.isActive():
+                    self._refilter.stop()
+                    self._update_results()
+                self._choose()
+                return True
+            if key == Qt.Key.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(obj, event)
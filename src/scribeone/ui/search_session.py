@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import re
+from typing import Callable
+
+from PyQt6.QtCore import QObject, QPoint, QTimer
+from PyQt6.QtGui import QColor, QTextCharFormat, QTextCursor
+from PyQt6.QtWidgets import QPlainTextEdit, QTextEdit
+
+from ..core.document import Document
+from ..core.search import MatchList, SearchQuery, iter_matches, replace_all
+from .chrome_scheduler import ChromeScheduler
+from .find_bar import FindBar
+from .messages import ERR_BAD_REGEX, MSG_FIND_COUNT, MSG_FIND_NONE, MSG_FIND_SEARCHING
+from .search_worker import SearchWorker
+
+# Edits during a scan (or to a multi-line pattern) restart it after this pause
+_RESCAN_DEBOUNCE_MS = 150
+# Highlights are only built for the visible text, and never more than this
+_MAX_HIGHLIGHTS = 2000
+
+
+class SearchSession(QObject):
+    """Live matches of the find bar's query in the editor's document.
+
+    A ``SearchWorker`` scans a snapshot and streams matches into a
+    ``MatchList``. Afterwards each edit only rescans the lines it touched
+    (``on_edit``); patterns that may span lines fall back to a debounced
+    full rescan. Highlighting covers the visible matches only and is
+    redrawn through the window's ``ChromeScheduler``.
+    """
+
+    def __init__(
+        self,
+        editor: QPlainTextEdit,
+        bar: FindBar,
+        document: Callable[[], Document],
+        chrome: ChromeScheduler,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.editor = editor
+        self.bar = bar
+        self._document = document
+        self._chrome = chrome
+        self.query: SearchQuery | None = None
+        self._rx: re.Pattern[str] | None = None
+        self._error = ""
+        self.matches = MatchList()
+        self._worker: SearchWorker | None = None
+        self._replacing = False
+        self.active = True
+
+        self._rescan = QTimer(self)
+        self._rescan.setSingleShot(True)
+        self._rescan.setInterval(_RESCAN_DEBOUNCE_MS)
+        self._rescan.timeout.connect(self.restart)
+
+        self._format = QTextCharFormat()
+        self._format.setBackground(QColor(255, 200, 0, 90))
+        self._current_format = QTextCharFormat()
+        self._current_format.setBackground(QColor(255, 150, 0, 170))
+
+        bar.queryChanged.connect(self.set_query)
+        bar.replaceOne.connect(self.replace_current)
+        bar.closed.connect(self._redraw)
+        chrome.add("search", self._render)
+        editor.verticalScrollBar().valueChanged.connect(self._redraw)
+        editor.horizontalScrollBar().valueChanged.connect(self._redraw)
+        editor.cursorPositionChanged.connect(self._redraw)
+
+    # ----- query / scanning -----
+    @property
+    def complete(self) -> bool:
+        return self._worker is None
+
+    def set_active(self, active: bool) -> None:
+        """Stop matching while another view (the huge-file viewer) is shown."""
+        self.active = active
+        self.restart()
+
+    def set_query(self, query: SearchQuery | None) -> None:
+        self.query = query
+        self._rx = None
+        self._error = ""
+        if query is not None:
+            try:
+                self._rx = query.compile()
+            except re.error as e:
+                self._error = ERR_BAD_REGEX.format(error=e)
+        self.restart()
+
+    def restart(self) -> None:
+        """Drop all matches and rescan the current document."""
+        self._rescan.stop()
+        self.cancel()
+        self.matches.clear()
+        if self._rx is not None and self.active:
+            worker = SearchWorker(self._document().snapshot().pieces, self._rx, self.query.spans_lines, self)
+            worker.matchesFound.connect(self._on_matches)
+            worker.finished.connect(self._on_worker_finished)
+            self._worker = worker
+            worker.start()
+        self._redraw()
+
+    def cancel(self) -> None:
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.cancel()
+            worker.wait()
+            worker.deleteLater()
+
+    def _on_matches(self, batch: list) -> None:
+        if self.sender() is self._worker:
+            self.matches.extend(batch)
+            self._redraw()
+
+    def _on_worker_finished(self) -> None:
+        worker = self.sender()
+        if worker is self._worker:
+            self._worker = None
+            worker.deleteLater()
+            self._redraw()
+
+    def on_edit(self, position: int, removed: int, added: int) -> None:
+        """The document changed at ``position``: keep the matches in step."""
+        if self._rx is None or not self.active or self._replacing:
+            return
+        if self._worker is not None or self.query.spans_lines:
+            # The scan's snapshot is already stale, or a match may cross lines
+            self._rescan.start()
+            return
+        qdoc = self.editor.document()
+        start = qdoc.findBlock(position).position()
+        last = qdoc.findBlock(position + added)
+        end = last.position() + last.length() - 1
+        text = self._document().buffer.slice(start, end)
+        found = list(iter_matches([text], self._rx, start))
+        self.matches.replace(start, end - added + removed, added - removed, found)
+        self._redraw()
+
+    # ----- navigation -----
+    def current_index(self) -> int:
+        """Index of the match the editor has selected, or -1."""
+        cur = self.editor.textCursor()
+        start = cur.selectionStart()
+        i = self.matches.index_at(start)
+        if i < len(self.matches) and self.matches[i] == (start, cur.selectionEnd() - start):
+            return i
+        return -1
+
+    def next(self, forward: bool = True) -> bool:
+        """Select the next (or previous) match from the caret, wrapping around."""
+        n = len(self.matches)
+        if not n:
+            return False
+        cur = self.editor.textCursor()
+        if forward:
+            i = self.matches.index_at(cur.selectionEnd())
+            if i == n:
+                if not self.complete:
+                    return False  # more matches may still be on the way
+                i = 0
+        else:
+            i = self.matches.index_at(cur.selectionStart()) - 1
+            if i < 0:
+                i = n - 1
+        self._select(*self.matches[i])
+        return True
+
+    def _select(self, start: int, length: int) -> None:
+        cur = QTextCursor(self.editor.document())
+        cur.setPosition(start)
+        cur.setPosition(start + length, QTextCursor.MoveMode.KeepAnchor)
+        self.editor.setTextCursor(cur)
+        self.editor.centerCursor()
+
+    # ----- replacing -----
+    def replace_current(self, replacement: str) -> None:
+        """Replace the selected match (selecting one first if needed), then move on."""
+        if self._rx is None or self.editor.isReadOnly():
+            return
+        if self.current_index() < 0:
+            self.next(True)
+            return
+        cur = self.editor.textCursor()
+        if self.query.regex:
+            m = self._rx.fullmatch(cur.selectedText().replace("\u2029", "\n"))
+            if m is not None:
+                replacement = m.expand(replacement)
+        cur.insertText(replacement)
+        self.next(True)
+
+    def replace_all(self, replacement: str) -> int:
+        """Replace every match as a single edit (one undo step); returns the count."""
+        if self._rx is None or self.editor.isReadOnly():
+            return 0
+        self.cancel()
+        result = replace_all(self._document().text, self._rx, replacement, self.query.regex)
+        if result is None:
+            self.restart()
+            return 0
+        start, end, text, count = result
+        cur = QTextCursor(self.editor.document())
+        cur.setPosition(start)
+        cur.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        # The whole span is rescanned below; skip the per-line update
+        self._replacing = True
+        cur.beginEditBlock()
+        try:
+            cur.insertText(text)
+        finally:
+            cur.endEditBlock()
+            self._replacing = False
+        self.restart()
+        return count
+
+    # ----- highlighting -----
+    def _redraw(self) -> None:
+        self._chrome.invalidate("search")
+
+    def _render(self) -> None:
+        editor = self.editor
+        if not self.bar.isVisible() or self._rx is None or not self.active:
+            editor.setExtraSelections([])
+            self.bar.set_count(self._error, error=bool(self._error))
+            return
+        qdoc = editor.document()
+        top = qdoc.findBlock(editor.cursorForPosition(QPoint(0, 0)).position())
+        bottom = qdoc.findBlock(editor.cursorForPosition(editor.viewport().rect().bottomRight()).position())
+        visible = self.matches.in_range(top.position(), bottom.position() + bottom.length())
+        current = self.current_index()
+        current_match = self.matches[current] if current >= 0 else None
+        selections = []
+        for start, length in visible[:_MAX_HIGHLIGHTS]:
+            sel = QTextEdit.ExtraSelection()
+            sel.cursor = QTextCursor(qdoc)
+            sel.cursor.setPosition(start)
+            sel.cursor.setPosition(start + length, QTextCursor.MoveMode.KeepAnchor)
+            sel.format = self._current_format if (start, length) == current_match else self._format
+            selections.append(sel)
+        editor.setExtraSelections(selections)
+
+        total = len(self.matches)
+        if not self.complete:
+            self.bar.set_count(MSG_FIND_SEARCHING.format(total=f"{total:,}"))
+        elif not total:
+            self.bar.set_count(MSG_FIND_NONE)
+        else:
+            shown = f"{current + 1:,}" if current >= 0 else "?"
+            self.bar.set_count(MSG_FIND_COUNT.format(current=shown, total=f"{total:,}"))
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import re
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ..core.piece_table import Piece, PieceTable
+from ..core.search import Match, iter_matches
+
+# Matches are delivered in batches of this size, or at least this often
+BATCH_SIZE = 2000
+BATCH_INTERVAL_S = 0.05
+# Smaller windows keep each regex call short, since ``re`` holds the GIL
+_WINDOW_CHARS = 256 * 1024
+
+
+class SearchWorker(QThread):
+    """Scan an immutable document snapshot for a compiled pattern.
+
+    Matches stream back through ``matchesFound`` as lists of
+    ``(start, length)`` in UTF-16 units; ``complete`` tells whether the scan
+    reached the end or was cancelled.
+    """
+
+    matchesFound = pyqtSignal(object)  # list[Match]
+
+    def __init__(self, pieces: tuple[Piece, ...], rx: re.Pattern[str], spans_lines: bool = False, parent=None) -> None:
+        super().__init__(parent)
+        self.pieces = pieces
+        self.rx = rx
+        self.spans_lines = spans_lines
+        self.complete = False
+
+    def cancel(self) -> None:
+        self.requestInterruption()
+
+    def run(self) -> None:
+        chunks = PieceTable.from_pieces(self.pieces).iter_chunks(_WINDOW_CHARS)
+        batch: list[Match] = []
+        flushed = time.monotonic()
+        for match in iter_matches(chunks, self.rx, cancelled=self.isInterruptionRequested, spans_lines=self.spans_lines):
+            batch.append(match)
+            if len(batch) >= BATCH_SIZE or time.monotonic() - flushed >= BATCH_INTERVAL_S:
+                self.matchesFound.emit(batch)
+                batch = []
+                flushed = time.monotonic()
+        if self.isInterruptionRequested():
+            return
+        if batch:
+            self.matchesFound.emit(batch)
+        self.complete = True
@@ -4,43 +4,53 @@ from pathlib import Path
 from typing import Optional
 
 from PyQt6.QtCore import pyqtSignal, QModelIndex, Qt
+from PyQt6.QtGui import QAction
 from PyQt6.QtWidgets import (
+    QFileDialog,
     QFrame,
+    QInputDialog,
+    QLineEdit,
     QTabWidget,
     QTreeView,
     QListWidget,
     QListWidgetItem,
-    QLabel,
     QVBoxLayout,
     QGraphicsDropShadowEffect,
+    QWidget,
 )
 
-# Try to locate QFileSystemModel in available modules
-try:  # PyQt6 >= 6.6 typical
-    from PyQt6.QtWidgets import QFileSystemModel as _QFileSystemModel  # type: ignore
-except Exception:
-    try:
-        from PyQt6.QtGui import QFileSystemModel as _QFileSystemModel  # type: ignore
-    except Exception:
-        _QFileSystemModel = None  # type: ignore
-
+from ..core.workspace_search import split_patterns
 from ..utils.recent_files import list_recent
+from ..utils.workspace_settings import (
+    explorer_name_filters,
+    set_explorer_name_filters,
+    set_workspace_root,
+    workspace_root,
+    workspace_root_chosen,
+)
+from .explorer_model import ExplorerModel
+from .find_in_files import FindInFilesPanel
+from .workspace_indexer import WorkspaceIndexer
+
+# File-name matches listed by the Explorer filter
+_NAME_RESULTS = 100
 
 
 class SidebarPanel(QFrame):
-    """Modern left sidebar panel (non-dock) with Explorer + Recent.
+    """Modern left sidebar panel (non-dock) with Explorer + Recent + Search.
 
     Designed to be embedded inside a layout rather than using QDockWidget to
     allow custom animation, invisible title bar, and gesture / edge reveal.
     """
 
-    fileOpenRequested = pyqtSignal(str)
+    fileOpenRequested = pyqtSignal(str, int)  # path, 1-based line (0: keep)
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setObjectName("SidebarPanel")
         self.setMinimumWidth(200)
         self.setMaximumWidth(320)
+        self.root = workspace_root()
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -49,30 +59,48 @@ class SidebarPanel(QFrame):
         self.tabs = QTabWidget(self)
         layout.addWidget(self.tabs)
 
-        # Explorer tab
-        self.model = None
-        if _QFileSystemModel is not None:
-            self.model = _QFileSystemModel(self)
-            try:
-                self.model.setNameFilters(["*.txt"])
-                self.model.setNameFilterDisables(False)
-            except Exception:
-                pass
-            self.tree = QTreeView(self)
-            self.tree.setModel(self.model)
-            self.tree.setHeaderHidden(True)
-            self.tree.doubleClicked.connect(self._open_index)
-            self.tabs.addTab(self.tree, "Explorer")
-        else:
-            self.tree = QLabel("Explorer unavailable", self)
-            self.tree.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.tabs.addTab(self.tree, "Explorer")
+        # Explorer tab: lists folders as they are expanded
+        self.model = ExplorerModel(self)
+        self.model.set_name_filters(explorer_name_filters())
+        self.tree = QTreeView(self)
+        self.tree.setModel(self.model)
+        self.tree.setHeaderHidden(True)
+        self.tree.setUniformRowHeights(True)
+        self.tree.doubleClicked.connect(self._open_index)
+        self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
+        for text, slot in (("打开文件夹…", self.choose_root), ("显示的文件…", self.choose_filters), ("刷新", self._refresh_tree)):
+            action = QAction(text, self.tree)
+            action.triggered.connect(slot)
+            self.tree.addAction(action)
+        # File-name filter answered from the workspace index
+        self.name_filter = QLineEdit(self)
+        self.name_filter.setPlaceholderText("按文件名筛选")
+        self.name_filter.setClearButtonEnabled(True)
+        self.name_filter.textChanged.connect(self._filter_names)
+        self.name_results = QListWidget(self)
+        self.name_results.itemActivated.connect(self._open_name_item)
+        self.name_results.hide()
+        explorer = QWidget(self)
+        explorer_layout = QVBoxLayout(explorer)
+        explorer_layout.setContentsMargins(0, 0, 0, 0)
+        explorer_layout.setSpacing(0)
+        explorer_layout.addWidget(self.name_filter)
+        explorer_layout.addWidget(self.tree)
+        explorer_layout.addWidget(self.name_results)
+        self.tabs.addTab(explorer, "Explorer")
 
         # Recent tab
         self.recent = QListWidget(self)
         self.recent.itemActivated.connect(self._open_recent_item)
         self.tabs.addTab(self.recent, "Recent")
 
+        # Find in Files tab, backed by the background workspace index
+        self.indexer = WorkspaceIndexer(self)
+        self.find_in_files = FindInFilesPanel(self.indexer, self)
+        self.indexer.set_filters(*self.find_in_files.filters())
+        self.find_in_files.fileOpenRequested.connect(self.fileOpenRequested)
+        self.tabs.addTab(self.find_in_files, "Search")
+
         self.refresh_recent()
 
         # Subtle shadow for depth when overlaying content (optional)
@@ -84,10 +112,42 @@ class SidebarPanel(QFrame):
 
     # ---------------- public API -----------------
     def set_root(self, path: Optional[str]) -> None:
-        root = str(path or str(Path.home()))
-        if self.model is not None and isinstance(self.tree, QTreeView):
-            idx = self.model.setRootPath(root)
-            self.tree.setRootIndex(idx)
+        root = str(path or workspace_root())
+        self.root = root
+        self.tree.setRootIndex(self.model.set_root(root))
+        self.find_in_files.set_root(root)
+        # Only a folder the user chose is indexed, never the home fallback
+        self.indexer.set_root(root if workspace_root_chosen() else None)
+
+    def choose_root(self) -> None:
+        """Ask for a workspace folder; it is remembered for later sessions."""
+        path = QFileDialog.getExistingDirectory(self, "打开文件夹", self.root)
+        if path:
+            set_workspace_root(path)
+            self.set_root(path)
+
+    def choose_filters(self) -> None:
+        """Ask which files the explorer lists; the tree is refiltered in place."""
+        text, ok = QInputDialog.getText(
+            self,
+            "显示的文件",
+            "资源管理器中显示的文件（如 *.txt; *.md，留空显示全部）：",
+            text="; ".join(self.model.name_filters()),
+        )
+        if ok:
+            patterns = split_patterns(text)
+            set_explorer_name_filters(patterns)
+            self.model.set_name_filters(patterns)
+
+    def file_saved(self, path: str, ok: bool) -> None:
+        if ok:
+            self.indexer.file_changed(path)
+
+    def shutdown(self) -> None:
+        """Stop background searches and indexing (the window is closing)."""
+        self.find_in_files.stop()
+        self.indexer.stop()
+        self.model.shutdown()
 
     def refresh_recent(self) -> None:
         self.recent.clear()
@@ -98,13 +158,35 @@ class SidebarPanel(QFrame):
 
     # ---------------- internal handlers -----------------
     def _open_index(self, index: QModelIndex) -> None:
-        if self.model is None or not index.isValid():
+        if index.isValid() and not self.model.isDir(index):
+            self.fileOpenRequested.emit(self.model.filePath(index), 0)
+
+    def _refresh_tree(self) -> None:
+        index = self.tree.currentIndex()
+        if index.isValid() and not self.model.isDir(index):
+            index = index.parent()
+        self.model.refresh(self.model.filePath(index) if index.isValid() else self.model.root_path())
+
+    def _filter_names(self, text: str) -> None:
+        self.name_results.clear()
+        index = self.indexer.index() if text.strip() else None
+        if index is None:
+            self.name_results.hide()
+            self.tree.show()
             return
-        path = self.model.filePath(index)
-        if Path(path).is_file():
-            self.fileOpenRequested.emit(path)
+        for p in index.find_names(text, _NAME_RESULTS):
+            item = QListWidgetItem(Path(p).name)
+            item.setToolTip(p)
+            item.setData(Qt.ItemDataRole.UserRole, p)
+            self.name_results.addItem(item)
+        self.tree.hide()
+        self.name_results.show()
+
+    def _open_name_item(self, item: QListWidgetItem) -> None:
+        if item:
+            self.fileOpenRequested.emit(item.data(Qt.ItemDataRole.UserRole), 0)
 
     def _open_recent_item(self, item: QListWidgetItem) -> None:
         if not item:
             return
-        self.fileOpenRequested.emit(item.text())
+        self.fileOpenRequested.emit(item.text(), 0)
@@ -3,11 +3,14 @@ from __future__ import annotations
 from PyQt6.QtCore import QEasingCurve, QPropertyAnimation, QTimer, Qt
 from PyQt6.QtWidgets import QLabel, QWidget, QGraphicsDropShadowEffect
 
+from .effects import reduced_effects
+
 
 class Snackbar(QWidget):
     """A lightweight transient message widget with fade in/out.
 
-    ANM-004: SnackbarFade — windowOpacity fade in/out.
+    ANM-004: SnackbarFade — windowOpacity fade in/out. With reduced effects
+    it simply appears and disappears, without the fade or the shadow.
     """
 
     def __init__(self, parent=None) -> None:
@@ -35,6 +38,8 @@ class Snackbar(QWidget):
 
         self._anim = QPropertyAnimation(self, b"windowOpacity", self)
         self._anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        # Connected once: hides at the end of a fade out, not of a fade in
+        self._anim.finished.connect(self._on_anim_finished)
 
         self.hide()
 
@@ -44,6 +49,15 @@ class Snackbar(QWidget):
         self.resize(self._label.size())
 
         self._place_bottom_center()
+        self._timer.start(max(300, msec))
+        if reduced_effects():
+            self._anim.stop()
+            if hasattr(self, "_shadow"):
+                self._label.setGraphicsEffect(None)  # deletes it
+                del self._shadow
+            self.setWindowOpacity(1.0)
+            self.show()
+            return
         self.setWindowOpacity(0.0)
         self.show()
 
@@ -54,17 +68,15 @@ class Snackbar(QWidget):
         self._anim.setEndValue(1.0)
         self._anim.start()
 
-        # Auto fade out after msec
-        self._timer.start(max(300, msec))
-
     def _fade_out(self) -> None:
+        if reduced_effects():
+            self.hide()
+            return
         self._anim.stop()
         self._anim.setDuration(420)
         self._anim.setStartValue(1.0)
         self._anim.setEndValue(0.0)
         self._anim.start()
-        # Ensure hide at end
-        self._anim.finished.connect(self.hide)
 
         # Create a subtle shadow for depth (on create once)
         if not hasattr(self, "_shadow"):
@@ -75,6 +87,10 @@ class Snackbar(QWidget):
             self._label.setGraphicsEffect(shadow)
             self._shadow = shadow
 
+    def _on_anim_finished(self) -> None:
+        if self._anim.endValue() == 0.0:
+            self.hide()
+
     def _place_bottom_center(self) -> None:
         parent = self.parentWidget()
         if not parent:
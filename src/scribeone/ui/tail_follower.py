@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ..core.tail import LogTail
+
+# How often the file is checked for new data
+POLL_MS = 250
+
+
+class TailFollower(QThread):
+    """Poll a growing file on a worker thread and stream what is appended.
+
+    Reads start at ``offset`` (the end of what the editor already shows).
+    Text is passed as Python objects and must be consumed in emission
+    order; ``restarted`` precedes the text of a truncated or rotated file.
+    Call ``cancel()`` to stop.
+    """
+
+    appended = pyqtSignal(object)  # str
+    restarted = pyqtSignal()
+
+    def __init__(self, path: str, encoding: str, offset: int, parent=None) -> None:
+        super().__init__(parent)
+        self.path = path
+        self.encoding = encoding
+        self.offset = offset
+
+    def cancel(self) -> None:
+        self.requestInterruption()
+
+    def run(self) -> None:
+        try:
+            tail = LogTail(self.path, self.encoding, self.offset)
+        except OSError:
+            tail = None
+        while not self.isInterruptionRequested():
+            if tail is None:
+                try:
+                    tail = LogTail(self.path, self.encoding, 0)  # appeared again
+                    self.restarted.emit()
+                except OSError:
+                    pass
+            else:
+                try:
+                    text, restarted = tail.read()
+                except OSError:
+                    text, restarted = "", False
+                if restarted:
+                    self.restarted.emit()
+                if text:
+                    self.appended.emit(text)
+                    continue  # more may be waiting
+            self.msleep(POLL_MS)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from pathlib import Path
-from PyQt6.QtCore import QSettings
+
+from ..utils.settings import THEME, settings
 
 
 class ThemeManager:
@@ -12,12 +13,10 @@ class ThemeManager:
         qss_path = self._theme_path(name)
         if qss_path and qss_path.exists():
             self.app.setStyleSheet(qss_path.read_text(encoding="utf-8"))
-            QSettings().setValue("ui/theme", name)
+            settings().set(THEME, name)
 
     def restore(self) -> None:
-        name = QSettings().value("ui/theme", "dark")
-        name = str(name) if name else "dark"
-        self.apply(name)
+        self.apply(settings().get(THEME) or THEME.default)
 
     @staticmethod
     def _theme_path(name: str) -> Path | None:
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QThread, QTimer, pyqtSignal
+
+from ..core.workspace_index import WorkspaceIndex, index_file_name
+from ..core.workspace_search import DEFAULT_IGNORE, DEFAULT_NAME_FILTERS, iter_files
+from ..utils.app_paths import app_data_dir
+
+# The first build waits until startup has settled; later changes are batched
+_START_DELAY_MS = 3000
+_DEBOUNCE_MS = 1000
+# inotify watches are a limited per-user resource: this many directories
+# at most are watched by all indexers of the process together
+MAX_WATCHED_DIRS = 2000
+_watched_dirs = 0
+
+
+def _lower_priority() -> None:
+    """Nice the calling thread where the OS allows per-thread priorities (Linux)."""
+    if hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except OSError:
+            pass
+
+
+class IndexWorker(QThread):
+    """Sync a workspace index: the whole root, or just some directories.
+
+    ``watchDirs`` reports the directories holding indexed files after a
+    full pass, so the indexer can watch them for changes.
+    """
+
+    watchDirs = pyqtSignal(object)  # list[str]
+
+    def __init__(
+        self,
+        db_path: str,
+        root: str,
+        name_filters: tuple[str, ...],
+        ignore: tuple[str, ...],
+        dirs: list[str] | None = None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.db_path = db_path
+        self.root = root
+        self.name_filters = name_filters
+        self.ignore = ignore
+        self.dirs = dirs
+        self.changed = 0
+
+    def cancel(self) -> None:
+        self.requestInterruption()
+
+    def run(self) -> None:
+        _lower_priority()
+        cancelled = self.isInterruptionRequested
+        try:
+            index = WorkspaceIndex(self.db_path)
+        except sqlite3.Error:
+            return  # e.g. SQLite built without FTS5: searches just read every file
+        try:
+            if self.dirs is None:
+                paths = iter_files(self.root, self.name_filters, self.ignore, cancelled)
+                self.changed = index.sync(paths, lambda p: True, cancelled)
+                if not cancelled():
+                    dirs = {self.root} | {os.path.dirname(p) for p in index.states()}
+                    self.watchDirs.emit(sorted(dirs)[:MAX_WATCHED_DIRS])
+                return
+            for d in self.dirs:
+                paths = iter_files(d, self.name_filters, self.ignore, cancelled, recursive=False)
+                self.changed += index.sync(paths, lambda p, d=d: os.path.dirname(p) == d, cancelled)
+        except sqlite3.Error:
+            pass
+        finally:
+            index.close()
+
+
+class WorkspaceIndexer(QObject):
+    """Keep the trigram index of the workspace root current in the background.
+
+    There is no index until a root is set: the home directory the sidebar
+    falls back to is never indexed. A full pass runs shortly after the root
+    is set and whenever it or the file filters change; afterwards a filesystem watcher and saves from the
+    editor queue just the affected directories. All passes run on an
+    ``IndexWorker`` at the lowest thread priority, one at a time.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.root: str | None = None
+        self.db_path: str | None = None
+        self.name_filters: tuple[str, ...] = DEFAULT_NAME_FILTERS
+        self.ignore: tuple[str, ...] = DEFAULT_IGNORE
+        self._reader: WorkspaceIndex | None = None
+        self._worker: IndexWorker | None = None
+        self._full_pending = False
+        self._dirty_dirs: set[str] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_pending)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.invalidate_dir)
+
+    # ----- public API -----
+    def set_root(self, root: str | None) -> None:
+        """Index ``root`` from now on; None drops the index (searches read every file)."""
+        root = os.path.abspath(root) if root is not None else None
+        if root == self.root:
+            return
+        self.stop()
+        self._close_reader()
+        self.root = root
+        self._full_pending = False
+        if root is None:
+            self.db_path = None
+            return
+        self.db_path = str(app_data_dir("index") / index_file_name(root))
+        self._schedule_full(_START_DELAY_MS)
+
+    def set_filters(self, name_filters: tuple[str, ...], ignore: tuple[str, ...]) -> None:
+        if (name_filters, ignore) != (self.name_filters, self.ignore):
+            self.name_filters, self.ignore = name_filters, ignore
+            self._schedule_full(_DEBOUNCE_MS)
+
+    def file_changed(self, path: str) -> None:
+        """Reindex ``path``'s directory soon (e.g. after the editor saved it)."""
+        if self.root and os.path.abspath(path).startswith(self.root + os.sep):
+            self.invalidate_dir(os.path.dirname(os.path.abspath(path)))
+
+    def invalidate_dir(self, directory: str) -> None:
+        self._dirty_dirs.add(directory)
+        if not self._timer.isActive():
+            self._timer.start(_DEBOUNCE_MS)
+
+    def index(self) -> WorkspaceIndex | None:
+        """A read connection for the GUI thread; None if the index is unusable."""
+        if self._reader is None and self.db_path is not None:
+            try:
+                self._reader = WorkspaceIndex(self.db_path)
+            except sqlite3.Error:
+                return None
+        return self._reader
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._watch([])
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.cancel()
+            worker.wait()
+            worker.deleteLater()
+            # An interrupted pass is resumed next time; unchanged files are skipped
+            self._full_pending = self._full_pending or worker.dirs is None
+
+    # ----- internals -----
+    def _close_reader(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _schedule_full(self, delay_ms: int) -> None:
+        self._full_pending = True
+        self._timer.start(delay_ms)
+
+    def _run_pending(self) -> None:
+        if self.root is None or self.db_path is None:
+            return
+        if self._worker is not None:
+            self._timer.start(_DEBOUNCE_MS)  # one pass at a time
+            return
+        if self._full_pending:
+            dirs = None
+            self._full_pending = False
+            self._dirty_dirs.clear()
+        elif self._dirty_dirs:
+            dirs = sorted(self._dirty_dirs)
+            self._dirty_dirs.clear()
+        else:
+            return
+        worker = IndexWorker(self.db_path, self.root, self.name_filters, self.ignore, dirs, self)
+        worker.watchDirs.connect(self._watch)
+        worker.finished.connect(self._on_finished)
+        self._worker = worker
+        worker.start(QThread.Priority.LowestPriority)
+
+    def _on_finished(self) -> None:
+        worker = self.sender()
+        if worker is self._worker:
+            self._worker = None
+            worker.deleteLater()
+
+    def _watch(self, dirs: list[str]) -> None:
+        global _watched_dirs
+        current = self._watcher.directories()
+        if current:
+            self._watcher.removePaths(current)
+            _watched_dirs -= len(current)
+        dirs = dirs[:max(0, MAX_WATCHED_DIRS - _watched_dirs)]
+        if dirs:
+            failed = self._watcher.addPaths(dirs)
+            _watched_dirs += len(dirs) - len(failed)
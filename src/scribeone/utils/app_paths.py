@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from PyQt6.QtCore import QStandardPaths
+
+
+def app_data_dir(*parts: str) -> Path:
+    """Per-user writable data directory for ScribeOne, created on demand."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    path = Path(base, *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
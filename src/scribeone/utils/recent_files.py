@@ -1,32 +1,186 @@
 from __future__ import annotations
 
-from typing import Iterable
-from PyQt6.QtCore import QSettings
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
 
-_MAX = 5
-_KEY = "recent_files"
+from .app_paths import app_data_dir
+from .settings import LEGACY_RECENT_FILES, RECENT_FILES, RECENT_MAX_FILES, settings
 
 
-def _settings() -> QSettings:
-    return QSettings()
+@dataclass(frozen=True)
+class RecentFile:
+    """What is remembered about a recently opened file.
+
+    ``size``/``mtime_ns`` fingerprint the version the rest describes; the
+    encoding, newline and line index are only trusted while it matches.
+    """
+
+    path: str
+    encoding: str | None = None
+    newline: str | None = None
+    size: int = -1
+    mtime_ns: int = -1
+    line: int = 0  # 1-based caret position; 0: none saved
+    column: int = 1
+    scroll: int = 0  # first visible line, 0-based
+
+    def matches(self, st: os.stat_result) -> bool:
+        return (self.size, self.mtime_ns) == (st.st_size, st.st_mtime_ns)
+
+
+class RecentFiles:
+    """Most-recently-used files with their metadata, cached in memory.
+
+    Entries are kept as JSON in the settings service, which caches and
+    writes them behind; line indexes of huge files go into side files in
+    the app data directory.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self._dir = directory
+        self._entries: list[RecentFile] | None = None
+        self._max: int | None = None
+
+    # ----- reading -----
+    def paths(self) -> list[str]:
+        return [e.path for e in self._load()]
+
+    def get(self, path: str) -> RecentFile | None:
+        path = os.path.abspath(path)
+        return next((e for e in self._load() if e.path == path), None)
+
+    def lookup(self, path: str, st: os.stat_result) -> RecentFile | None:
+        """The entry for ``path`` if it still describes the file on disk."""
+        entry = self.get(path)
+        return entry if entry is not None and entry.matches(st) else None
+
+    @property
+    def max_files(self) -> int:
+        if self._max is None:
+            self._max = max(1, settings().get(RECENT_MAX_FILES))
+        return self._max
+
+    def set_max_files(self, count: int) -> None:
+        self._max = max(1, int(count))
+        settings().set(RECENT_MAX_FILES, self._max)
+        self._trim()
+        self._save()
+
+    # ----- writing -----
+    def add(self, path: str, **meta) -> RecentFile:
+        """Move ``path`` to the front, updating the given metadata fields."""
+        path = os.path.abspath(path)
+        entries = self._load()
+        old = next((e for e in entries if e.path == path), None)
+        entry = replace(old, **meta) if old is not None else RecentFile(path, **meta)
+        if old is not None:
+            entries.remove(old)
+            self._check_version(old, entry)
+        entries.insert(0, entry)
+        self._trim()
+        self._save()
+        return entry
+
+    def update(self, path: str, **meta) -> None:
+        """Change metadata of a listed file without moving it."""
+        path = os.path.abspath(path)
+        entries = self._load()
+        for i, e in enumerate(entries):
+            if e.path == path:
+                new = replace(e, **meta)
+                self._check_version(e, new)
+                if new != e:
+                    entries[i] = new
+                    self._save()
+                return
+
+    def clear(self) -> None:
+        for e in self._load():
+            self._drop_line_index(e.path)
+        self._entries = []
+        self._save()
+
+    def save_line_index(self, path: str, blob: bytes) -> None:
+        try:
+            self._index_path(path).write_bytes(blob)
+        except OSError:
+            pass
+
+    def line_index(self, path: str) -> bytes | None:
+        """A stored line index; only valid while the entry's fingerprint matches."""
+        try:
+            return self._index_path(path).read_bytes()
+        except OSError:
+            return None
+
+    # ----- internals -----
+    def _directory(self) -> Path:
+        if self._dir is None:
+            self._dir = app_data_dir("recent")
+        return self._dir
+
+    def _index_path(self, path: str) -> Path:
+        name = hashlib.sha1(os.path.abspath(path).encode("utf-8", "surrogatepass")).hexdigest()[:16]
+        return self._directory() / f"{name}.lines"
+
+    def _check_version(self, old: RecentFile, new: RecentFile) -> None:
+        if (old.size, old.mtime_ns) != (new.size, new.mtime_ns):
+            self._drop_line_index(new.path)  # describes the old version
+
+    def _drop_line_index(self, path: str) -> None:
+        try:
+            self._index_path(path).unlink()
+        except OSError:
+            pass
+
+    def _load(self) -> list[RecentFile]:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def _read(self) -> list[RecentFile]:
+        names = {f.name for f in fields(RecentFile)}
+        stored = settings().get(RECENT_FILES)
+        if not stored:
+            # First run with this store: take over the old list of paths
+            return [RecentFile(os.path.abspath(p)) for p in settings().get(LEGACY_RECENT_FILES)]
+        try:
+            return [RecentFile(**{k: v for k, v in item.items() if k in names}) for item in json.loads(stored)]
+        except (ValueError, TypeError, AttributeError):
+            return []
+
+    def _trim(self) -> None:
+        entries = self._load()
+        for e in entries[self.max_files:]:
+            self._drop_line_index(e.path)
+        del entries[self.max_files:]
+
+    def _save(self) -> None:
+        settings().set(RECENT_FILES, json.dumps([asdict(e) for e in self._load()], ensure_ascii=False))
+
+
+_store: RecentFiles | None = None
+
+
+def recent_files() -> RecentFiles:
+    """The process-wide store."""
+    global _store
+    if _store is None:
+        _store = RecentFiles()
+    return _store
 
 
 def list_recent() -> list[str]:
-    settings = _settings()
-    vals = settings.value(_KEY, [])
-    # QSettings may return list[str] or QStringList; normalize to list[str]
-    return [str(x) for x in vals] if isinstance(vals, (list, tuple)) else []
+    return recent_files().paths()
 
 
 def add_recent(path: str) -> list[str]:
-    items = list_recent()
-    if path in items:
-        items.remove(path)
-    items.insert(0, path)
-    items = items[:_MAX]
-    _settings().setValue(_KEY, items)
-    return items
+    recent_files().add(path)
+    return list_recent()
 
 
 def clear_recent() -> None:
-    _settings().remove(_KEY)
+    recent_files().clear()
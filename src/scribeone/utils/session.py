@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from .settings import SESSION, settings
+
+
+@dataclass(frozen=True)
+class SessionTab:
+    """One open document as the session remembers it.
+
+    A tab with unsaved changes names the journal holding them: a spilled
+    journal has the whole text, a live one (left by a crash) still needs
+    the file it was based on.
+    """
+
+    path: str | None
+    encoding: str = "utf-8"
+    journal: str | None = None
+    spilled: bool = False
+    anchor: int = 0  # caret, in the editor's positions
+    position: int = 0
+    scroll: int = 0  # first visible block
+
+
+@dataclass(frozen=True)
+class Session:
+    tabs: tuple[SessionTab, ...] = ()
+    active: int = 0  # index into tabs
+
+    def journals(self) -> set[Path]:
+        return {Path(t.journal) for t in self.tabs if t.journal}
+
+
+def load_session() -> Session:
+    """The saved session; an empty one if there is none or it is unreadable."""
+    stored = settings().get(SESSION)
+    if not stored:
+        return Session()
+    names = {f.name for f in fields(SessionTab)}
+    try:
+        data = json.loads(stored)
+        tabs = tuple(SessionTab(**{k: v for k, v in t.items() if k in names}) for t in data["tabs"])
+        return Session(tabs, min(max(0, int(data.get("active", 0))), max(0, len(tabs) - 1)))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return Session()
+
+
+def session_json(session: Session) -> str:
+    return json.dumps({"tabs": [asdict(t) for t in session.tabs], "active": session.active}, ensure_ascii=False)
+
+
+def save_session(session: Session) -> None:
+    """Store ``session`` (written behind by the settings service)."""
+    settings().set(SESSION, session_json(session))
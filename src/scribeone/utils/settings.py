@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from PyQt6.QtCore import QObject, QSettings, QTimer, pyqtSignal
+
+from ..core.workspace_search import DEFAULT_IGNORE, DEFAULT_NAME_FILTERS
+
+T = TypeVar("T")
+
+# Changes are collected for this long before they are handed to the writer
+WRITE_DELAY_MS = 500
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Key(Generic[T]):
+    """A setting: its QSettings name and default; the default fixes the type."""
+
+    name: str
+    default: T
+
+
+WORD_WRAP = Key("editor/wordWrap", True)
+HUGE_FILE_THRESHOLD = Key("editor/hugeFileThresholdMB", 512)  # files opened read-only via mmap
+FOLLOW_MAX_LINES = Key("editor/followMaxLines", 100_000)  # lines kept while following a log
+TAB_MEMORY_BUDGET = Key("editor/tabMemoryBudgetMB", 256)  # text kept in memory across tabs
+DURABILITY = Key("files/durability", "file")
+COMPRESSION_LEVEL = Key("files/compressionLevel", 6)  # gzip/bz2 level or xz preset for compressed saves
+THEME = Key("ui/theme", "dark")
+SIDEBAR_VISIBLE = Key("ui/sidebarVisible", True)
+SIDEBAR_WIDTH = Key("ui/sidebarWidth", 260)
+REDUCED_EFFECTS = Key("ui/reducedEffects", "auto")  # "on", "off" or "auto"
+SEARCH_NAME_FILTERS = Key("search/nameFilters", "; ".join(DEFAULT_NAME_FILTERS))
+SEARCH_EXCLUDE = Key("search/exclude", "; ".join(DEFAULT_IGNORE))
+WORKSPACE_ROOT = Key("workspace/root", "")
+EXPLORER_NAME_FILTERS = Key("explorer/nameFilters", "*.txt")
+RECENT_MAX_FILES = Key("recent/maxFiles", 20)
+RECENT_FILES = Key("recent/files", "")  # JSON list of entries
+SESSION_RESTORE = Key("session/restore", True)  # reopen the last session's documents
+SESSION = Key("session/tabs", "")  # JSON: the open documents
+LEGACY_RECENT_FILES = Key("recent_files", [])  # the pre-metadata list of paths
+
+_REMOVED = object()
+
+
+def _coerce(value: Any, default: Any) -> Any:
+    """Bring a stored value (INI files give strings) to the default's type."""
+    if value is None:
+        return default
+    try:
+        if isinstance(default, bool):
+            return value.lower() in ("true", "1") if isinstance(value, str) else bool(value)
+        if isinstance(default, int):
+            return int(value)
+        if isinstance(default, str):
+            return str(value)
+        if isinstance(default, list):
+            return [str(v) for v in value] if isinstance(value, (list, tuple)) else [str(value)]
+    except (TypeError, ValueError):
+        return default
+    return value
+
+
+class Settings(QObject):
+    """Application settings cached in memory and written behind.
+
+    Reads come from the cache (the backing store is consulted once per key).
+    Writes update the cache and emit ``changed`` immediately. The store on
+    disk is updated in batches by a writer thread once writes have paused,
+    and ``flush`` forces that and waits for it (e.g. on shutdown).
+    """
+
+    changed = pyqtSignal(str, object)  # key name, new value (default if removed)
+
+    def __init__(self, parent: QObject | None = None, delay_ms: int = WRITE_DELAY_MS) -> None:
+        super().__init__(parent)
+        self._cache: dict[str, Any] = {}
+        self._pending: dict[str, Any] = {}
+        self._reader: QSettings | None = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._hand_over)
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="settings-writer", daemon=True)
+        self._writer.start()
+
+    def get(self, key: Key[T]) -> T:
+        name = key.name
+        if name not in self._cache:
+            if self._reader is None:
+                self._reader = QSettings()
+            self._cache[name] = _coerce(self._reader.value(name, None), key.default)
+        value = self._cache[name]
+        return key.default if value is _REMOVED else value
+
+    def set(self, key: Key[T], value: T) -> None:
+        if self._cache.get(key.name) == value:
+            return
+        self._store(key.name, value)
+        self.changed.emit(key.name, value)
+
+    def remove(self, key: Key[T]) -> None:
+        self._store(key.name, _REMOVED)
+        self.changed.emit(key.name, key.default)
+
+    def flush(self) -> None:
+        """Write every pending change now and wait until it is on disk."""
+        self._timer.stop()
+        self._hand_over()
+        self._queue.join()
+
+    # ----- internals -----
+    def _store(self, name: str, value: Any) -> None:
+        self._cache[name] = value
+        self._pending[name] = value
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _hand_over(self) -> None:
+        if self._pending:
+            batch, self._pending = self._pending, {}
+            self._queue.put(batch)
+
+    def _write_loop(self) -> None:
+        backend: QSettings | None = None
+        while True:
+            batch = self._queue.get()
+            try:
+                if backend is None:
+                    backend = QSettings()
+                for name, value in batch.items():
+                    if value is _REMOVED:
+                        backend.remove(name)
+                    else:
+                        backend.setValue(name, value)
+                backend.sync()
+            except Exception:
+                # Keep the writer alive: flush() waits on it, and later batches may succeed
+                _log.exception("Could not write settings")
+                backend = None
+            finally:
+                self._queue.task_done()
+
+
+_settings: Settings | None = None
+
+
+def settings() -> Settings:
+    """The process-wide settings service (create it on the GUI thread)."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
@@ -0,0 +1,124 @@
+"""Client side of the single-instance handoff.
+
+A running ScribeOne listens on a per-user local socket (``QLocalServer``; a
+Unix domain socket, or a named pipe on Windows). A new invocation first
+tries to hand its command line to that instance and exits if it was
+accepted. This module deliberately avoids importing Qt, so a handoff costs
+little more than starting the interpreter.
+
+Protocol: the client writes one JSON line ``{"v": 1, "cwd": ..., "argv":
+[...]}`` and the server answers ``ok``. The server re-parses ``argv`` with
+the same parser as a normal launch, so every command-line option works
+the same in both paths.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import sys
+import tempfile
+
+PROTOCOL_VERSION = 1
+# A new instance waits this long for a running one before launching normally
+CONNECT_TIMEOUT_S = 0.5
+REPLY_TIMEOUT_S = 2.0
+# Requests are command lines; anything bigger is not one of ours
+MAX_REQUEST_BYTES = 1 << 20
+
+_LOCATION = re.compile(r"^(.*?):(\d+)(?::(\d+))?$")
+
+
+def _user() -> str:
+    if hasattr(os, "getuid"):
+        return str(os.getuid())
+    return re.sub(r"[^\w.-]", "_", os.environ.get("USERNAME", "user"))
+
+
+def server_name() -> str | None:
+    """Name for ``QLocalServer.listen``/the client; None if no safe place exists.
+
+    On Unix this is an absolute socket path inside a directory only the
+    current user can write to: ``$XDG_RUNTIME_DIR``, or a private
+    ``scribeone-<uid>`` directory under the temp dir. A directory that is
+    not ours or is accessible to others disables the handoff.
+    """
+    if sys.platform == "win32":
+        return f"scribeone-{_user()}"
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        directory = os.path.join(runtime, "scribeone")
+    else:
+        directory = os.path.join(tempfile.gettempdir(), f"scribeone-{_user()}")
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        st = os.stat(directory)
+    except OSError:
+        return None
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        return None
+    return os.path.join(directory, "instance.sock")
+
+
+def split_location(arg: str) -> tuple[str, int, int]:
+    """``file:line[:col]`` -> ``(file, line, col)``; 0 means not given.
+
+    An existing file whose name merely looks like a location wins.
+    """
+    m = _LOCATION.match(arg)
+    if not m or not m.group(1) or os.path.exists(arg):
+        return arg, 0, 0
+    return m.group(1), int(m.group(2)), int(m.group(3) or 0)
+
+
+def encode_request(argv: list[str], cwd: str | None = None) -> bytes:
+    payload = {"v": PROTOCOL_VERSION, "cwd": cwd or os.getcwd(), "argv": argv}
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def decode_request(data: bytes) -> tuple[str, list[str]]:
+    """Inverse of :func:`encode_request`; raises ValueError on bad input."""
+    payload = json.loads(data.decode("utf-8"))
+    if not isinstance(payload, dict) or payload.get("v") != PROTOCOL_VERSION:
+        raise ValueError("unsupported request")
+    argv = payload.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+        raise ValueError("malformed argv")
+    return str(payload.get("cwd") or ""), argv
+
+
+def forward_to_running(argv: list[str]) -> bool:
+    """Hand ``argv`` to a running instance; True if it accepted the request.
+
+    Any failure (no server, a stale socket left by a crash, a timeout) returns
+    False and the caller launches normally.
+    """
+    name = server_name()
+    if name is None:
+        return False
+    request = encode_request(argv)
+    try:
+        if sys.platform == "win32":
+            return _forward_pipe(rf"\\.\pipe\{name}", request)
+        return _forward_unix(name, request)
+    except (OSError, ValueError):
+        return False
+
+
+def _forward_unix(path: str, request: bytes) -> bool:
+    if not os.path.exists(path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT_S)
+        sock.connect(path)  # ConnectionRefusedError on a stale socket file
+        sock.settimeout(REPLY_TIMEOUT_S)
+        sock.sendall(request)
+        return sock.makefile("rb").readline().strip() == b"ok"
+
+
+def _forward_pipe(path: str, request: bytes) -> bool:
+    # Named pipes have no connect timeout; a missing server fails immediately
+    with open(path, "r+b", buffering=0) as pipe:
+        pipe.write(request)
+        return pipe.readline().strip() == b"ok"
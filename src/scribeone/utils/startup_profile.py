@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.util import resolve_name
+from itertools import islice
+from typing import Iterator, TextIO
+
+
+class StartupProfile:
+    """Per-phase wall times plus the cost of every module imported meanwhile.
+
+    Imports are timed by wrapping ``builtins.__import__``: each statement
+    that actually loads a new module is charged its cumulative time, and
+    its *self* time excludes the nested imports it triggered. Imports that
+    hit ``sys.modules`` are ignored, so the numbers describe cold loads.
+    """
+
+    def __init__(self) -> None:
+        self.t0 = time.perf_counter()
+        self.phases: list[tuple[str, float, float]] = []  # name, start, end
+        self.imports: dict[str, tuple[float, float]] = {}  # module -> (self, cumulative)
+        self._stack: list[float] = []  # child time accumulated per open import
+        self._thread = threading.get_ident()
+        self._orig_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start, time.perf_counter()))
+
+    def mark(self, name: str) -> None:
+        """Record an instant (e.g. first paint) on the same timeline."""
+        now = time.perf_counter()
+        self.phases.append((name, now, now))
+
+    def stop(self) -> None:
+        if builtins.__import__ is self._timed_import:
+            builtins.__import__ = self._orig_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if threading.get_ident() != self._thread:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        before = len(sys.modules)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += total
+            if len(sys.modules) > before:
+                # sys.modules keeps insertion order: the tail is what got loaded
+                loaded = set(islice(sys.modules, before, None))
+                label = self._label(name, globals, fromlist, level, loaded)
+                if label not in self.imports:
+                    self.imports[label] = (total - children, total)
+
+    @staticmethod
+    def _label(name, globals, fromlist, level, loaded: set[str]) -> str:
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            name = resolve_name("." * level + name, package) if package else name
+        for attr in fromlist or ():
+            if f"{name}.{attr}" in loaded:
+                return f"{name}.{attr}"
+        return name
+
+    def report(self, out: TextIO | None = None, top: int = 20) -> None:
+        out = out or sys.stderr
+        self.stop()
+        print("startup profile (ms since main() was entered):", file=out)
+        for name, start, end in self.phases:
+            at = (start - self.t0) * 1000
+            if end == start:
+                print(f"  {at:8.1f}  * {name}", file=out)
+            else:
+                print(f"  {at:8.1f}  {name:<28} {(end - start) * 1000:8.1f} ms", file=out)
+        if not self.imports:
+            return
+        by_package: dict[str, float] = {}
+        for module, (own, _) in self.imports.items():
+            root = module.split(".")[0]
+            by_package[root] = by_package.get(root, 0.0) + own
+        print("import cost by package (self ms):", file=out)
+        for root, own in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+            print(f"  {own * 1000:8.1f}  {root}", file=out)
+        print(f"slowest imports (self / cumulative ms, top {top}):", file=out)
+        ranked = sorted(self.imports.items(), key=lambda kv: -kv[1][0])[:top]
+        for module, (own, total) in ranked:
+            print(f"  {own * 1000:8.1f} {total * 1000:8.1f}  {module}", file=out)
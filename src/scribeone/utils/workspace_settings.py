@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+from ..core.workspace_search import split_patterns
+from .settings import EXPLORER_NAME_FILTERS, WORKSPACE_ROOT, settings
+
+
+def workspace_root() -> str:
+    """The folder the explorer shows; the home directory until one is chosen."""
+    root = settings().get(WORKSPACE_ROOT)
+    if root and os.path.isdir(root):
+        return root
+    return str(Path.home())
+
+
+def workspace_root_chosen() -> bool:
+    """Whether the user picked a workspace folder (not just the home fallback)."""
+    root = settings().get(WORKSPACE_ROOT)
+    return bool(root) and os.path.isdir(root)
+
+
+def set_workspace_root(path: str) -> None:
+    settings().set(WORKSPACE_ROOT, os.path.abspath(path))
+
+
+def explorer_name_filters() -> tuple[str, ...]:
+    """Globs for the files the explorer lists (empty: every file)."""
+    return split_patterns(settings().get(EXPLORER_NAME_FILTERS))
+
+
+def set_explorer_name_filters(patterns: Iterable[str]) -> None:
+    settings().set(EXPLORER_NAME_FILTERS, "; ".join(patterns))
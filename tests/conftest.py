@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Run Qt headless and keep QSettings/app data out of the real home directory
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+_sandbox = tempfile.mkdtemp(prefix="scribeone-tests-")
+os.environ["XDG_CONFIG_HOME"] = os.path.join(_sandbox, "config")
+os.environ["XDG_DATA_HOME"] = os.path.join(_sandbox, "data")
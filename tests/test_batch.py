@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+
+from scribeone import batch
+
+GBK_TEXT = "这是一个用于测试编码检测的中文句子，包含一些标点符号。\r\n" * 2000
+
+
+def _tree(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "gbk.txt").write_bytes(GBK_TEXT.encode("gbk"))
+    (tmp_path / "sub" / "mixed.txt").write_bytes(b"a\r\nb\nc\r\n")
+    (tmp_path / "sub" / "clean.txt").write_bytes(b"already\nfine\n")
+    (tmp_path / "sub" / "blob.txt").write_bytes(b"\x00\x01binary")
+    (tmp_path / "notes.md").write_bytes(b"not included\r\n")
+
+
+def test_batch_converts_tree_and_reports(tmp_path, capsys):
+    _tree(tmp_path)
+    report = tmp_path / "report.json"
+    before = {p: p.read_bytes() for p in tmp_path.rglob("*.*")}
+
+    assert batch.main([str(tmp_path), "--newline", "lf", "--dry-run", "-j", "1", "--report", str(report)]) == 0
+    assert {p: p.read_bytes() for p in tmp_path.rglob("*.*") if p != report} == before
+    data = json.loads(report.read_text(encoding="utf-8"))
+    status = {os.path.basename(f["path"]): f["status"] for f in data["files"]}
+    assert status == {"gbk.txt": "would-convert", "mixed.txt": "would-convert", "clean.txt": "unchanged", "blob.txt": "skipped"}
+    assert data["dry_run"] and data["summary"]["would-convert"] == 2
+    capsys.readouterr()
+
+    assert batch.main([str(tmp_path), "--newline", "lf", "-j", "2", "--report", "-"]) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["summary"] == {"converted": 2, "unchanged": 1, "skipped": 1}
+    assert (tmp_path / "gbk.txt").read_text(encoding="utf-8") == GBK_TEXT.replace("\r\n", "\n")
+    assert (tmp_path / "sub" / "mixed.txt").read_bytes() == b"a\nb\nc\n"
+    assert (tmp_path / "notes.md").read_bytes() == b"not included\r\n"
+
+
+def test_batch_skips_uncertain_encodings_unless_told(tmp_path):
+    p = tmp_path / "short.txt"
+    p.write_bytes("你好\r\n".encode("gbk"))  # as good big5, cp949 or gb18030
+
+    result = batch.convert_file(str(p), batch.Options(newline="\n"))
+    assert result.status == "skipped" and "uncertain" in result.reason
+    assert result.confidence < 0.8 and p.read_bytes() == "你好\r\n".encode("gbk")
+
+    forced = batch.convert_file(str(p), batch.Options(newline="\n", force=True))
+    assert forced.status == "converted" and forced.encoding == result.encoding
+    assert p.read_bytes() == "你好\r\n".encode("gbk").decode(result.encoding).replace("\r\n", "\n").encode()
+
+    p.write_bytes("你好\r\n".encode("gbk"))
+    named = batch.convert_file(str(p), batch.Options(source="gbk", newline="\n"))
+    assert named.status == "converted" and p.read_text(encoding="utf-8") == "你好\n"
+
+
+def test_batch_command_does_not_import_qt(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"x\r\n")
+    code = (
+        "import sys\n"
+        "from scribeone import main\n"
+        f"sys.argv = ['scribeone', 'batch', {str(tmp_path)!r}, '--dry-run']\n"
+        "assert main.main() == 0\n"
+        "assert 'PyQt6' not in sys.modules, 'PyQt6 was imported'\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert "1 unchanged" in out.stdout
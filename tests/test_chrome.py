@@ -0,0 +1,48 @@
+import random
+
+from scribeone.core.text_stats import TextStats
+from scribeone.ui.chrome_scheduler import ChromeScheduler
+
+
+def _recount(text: str) -> tuple[int, int, int]:
+    return len(text), text.count("\n") + 1, len(text.split())
+
+
+def test_text_stats_follow_random_edits():
+    rng = random.Random(7)
+    alphabet = "ab \n\t."
+    text = "hello world\nfoo bar"
+    stats = TextStats(text)
+    for _ in range(2000):
+        pos = rng.randint(0, len(text))
+        end = min(len(text), pos + rng.randint(0, 4))
+        added = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+        before = text[pos - 1:pos] if pos else ""
+        stats.apply_edit(before, text[pos:end], added, text[end:end + 1])
+        text = text[:pos] + added + text[end:]
+        assert (stats.chars, stats.lines, stats.words) == _recount(text)
+
+
+def test_text_stats_append_chunks():
+    chunks = ["one tw", "o three", "\n", " four"]
+    stats = TextStats()
+    text = ""
+    for chunk in chunks:
+        stats.apply_edit(text[-1:], "", chunk, "")
+        text += chunk
+    assert (stats.chars, stats.lines, stats.words) == _recount(text)
+
+
+def test_scheduler_coalesces_to_one_update_per_frame(qtbot):
+    calls = []
+    chrome = ChromeScheduler()
+    chrome.add("title", lambda: calls.append("title"))
+    chrome.add("cursor", lambda: calls.append("cursor"))
+    chrome.flush()
+    calls.clear()
+    for _ in range(1000):
+        chrome.invalidate("cursor")
+    assert calls == []
+    qtbot.waitUntil(lambda: bool(calls), timeout=1000)
+    qtbot.wait(50)
+    assert calls == ["cursor"]
@@ -0,0 +1,147 @@
+import random
+
+from scribeone.core.document import Document
+from scribeone.core.piece_table import PieceTable, utf16_len
+
+
+def _random_text(rng: random.Random, n: int) -> str:
+    alphabet = "ab c\n中文😀"
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def test_piece_table_matches_string_model():
+    rng = random.Random(7)
+    model = _random_text(rng, 200)
+    table = PieceTable(model)
+    for _ in range(500):
+        # Pick code point boundaries, then address them in UTF-16 units as Qt does
+        at = rng.randint(0, len(model))
+        count = rng.randint(0, min(5, len(model) - at))
+        removed = model[at:at + count]
+        added = _random_text(rng, rng.randint(0, 4))
+        pos = utf16_len(model[:at])
+        assert table.replace(pos, utf16_len(removed), added) == removed
+        model = model[:at] + added + model[at + count:]
+        assert len(table) == utf16_len(model)
+    assert table.text() == model
+    assert "".join(table.iter_chunks(max_chars=3)) == model
+
+
+def test_piece_table_coalesces_typing():
+    table = PieceTable("hello world")
+    for i, ch in enumerate("abc"):
+        table.insert(5 + i, ch)
+    assert table.text() == "helloabc world"
+    assert table.piece_count() == 3
+
+
+def test_document_dirty_tracks_revisions():
+    doc = Document(text="abc")
+    assert not doc.is_dirty
+    doc.apply_edit(1, 1, "X")
+    assert doc.text == "aXc"
+    assert doc.is_dirty
+    revision = doc.revision
+    doc.apply_edit(0, 0, "!")
+    doc.mark_saved(revision)
+    assert doc.is_dirty
+    doc.mark_saved()
+    assert not doc.is_dirty
+
+
+def test_save_writes_back_line_breaks_and_bom(tmp_path):
+    import codecs
+
+    from scribeone.core.fileio import detect_encoding
+
+    cases = {
+        "crlf-bom.txt": codecs.BOM_UTF8 + "a\r\n中文\r\n".encode("utf-8"),
+        "cr.txt": b"a\rb\rno end",
+        "utf16be.txt": codecs.BOM_UTF16_BE + "x\r\ny\r\n".encode("utf-16-be"),
+        "plain.txt": b"one\ntwo\n",
+    }
+    for name, data in cases.items():
+        p = tmp_path / name
+        p.write_bytes(data)
+        doc = Document()
+        doc.load_from_path(str(p), detect_encoding(str(p)).encoding)
+        assert "\r" not in doc.text and not doc.text.startswith("\ufeff")
+        assert not doc.mixed_newlines
+        doc.save_to_path()
+        assert p.read_bytes() == data, name
+
+    # Mixed: the most used style wins, whichever comes first
+    mixed = tmp_path / "mixed.txt"
+    mixed.write_bytes(b"a\nb\r\nc\r\nd\r\n")
+    doc = Document()
+    doc.load_from_path(str(mixed))
+    assert doc.mixed_newlines and doc.newline == "\r\n"
+    doc.save_to_path()
+    assert mixed.read_bytes() == b"a\r\nb\r\nc\r\nd\r\n"
+
+    doc = Document()
+    doc.load_from_path(str(p))
+    doc.newline = "\r\n"  # an explicit choice wins over what was found
+    doc.save_to_path()
+    assert p.read_bytes() == b"one\r\ntwo\r\n"
+
+
+def test_editor_edits_stay_in_sync(qtbot):
+    from PyQt6.QtGui import QTextCursor
+    from scribeone.ui.main_window import MainWindow
+
+    win = MainWindow()
+    qtbot.addWidget(win)
+    win._set_editor_text("line one\nline 😀 two\n")
+    win.doc = Document(text="line one\nline 😀 two\n")
+    cur = win.editor.textCursor()
+    cur.setPosition(5)
+    cur.insertText("X\nY")
+    cur.setPosition(0)
+    cur.setPosition(3, QTextCursor.MoveMode.KeepAnchor)
+    cur.removeSelectedText()
+    win.editor.undo()
+    win.editor.selectAll()
+    win.editor.textCursor().insertText("fresh")
+    win.editor.undo()
+    assert win.doc.text == win.editor.toPlainText()
+    assert win.doc.is_dirty
+    win.doc.mark_saved()  # skip the unsaved-close prompt on teardown
+
+
+def test_compressed_file_opens_streamed_and_saves_compressed(qtbot, tmp_path):
+    import gzip
+
+    from scribeone.ui.main_window import MainWindow
+
+    p = tmp_path / "app.log.gz"
+    p.write_bytes(gzip.compress(b"first\nsecond\n"))
+    win = MainWindow()
+    qtbot.addWidget(win)
+    with qtbot.waitSignal(win.documentLoaded, timeout=5000):
+        win.open_location(str(p))
+    assert win.doc.text == "first\nsecond\n" and win.doc.compression == "gzip"
+    win.editor.insertPlainText("zero\n")
+    assert win._ensure_saved(wait=True)
+    data = gzip.decompress(p.read_bytes())
+    assert data == win.doc.text.encode() and b"zero\n" in data
+
+
+def test_ambiguous_encoding_asks_before_opening(qtbot, tmp_path, monkeypatch):
+    from scribeone.ui import encoding_prompt
+    from scribeone.ui.main_window import MainWindow
+
+    p = tmp_path / "short.txt"
+    p.write_bytes("你好".encode("gbk"))  # as good big5, cp949 or gb18030
+    asked = []
+
+    def choose(parent, path, error=None, suggested=None):
+        asked.append(suggested)
+        return "gbk"
+
+    monkeypatch.setattr(encoding_prompt, "choose_encoding", choose)
+    win = MainWindow()
+    qtbot.addWidget(win)
+    win.open_location(str(p))
+    assert len(asked) == 1
+    assert win.doc.text == "你好" and win.doc.encoding == "gbk"
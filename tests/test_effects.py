@@ -0,0 +1,38 @@
+from scribeone.ui.effects import low_performance_environment, reduced_effects
+from scribeone.ui.main_window import MainWindow
+from scribeone.utils.settings import REDUCED_EFFECTS, settings
+
+
+def test_detects_software_and_remote_sessions():
+    assert not low_performance_environment("xcb", {"DISPLAY": ":0"})
+    assert not low_performance_environment("wayland", {})
+    assert low_performance_environment("offscreen", {})
+    assert low_performance_environment("xcb", {"DISPLAY": "localhost:10.0"})
+    assert low_performance_environment("xcb", {"DISPLAY": ":0", "LIBGL_ALWAYS_SOFTWARE": "1"})
+    assert low_performance_environment("windows", {"SESSIONNAME": "RDP-Tcp#3"})
+
+
+def test_edge_hover_has_hysteresis_and_spares_a_pinned_sidebar(qtbot):
+    settings().set(REDUCED_EFFECTS, "on")
+    try:
+        assert reduced_effects()
+        win = MainWindow()
+        qtbot.addWidget(win)
+        win.resize(900, 600)
+        win._finish_startup()
+        win.act_toggle_sidebar.setChecked(False)
+        assert win.sidebar.isHidden()  # no animation: hidden at once
+
+        win._edge_hover(3)
+        assert not win.sidebar.isHidden()
+        win._edge_hover(win._sidebar_target_width + 10)  # inside the margin
+        assert win.act_toggle_sidebar.isChecked()
+        win._edge_hover(win._sidebar_target_width + 60)
+        assert not win.act_toggle_sidebar.isChecked()
+
+        win.act_toggle_sidebar.setChecked(True)  # opened by hand
+        win._edge_hover(win._sidebar_target_width + 60)
+        assert win.act_toggle_sidebar.isChecked()
+        assert win.sidebar.graphicsEffect() is None
+    finally:
+        settings().set(REDUCED_EFFECTS, "auto")
@@ -0,0 +1,54 @@
+from PyQt6.QtCore import QModelIndex
+
+from scribeone.ui.explorer_model import ExplorerModel
+
+
+def _names(model, parent=QModelIndex()):
+    return [model.index(r, 0, parent).data() for r in range(model.rowCount(parent))]
+
+
+def test_directories_are_listed_only_when_expanded(qtbot, tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "inner.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "a.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "b.md").write_text("x", encoding="utf-8")
+    model = ExplorerModel()
+    try:
+        model.set_name_filters(("*.txt",))
+        model.set_root(str(tmp_path))
+        qtbot.waitUntil(lambda: model.rowCount() == 2)
+        assert _names(model) == ["sub", "a.txt"]
+        sub = model.index(0, 0)
+        assert model.hasChildren(sub) and model.rowCount(sub) == 0
+        assert model.canFetchMore(sub)
+        model.fetchMore(sub)
+        qtbot.waitUntil(lambda: model.rowCount(sub) == 1)
+        assert model.filePath(model.index(0, 0, sub)) == str(tmp_path / "sub" / "inner.txt")
+    finally:
+        model.shutdown()
+
+
+def test_filters_and_refreshes_keep_expanded_rows(qtbot, tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "inner.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "b.md").write_text("x", encoding="utf-8")
+    model = ExplorerModel()
+    try:
+        model.set_name_filters(("*.txt",))
+        model.set_root(str(tmp_path))
+        qtbot.waitUntil(lambda: model.rowCount() == 1)
+        model.fetchMore(model.index(0, 0))
+        qtbot.waitUntil(lambda: model.rowCount(model.index(0, 0)) == 1)
+        resets = []
+        model.modelReset.connect(lambda: resets.append(1))
+
+        model.set_name_filters(("*.md", "*.txt"))  # from the cached listing
+        assert _names(model) == ["sub", "b.md"]
+        (tmp_path / "c.txt").write_text("x", encoding="utf-8")
+        model.refresh(str(tmp_path))
+        qtbot.waitUntil(lambda: model.rowCount() == 3)
+        assert _names(model) == ["sub", "b.md", "c.txt"]
+        assert model.rowCount(model.index(0, 0)) == 1  # still expanded
+        assert not resets
+    finally:
+        model.shutdown()
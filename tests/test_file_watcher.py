@@ -0,0 +1,45 @@
+from scribeone.core.file_diff import diff_lines
+from scribeone.ui.main_window import MainWindow
+
+
+def _apply(text, hunks):
+    for h in reversed(hunks):
+        text = text[:h.position] + h.text + text[h.position + h.removed:]
+    return text
+
+
+def test_diff_lines_covers_only_changed_regions():
+    old = "".join(f"line {i}\n" for i in range(100))
+    new = "top\n" + old.replace("line 80\n", "line 80 changed\n") + "tail"
+    hunks = diff_lines(old, new)
+    assert [(h.old_line, h.line_delta) for h in hunks] == [(0, 1), (80, 0), (100, 0)]
+    assert _apply(old, hunks) == new
+    assert _apply("a\nb", diff_lines("a\nb", "")) == ""
+    assert diff_lines("é\U0001F600\n", "é\U0001F600\nx")[0].position == 4  # UTF-16 units
+
+
+def test_external_change_is_applied_in_place(qtbot, tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_text("".join(f"line {i}\n" for i in range(200)), encoding="utf-8")
+    win = MainWindow()
+    qtbot.addWidget(win)
+    win.open_location(str(f), 150, 3)
+    win.editor.insertPlainText("x")
+    win._ensure_saved(wait=True)
+    win._file_watcher.check()  # our own save is not a change
+    assert win._file_watcher._check is None
+
+    text = f.read_text(encoding="utf-8")
+    f.write_text("new 1\nnew 2\n" + text.replace("line 180\n", "changed\n"), encoding="utf-8")
+    win._file_watcher.check()
+    qtbot.waitUntil(lambda: "changed" in win.doc.text, timeout=3000)
+    assert win.doc.text == f.read_text(encoding="utf-8")
+    assert win.editor.toPlainText() == win.doc.text
+    assert not win.doc.is_dirty
+    cur = win.editor.textCursor()
+    assert (cur.blockNumber(), cur.positionInBlock()) == (151, 3)  # moved with its line
+    win.editor.undo()  # the reload is one step; the typing before it is still there
+    assert win.editor.toPlainText() == text
+    win.editor.undo()
+    assert "line 149\nline 150\n" in win.editor.toPlainText()
+    win.doc.mark_saved()
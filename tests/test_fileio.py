@@ -6,3 +6,99 @@ def test_placeholder_fileio_tmp(tmp_path: Path):
     p = tmp_path / "a.txt"
     write_text(str(p), "hello")
     assert read_text(str(p)) == "hello"
+
+
+def test_iter_decoded_chunks_handles_split_boundaries(tmp_path: Path):
+    from scribeone.core.fileio import iter_decoded_chunks
+
+    p = tmp_path / "b.txt"
+    text = "中文\r\nline\rend\r\n" * 50
+    p.write_bytes(text.encode("gbk"))
+    chunks = list(iter_decoded_chunks(str(p), "gbk", chunk_size=7))
+    assert "".join(c for c, _ in chunks) == text.replace("\r\n", "\n").replace("\r", "\n")
+    assert chunks[-1][1] == p.stat().st_size
+
+
+def test_detect_encoding_bom_utf8_and_gbk(tmp_path: Path):
+    from scribeone.core import fileio
+
+    bom = tmp_path / "bom.txt"
+    bom.write_bytes(b"\xef\xbb\xbfhello")
+    assert fileio.detect_encoding(str(bom)) == fileio.EncodingGuess("utf-8-sig", 1.0, bom=True)
+
+    utf8 = tmp_path / "utf8.txt"
+    utf8.write_text("中文内容\n" * 40000, encoding="utf-8")
+    assert fileio.detect_encoding(str(utf8)).encoding == "utf-8"
+
+    gbk = tmp_path / "gbk.txt"
+    gbk.write_bytes(("这是一个用于测试编码检测的中文句子，包含一些标点符号。\n" * 5000).encode("gbk"))
+    guess = fileio.detect_encoding(str(gbk))
+    assert guess.confident
+    assert fileio.read_text(str(gbk), guess.encoding).startswith("这是一个")
+    assert (str(gbk.resolve()), gbk.stat().st_mtime_ns, gbk.stat().st_size) in fileio._detect_cache
+
+    # Too few bytes to tell GBK from Big5, or several encodings mixed: ask
+    short = tmp_path / "short.txt"
+    short.write_bytes("你好".encode("gbk"))
+    assert not fileio.detect_encoding(str(short)).confident
+    mixed = tmp_path / "mixed.txt"
+    mixed.write_bytes(b"hello world " * 20 + "中文".encode("gbk") + "日本語".encode("shift_jis") + b"\xff\xfe\x80")
+    assert not fileio.detect_encoding(str(mixed)).confident
+
+
+def test_write_chunks_is_atomic_and_streams(tmp_path: Path):
+    import pytest
+    from scribeone.core.fileio import write_chunks
+
+    p = tmp_path / "c.txt"
+    p.write_bytes(b"original")
+    p.chmod(0o640)
+    assert write_chunks(str(p), ["a\r", "\nb\rc", "\n"], durability="full") == 6
+    assert p.read_bytes() == b"a\nb\nc\n"
+    assert p.stat().st_mode & 0o777 == 0o640
+
+    with pytest.raises(UnicodeEncodeError):
+        write_chunks(str(p), ["ok", "😀"], encoding="gbk")
+    assert p.read_bytes() == b"a\nb\nc\n"
+    assert sorted(x.name for x in tmp_path.iterdir()) == ["c.txt"]
+
+
+def test_compressed_files_stream_in_and_out_in_their_format(tmp_path: Path):
+    import bz2
+    import gzip
+    import lzma
+
+    from scribeone.core import fileio
+
+    text = "压缩\r\nline\n" * 20000
+    for kind, module in (("gzip", gzip), ("bz2", bz2), ("xz", lzma)):
+        p = tmp_path / f"log.{kind}"
+        p.write_bytes(module.compress(text.encode("utf-8")))
+        assert fileio.detect_compression(str(p)) == kind
+        assert fileio.detect_encoding(str(p)).encoding == "utf-8"
+        assert fileio.detect_newline(str(p), "utf-8") == "\r\n"
+        chunks = list(fileio.iter_decoded_chunks(str(p), "utf-8", chunk_size=4096))
+        assert "".join(c for c, _ in chunks) == text.replace("\r\n", "\n")
+        assert chunks[-1][1] == p.stat().st_size  # progress counts compressed bytes
+        assert fileio.read_text(str(p)) == text.replace("\r\n", "\n")
+
+        fileio.write_chunks(str(p), ["new\n", "text\n"], compression=kind, level=1)
+        assert module.decompress(p.read_bytes()) == b"new\ntext\n"
+    assert fileio.compression_for_name("a/b.TXT.GZ") == "gzip" and fileio.compression_for_name("a.txt") is None
+
+
+def test_detect_cache_keeps_only_recent_guesses(tmp_path: Path, monkeypatch):
+    from scribeone.core import fileio
+
+    monkeypatch.setattr(fileio, "_DETECT_CACHE_SIZE", 2)
+    monkeypatch.setattr(fileio, "_detect_cache", type(fileio._detect_cache)())
+    paths = []
+    for name in ("a", "b", "c"):
+        p = tmp_path / f"{name}.txt"
+        p.write_text(name, encoding="utf-8")
+        paths.append(str(p.resolve()))
+    fileio.detect_encoding(paths[0])
+    fileio.detect_encoding(paths[1])
+    fileio.detect_encoding(paths[0])  # used again: b is now the oldest
+    fileio.detect_encoding(paths[2])
+    assert [key[0] for key in fileio._detect_cache] == [paths[0], paths[2]]
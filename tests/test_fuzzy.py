@@ -0,0 +1,55 @@
+import os
+
+from scribeone.core.fuzzy import FuzzyIndex, fuzzy_score
+from scribeone.ui.quick_open import QuickOpen
+from scribeone.utils.recent_files import clear_recent
+
+
+def _index(keys):
+    index = FuzzyIndex()
+    index.extend((k, "/w/" + k) for k in keys)
+    return index
+
+
+def test_score_prefers_word_starts_and_runs():
+    assert fuzzy_score("abc", "xaxbxc") is not None
+    assert fuzzy_score("abd", "abc") is None
+    assert fuzzy_score("ml", "main_log.txt") > fuzzy_score("ml", "small.txt")
+    assert fuzzy_score("main", "main.txt") > fuzzy_score("main", "m_a_i_n.txt")
+
+
+def test_search_ranks_file_names_and_boosts():
+    index = _index(["main/notes.txt", "docs/main.txt", "m/a/i/n/x.txt", "other.txt"])
+    assert index.search("main", limit=2) == ["/w/docs/main.txt", "/w/main/notes.txt"]
+    assert index.search("main", boost={"/w/m/a/i/n/x.txt": 100})[0] == "/w/m/a/i/n/x.txt"
+    assert index.search("  ") == []
+    assert index.search("zzz") == []
+
+
+def test_narrowing_while_typing_matches_a_fresh_search():
+    keys = [f"dir{i % 7}/file_{i}.txt" for i in range(3000)]
+    index = _index(keys)
+    for q in ("f", "fi", "fil", "file_1", "file_12"):
+        index.search(q)
+    assert index.search("file_12", limit=20) == _index(keys).search("file_12", limit=20)
+    index.extend([("late/file_12.txt", "/w/late/file_12.txt")])
+    assert "/w/late/file_12.txt" in index.search("file_12", limit=100)
+
+
+def test_palette_lists_scanned_files(qtbot, tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "report.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "readme.txt").write_text("x", encoding="utf-8")
+    clear_recent()  # files opened by other tests would be listed too
+    palette = QuickOpen()
+    qtbot.addWidget(palette)
+    chosen = []
+    palette.fileChosen.connect(chosen.append)
+    palette.popup(str(tmp_path), ("*.txt",), ())
+    qtbot.waitUntil(lambda: len(palette.index) == 2)
+    palette.edit.setText("rep")
+    qtbot.waitUntil(lambda: palette.results.count() == 1)
+    assert palette.results.item(0).text() == "sub/report.txt"
+    palette._choose()
+    assert chosen == [os.path.join(str(tmp_path), "sub", "report.txt")]
+    palette.stop()
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+from scribeone.core.document import Document
+from scribeone.core.journal import EditJournal, delete_journal, journal_in_use, list_journals, recover
+
+
+def _edit(doc: Document, journal: EditJournal, pos: int, removed: int, text: str) -> None:
+    doc.apply_edit(pos, removed, text)
+    journal.record(pos, removed, text)
+
+
+def test_journal_replays_edits_and_checkpoints(tmp_path: Path):
+    src = tmp_path / "a.txt"
+    src.write_text("hello world\n" * 100, encoding="utf-8")
+    doc = Document()
+    doc.load_from_path(str(src))
+    journal = EditJournal(tmp_path / "j", str(src), "utf-8", doc.buffer.snapshot())
+
+    _edit(doc, journal, 6, 5, "there")
+    _edit(doc, journal, 0, 0, "😀 ")
+    journal.flush()
+    journal.close()
+    (file,) = list_journals(tmp_path / "j")
+    assert recover(file).text == doc.text
+
+    rec = recover(file)
+    journal = EditJournal.adopt(tmp_path / "j", rec, rec.base, rec.pieces)
+    _edit(doc, journal, len(doc) - 1, 1, "!")
+    journal.flush()
+    journal.close()
+    # The checkpoint stores base ranges, not a copy of the file
+    assert file.stat().st_size < src.stat().st_size
+    rec = recover(file)
+    assert rec.text == doc.text
+    assert not rec.base_changed
+
+
+def test_journal_ignores_torn_tail(tmp_path: Path):
+    journal = EditJournal(tmp_path, None, "utf-8", ())
+    journal.record(0, 0, "abc")
+    journal.flush()
+    journal.close()
+    with open(journal.file, "a", encoding="utf-8") as fh:
+        fh.write('{"p": 0, "r"')
+    assert recover(journal.file).text == "abc"
+
+
+def test_journal_is_locked_while_in_use(tmp_path: Path):
+    import os
+    import subprocess
+    import sys
+
+    journal = EditJournal(tmp_path, None, "utf-8", ())
+    journal.record(0, 0, "abc")
+    journal.flush()
+    journal.spill((("abc", 0, 3, 3),))
+    assert journal_in_use(journal.file)  # hibernated, not left behind
+    delete_journal(journal.file)
+    assert list(tmp_path.iterdir()) == []
+
+    # Another process writing a journal: locked until it exits
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from scribeone.core.journal import EditJournal\n"
+        "j = EditJournal(Path(sys.argv[1]), None, 'utf-8', ())\n"
+        "j.record(0, 0, 'x')\n"
+        "j.flush().result()\n"
+        "print(j.file, flush=True)\n"
+        "sys.stdin.readline()\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    child = subprocess.Popen(
+        [sys.executable, "-c", code, str(tmp_path)], env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        other = Path(child.stdout.readline().strip())
+        assert list_journals(tmp_path) == [other] and journal_in_use(other)
+    finally:
+        child.communicate("\n", timeout=30)
+    assert not journal_in_use(other)
+
+
+def test_every_stale_journal_is_offered(qtbot, tmp_path: Path, monkeypatch):
+    import os
+
+    from PyQt6.QtWidgets import QMessageBox
+
+    from scribeone.core import journal as journal_module
+    from scribeone.ui.main_window import MainWindow
+
+    for text in ("one", "two"):
+        journal = EditJournal(tmp_path, None, "utf-8", ())
+        journal.spill(((text, 0, 3, 3),))
+        os.close(journal_module._held.pop(journal.file))  # as if its process had died
+    live = EditJournal(tmp_path, None, "utf-8", ())
+    live.record(0, 0, "live")
+    live.flush().result()
+
+    asked = []
+    monkeypatch.setattr(QMessageBox, "question", lambda *args: asked.append(args) or QMessageBox.StandardButton.Yes)
+    win = MainWindow()
+    qtbot.addWidget(win)
+    win._journal_dir = tmp_path
+    win._offer_recovery()
+    assert len(asked) == 2
+    assert sorted(t.doc.text for t in win._all_tabs() if t.doc is not None and t.doc.is_dirty) == ["one", "two"]
+    assert live.file.exists()
+    for tab in win._all_tabs():
+        if tab.doc is not None:
+            tab.doc.mark_saved()  # skip the unsaved-close prompt on teardown
+    live.discard()
+    live.close()
@@ -0,0 +1,86 @@
+from scribeone.core.line_index import LineIndex
+from scribeone.core.search import SearchQuery
+
+
+def test_line_index_lookups_match_splitlines():
+    lines = [f"{i} " + "x" * (i % 37) for i in range(2000)]
+    data = ("\r\n".join(lines)).encode("utf-8")
+    index = LineIndex(data, block_size=256)
+    assert index.build()
+    assert index.line_count == len(lines)
+    for n in (0, 1, 255, 1000, 1999):
+        raw, truncated = index.line_bytes(n)
+        assert raw.decode() == lines[n] and not truncated
+        assert index.line_of(index.line_start(n)) == n
+
+
+def test_line_index_truncates_long_lines():
+    index = LineIndex(b"a" * 100 + b"\nb", block_size=16)
+    index.build()
+    assert index.line_count == 2
+    assert index.line_bytes(0, limit=10) == (b"a" * 10, True)
+    assert index.line_bytes(1) == (b"b", False)
+
+
+class _Sliced(bytes):
+    """Bytes that remember the longest slice taken from them."""
+
+    longest = 0
+
+    def __getitem__(self, key):
+        part = super().__getitem__(key)
+        if isinstance(key, slice):
+            _Sliced.longest = max(_Sliced.longest, len(part))
+        return part
+
+
+def test_line_of_before_indexing_reads_one_block_at_a_time():
+    data = _Sliced(b"x" * 5000 + b"\n" + b"y" * 5000 + b"\nz")
+    index = LineIndex(data, block_size=256)
+    assert not index.complete
+    assert index.line_of(len(data) - 1) == 2
+    assert index.line_of(5000) == 0 and index.line_of(5001) == 1
+    assert _Sliced.longest <= 256
+
+
+def test_find_on_a_line_longer_than_shown_stays_bounded(qtbot, tmp_path):
+    from scribeone.core.line_index import MAX_LINE_BYTES
+    from scribeone.ui.huge_viewer import HugeFileView
+
+    p = tmp_path / "one-line.log"
+    p.write_bytes(b"a" * (3 * MAX_LINE_BYTES) + b"needle" + b"b" * 100 + b"needle")
+    view = HugeFileView()
+    qtbot.addWidget(view)
+    view.open(str(p))
+    qtbot.waitUntil(lambda: view.index.complete)
+    assert _find(qtbot, view, SearchQuery("needle"))
+    assert view.cursor_position() == (0, MAX_LINE_BYTES) and view._match_offset == 3 * MAX_LINE_BYTES
+    assert _find(qtbot, view, SearchQuery("needle"))  # moves on instead of finding the same one
+    assert view._match_offset == 3 * MAX_LINE_BYTES + 106
+    assert _find(qtbot, view, SearchQuery("needle"), forward=False)
+    assert view._match_offset == 3 * MAX_LINE_BYTES
+    view.close_file()
+
+
+def _find(qtbot, view, query, forward=True):
+    with qtbot.waitSignal(view.findFinished) as blocker:
+        view.find(query, forward=forward)
+    return blocker.args[0]
+
+
+def test_huge_find_honours_options_and_character_boundaries(qtbot, tmp_path):
+    from scribeone.ui.huge_viewer import HugeFileView
+
+    p = tmp_path / "gbk.log"
+    # 中文 is d6 d0 ce c4 in GBK, so the bytes of 形 (d0 ce) appear straddling it
+    p.write_bytes("中文 Needles needle 形\n".encode("gbk"))
+    view = HugeFileView()
+    qtbot.addWidget(view)
+    view.open(str(p), "gbk")
+    qtbot.waitUntil(lambda: view.index.complete)
+    assert _find(qtbot, view, SearchQuery("形")) and view.cursor_position() == (0, 18)
+    assert _find(qtbot, view, SearchQuery("needle")) and view.cursor_position() == (0, 3)
+    assert _find(qtbot, view, SearchQuery("needle", whole_word=True)) and view.cursor_position() == (0, 11)
+    assert not _find(qtbot, view, SearchQuery("NEEDLE", case_sensitive=True))
+    assert not _find(qtbot, view, SearchQuery("ß"))  # not encodable in GBK
+    view.close_file()
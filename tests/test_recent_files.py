@@ -0,0 +1,68 @@
+import os
+
+from scribeone.core import fileio
+from scribeone.core.line_index import LineIndex
+from scribeone.ui import main_window
+from scribeone.ui.main_window import MainWindow
+from scribeone.utils.recent_files import RecentFiles, recent_files
+
+
+def test_store_keeps_metadata_per_version(tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_text("x\r\ny\r\n", encoding="utf-8")
+    store = RecentFiles(tmp_path / "store")
+    (tmp_path / "store").mkdir()
+    st = os.stat(f)
+    store.add(str(f), encoding="gbk", newline="\r\n", size=st.st_size, mtime_ns=st.st_mtime_ns)
+    store.update(str(f), line=2, column=1, scroll=0)
+    store.save_line_index(str(f), b"\0" * 8)
+
+    again = RecentFiles(tmp_path / "store")  # reads what was written
+    assert again.lookup(str(f), st).encoding == "gbk"
+    assert again.get(str(f)).line == 2
+    f.write_text("changed", encoding="utf-8")
+    assert again.lookup(str(f), os.stat(f)) is None
+    again.add(str(f), size=os.stat(f).st_size, mtime_ns=os.stat(f).st_mtime_ns)
+    assert again.line_index(str(f)) is None  # belonged to the old version
+
+
+def test_store_is_trimmed_to_its_size(tmp_path):
+    store = RecentFiles(tmp_path)
+    store.set_max_files(3)
+    for i in range(5):
+        store.add(str(tmp_path / f"{i}.txt"))
+    assert [os.path.basename(p) for p in store.paths()] == ["4.txt", "3.txt", "2.txt"]
+    store.set_max_files(20)
+
+
+def test_line_index_export_restores_without_building():
+    data = b"a\nbb\n" * 1000
+    built = LineIndex(data, block_size=64)
+    assert built.export() is None
+    built.build()
+    restored = LineIndex(data, block_size=64)
+    assert restored.restore(built.export())
+    assert restored.complete and restored.line_count == built.line_count
+    assert restored.line_start(777) == built.line_start(777)
+    assert not LineIndex(data + b"more" * 100, block_size=64).restore(built.export())
+
+
+def test_reopen_skips_detection_and_restores_the_caret(qtbot, tmp_path, monkeypatch):
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    a.write_text("".join(f"line {i}\n" for i in range(200)), encoding="utf-8")
+    b.write_text("other\n", encoding="utf-8")
+    win = MainWindow()
+    qtbot.addWidget(win)
+    win.open_location(str(a), 120, 3)
+    win.open_location(str(b))
+    assert recent_files().get(str(a)).line == 120
+    assert recent_files().get(str(a)).newline == "\n"
+
+    def no_detection(path):
+        raise AssertionError("detection should be skipped")
+
+    monkeypatch.setattr(main_window, "detect_encoding", no_detection)
+    monkeypatch.setattr(fileio, "detect_encoding", no_detection)
+    win.open_location(str(a))
+    cur = win.editor.textCursor()
+    assert (cur.blockNumber(), cur.positionInBlock()) == (119, 2)
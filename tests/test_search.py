@@ -0,0 +1,71 @@
+import random
+
+from scribeone.core.search import MatchList, SearchQuery, iter_matches, replace_all
+from scribeone.ui.main_window import MainWindow
+
+
+def _all(text, rx):
+    return [(m.start(), m.end() - m.start()) for m in rx.finditer(text) if m.end() > m.start()]
+
+
+def test_matches_are_not_split_by_chunk_boundaries():
+    text = "foo bar\nbarfoo foo\nxfoo\n" * 50
+    rx = SearchQuery("foo", whole_word=True).compile()
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    assert list(iter_matches(chunks, rx)) == _all(text, rx)
+
+
+def test_spanning_matches_survive_chunk_boundaries():
+    text = "x foo\nbar y\n" * 20 + "a" + "-" * 50 + "b\n"
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    for query in (SearchQuery("foo\nbar"), SearchQuery(r"(?s)a.*?b", regex=True)):
+        assert query.spans_lines
+        rx = query.compile()
+        assert list(iter_matches(chunks, rx, spans_lines=True)) == _all(text, rx)
+
+
+def test_match_positions_are_utf16_units():
+    rx = SearchQuery("b").compile()
+    assert list(iter_matches(["a😀", "b\n中b"], rx)) == [(3, 1), (6, 1)]
+
+
+def test_match_list_follows_edits():
+    rng = random.Random(3)
+    rx = SearchQuery("ab").compile()
+    text = "ab cab\nabab\n" * 20
+    matches = MatchList()
+    matches.extend(iter_matches([text], rx))
+    for _ in range(500):
+        pos = rng.randint(0, len(text))
+        end = min(len(text), pos + rng.randint(0, 3))
+        added = "".join(rng.choice("ab \n") for _ in range(rng.randint(0, 3)))
+        text = text[:pos] + added + text[end:]
+        # Rescan just the lines around the edit, as SearchSession does
+        start = text.rfind("\n", 0, pos) + 1
+        stop = text.find("\n", pos + len(added))
+        stop = len(text) if stop < 0 else stop
+        delta = len(added) - (end - pos)
+        matches.replace(start, stop - delta, delta, list(iter_matches([text[start:stop]], rx, start)))
+        assert [matches[i] for i in range(len(matches))] == _all(text, rx)
+
+
+def test_replace_all_returns_the_changed_span():
+    rx = SearchQuery(r"(\d+)", regex=True).compile()
+    assert replace_all("a 1 b 22 c", rx, r"<\1>", True) == (2, 8, "<1> b <22>", 2)
+    assert replace_all("none", rx, "x", True) is None
+
+
+def test_replace_all_is_one_undo_step(qtbot):
+    win = MainWindow()
+    qtbot.addWidget(win)
+    win.editor.setPlainText("cat dog cat\ncat")
+    win._find()
+    win._find_bar.find_edit.setText("cat")
+    win._find_bar._emit_query()
+    qtbot.waitUntil(lambda: win._search.complete and len(win._search.matches) == 3)
+    win._replace_all("cow")
+    assert win.editor.toPlainText() == "cow dog cow\ncow"
+    assert win.doc.text == "cow dog cow\ncow"
+    win.editor.undo()
+    assert win.doc.text == "cat dog cat\ncat"
+    win.doc.mark_saved()  # skip the unsaved-close prompt on teardown
@@ -0,0 +1,47 @@
+from scribeone.ui.main_window import MainWindow
+from scribeone.utils.session import load_session
+from scribeone.utils.settings import SESSION, settings
+
+
+def test_session_restores_tabs_lazily_with_unsaved_changes(qtbot, tmp_path):
+    paths = []
+    for name in ("a", "b", "c"):
+        p = tmp_path / f"{name}.txt"
+        p.write_text(f"{name} one\n{name} two\n", encoding="utf-8")
+        paths.append(str(p))
+    first = second = None
+    try:
+        first = MainWindow()
+        first.restore_session()  # nothing saved yet
+        for p in paths:
+            first.open_location(p)
+        first._activate_tab(first._find_tab(paths[1]))
+        first.editor.insertPlainText("unsaved ")
+        first._activate_tab(first._find_tab(paths[2]), line=2, column=3)
+        assert first.close()  # no prompt: the change is kept for the session
+
+        session = load_session()
+        assert [t.path for t in session.tabs] == paths and session.active == 2
+        assert session.tabs[1].spilled and len(session.journals()) == 1
+
+        second = MainWindow()
+        second.restore_session()
+        tabs = second._all_tabs()
+        assert [t.file_path for t in tabs] == paths
+        assert [t.resident for t in tabs] == [False, False, True]  # only the active one was read
+        assert second.editor.textCursor().blockNumber() == 1
+        assert second._tabs.tabText(1) == "b.txt ●"
+
+        second._tabs.setCurrentIndex(1)
+        assert second.doc.is_dirty and second.doc.text == "unsaved b one\nb two\n"
+        assert second.editor.toPlainText() == second.doc.text
+        second.doc.mark_saved()
+        assert second.close()
+        assert load_session().journals() == set()
+    finally:
+        for win in (first, second):
+            if win is not None:
+                win.deleteLater()
+        for journal in load_session().journals():
+            journal.unlink(missing_ok=True)
+        settings().set(SESSION, "")
@@ -0,0 +1,43 @@
+from PyQt6.QtCore import QSettings
+
+from scribeone.utils.settings import Key, Settings
+
+_WRAP = Key("test/wrap", True)
+_WIDTH = Key("test/width", 260)
+
+
+def test_writes_are_cached_and_written_behind(qtbot):
+    store = Settings(delay_ms=60_000)
+    changes = []
+    store.changed.connect(lambda name, value: changes.append((name, value)))
+    store.set(_WRAP, False)
+    store.set(_WIDTH, 300)
+    store.set(_WIDTH, 300)  # unchanged: no signal, no write
+    assert store.get(_WRAP) is False and store.get(_WIDTH) == 300
+    assert changes == [("test/wrap", False), ("test/width", 300)]
+    assert QSettings().value("test/width") is None  # still pending
+
+    store.flush()
+    assert QSettings().value("test/width", type=int) == 300
+    fresh = Settings()
+    assert fresh.get(_WRAP) is False  # read back as a bool, not "false"
+    assert fresh.get(_WIDTH) == 300
+    fresh.remove(_WIDTH)
+    fresh.flush()
+    assert fresh.get(_WIDTH) == 260 and QSettings().value("test/width") is None
+
+
+def test_failed_write_does_not_stop_the_writer(qtbot, monkeypatch):
+    from scribeone.utils import settings as settings_module
+
+    def broken():
+        raise OSError("disk full")
+
+    store = Settings(delay_ms=60_000)
+    monkeypatch.setattr(settings_module, "QSettings", broken)
+    store.set(_WIDTH, 111)
+    store.flush()  # returns although the batch failed
+    monkeypatch.undo()
+    store.set(_WIDTH, 222)
+    store.flush()
+    assert QSettings().value("test/width", type=int) == 222
@@ -0,0 +1,68 @@
+import os
+import socket
+import threading
+
+import pytest
+
+from scribeone.utils import single_instance
+from scribeone.utils.single_instance import forward_to_running, server_name, split_location
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets only")
+
+
+@pytest.fixture
+def runtime_dir(tmp_path, monkeypatch):
+    run = tmp_path / "run"
+    run.mkdir(mode=0o700)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(run))
+    return run
+
+
+def test_split_location(tmp_path):
+    assert split_location("notes.txt:12") == ("notes.txt", 12, 0)
+    assert split_location("notes.txt:12:5") == ("notes.txt", 12, 5)
+    assert split_location("notes.txt") == ("notes.txt", 0, 0)
+    odd = tmp_path / "odd:3"
+    odd.write_text("x")
+    assert split_location(str(odd)) == (str(odd), 0, 0)
+
+
+def test_handoff_reaches_running_server(qtbot, runtime_dir):
+    from scribeone.ui.instance_server import InstanceServer
+
+    server = InstanceServer()
+    assert server.listen()
+    result = []
+    client = threading.Thread(target=lambda: result.append(forward_to_running(["a.txt:3", "--new-instance"])))
+    with qtbot.waitSignal(server.requestReceived, timeout=5000) as blocker:
+        client.start()
+    client.join(5)
+    server.close()
+    assert result == [True]
+    cwd, argv = blocker.args
+    assert cwd == os.getcwd()
+    assert argv == ["a.txt:3", "--new-instance"]
+
+
+def test_stale_socket_falls_back_and_is_replaced(qtbot, runtime_dir):
+    from scribeone.ui.instance_server import InstanceServer
+
+    name = server_name()
+    # A crashed instance leaves its socket file behind with nobody listening
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(name)
+    stale.close()
+    assert os.path.exists(name)
+    assert forward_to_running([]) is False
+
+    server = InstanceServer()
+    assert server.listen()
+    # A second server must not steal the socket from a live one
+    assert not InstanceServer().listen()
+    server.close()
+
+
+def test_unsafe_directory_disables_handoff(runtime_dir):
+    (runtime_dir / "scribeone").mkdir(mode=0o777)
+    os.chmod(runtime_dir / "scribeone", 0o777)
+    assert single_instance.server_name() is None
@@ -0,0 +1,40 @@
+import io
+
+from scribeone.ui.main_window import MainWindow
+from scribeone.utils.startup_profile import StartupProfile
+
+
+def test_sidebar_is_built_after_first_paint(qtbot):
+    win = MainWindow()
+    qtbot.addWidget(win)
+    assert win.sidebar is None
+    with qtbot.waitSignal(win.startupFinished, timeout=5000):
+        win.show()
+    assert win.sidebar is not None
+    assert win._journal is not None
+
+
+def test_startup_profile_reports_phases_and_imports():
+    profile = StartupProfile()
+    try:
+        with profile.phase("import"):
+            import wave  # noqa: F401 - any stdlib module not loaded yet
+        profile.mark("done")
+    finally:
+        profile.stop()
+    out = io.StringIO()
+    profile.report(out)
+    text = out.getvalue()
+    assert "import" in text and "* done" in text
+    assert "wave" in profile.imports
+
+
+def test_main_window_leaves_sqlite_for_later():
+    import os
+    import subprocess
+    import sys
+
+    code = "import sys\nimport scribeone.ui.main_window\nassert 'sqlite3' not in sys.modules\n"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
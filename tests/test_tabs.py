@@ -0,0 +1,86 @@
+from PyQt6.QtGui import QTextCursor
+
+from scribeone.ui.main_window import MainWindow
+from scribeone.utils.settings import TAB_MEMORY_BUDGET, settings
+
+
+def test_tabs_hibernate_over_budget_and_wake_with_changes(qtbot, tmp_path):
+    # ~100k characters each: two of them do not fit a 1 MB budget
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    a.write_text("".join(f"alpha {i}\n" for i in range(12_000)), encoding="utf-8")
+    b.write_text("".join(f"beta {i}\n" for i in range(12_000)), encoding="utf-8")
+    settings().set(TAB_MEMORY_BUDGET, 1)
+    try:
+        win = MainWindow()
+        qtbot.addWidget(win)
+        win.open_location(str(a))
+        first = win._tab
+        assert win._tabs.count() == 1  # the blank tab was taken over
+
+        win.editor.moveCursor(QTextCursor.MoveOperation.End)
+        win.editor.insertPlainText("unsaved\n")
+        win.open_location(str(b))
+        assert win._tabs.count() == 2 and win._tab is not first
+        assert not first.resident and first.spill is not None and first.is_dirty
+        assert win.doc.text.startswith("beta 0\n")
+
+        win.open_location(str(a), line=3)  # back to the spilled tab
+        assert win._tab is first and first.resident
+        assert win.doc.is_dirty and win.doc.text.endswith("alpha 11999\nunsaved\n")
+        assert win.editor.toPlainText() == win.doc.text
+        assert win.editor.textCursor().blockNumber() == 2
+        assert not win._all_tabs()[1].resident  # b is clean: reloaded from disk when needed
+
+        win._tabs.setCurrentIndex(1)
+        assert win.doc.text.startswith("beta 0\n") and not win.doc.is_dirty
+        assert win._close_tab(win._tab)
+        assert win._tabs.count() == 1 and win._tab is first
+        win.doc.mark_saved()  # skip the unsaved-close prompt on teardown
+    finally:
+        settings().set(TAB_MEMORY_BUDGET, 256)
+
+
+def test_switching_resident_tabs_keeps_caret_and_text(qtbot, tmp_path):
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    a.write_text("one\ntwo\nthree\n", encoding="utf-8")
+    b.write_text("other\n", encoding="utf-8")
+    win = MainWindow()
+    qtbot.addWidget(win)
+    win.open_location(str(a), line=2, column=2)
+    win.editor.insertPlainText("X")
+    first_qdoc = win.editor.document()
+    win.open_location(str(b))
+    assert win.editor.toPlainText() == "other\n" and not win.doc.is_dirty
+    win._tabs.setCurrentIndex(0)
+    assert win.editor.document() is first_qdoc  # nothing reloaded
+    assert win.doc.text == "one\ntXwo\nthree\n" and win.doc.is_dirty
+    assert win.editor.textCursor().position() == 6
+    qtbot.waitUntil(lambda: win._tabs.tabText(0) == "a.txt ●")
+    win.doc.mark_saved()  # skip the unsaved-close prompt on teardown
+
+
+def test_command_line_opens_every_file_in_its_own_tab(qtbot, tmp_path):
+    from scribeone.main import _apply_command_line
+
+    (tmp_path / "a.txt").write_text("first\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("second\n", encoding="utf-8")
+    win = MainWindow()
+    qtbot.addWidget(win)
+    _apply_command_line(win, ["a.txt", "b.txt:1"], str(tmp_path))
+    assert win._tabs.count() == 2
+    assert [tab.file_path for tab in win._all_tabs()] == [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+    assert win.doc.text == "second\n"
+
+
+def test_forwarded_command_line_never_exits(qtbot, tmp_path, capsys):
+    from scribeone.main import _apply_command_line
+
+    (tmp_path / "-dash.txt").write_text("dash\n", encoding="utf-8")
+    win = MainWindow()
+    qtbot.addWidget(win)
+    for bad in (["-h"], ["--bogus", "a.txt"]):
+        _apply_command_line(win, bad, str(tmp_path), forwarded=True)  # no SystemExit
+    assert capsys.readouterr() == ("", "")
+    assert win._tabs.count() == 1 and win.doc.path is None
+    _apply_command_line(win, ["--", "-dash.txt"], str(tmp_path), forwarded=True)
+    assert win.doc.text == "dash\n"
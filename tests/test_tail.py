@@ -0,0 +1,53 @@
+import os
+
+from scribeone.core.tail import LogTail, read_tail
+from scribeone.core.text_stats import TextStats
+from scribeone.ui.main_window import MainWindow
+from scribeone.utils.settings import FOLLOW_MAX_LINES, settings
+
+
+def test_log_tail_reads_appends_across_splits_and_rotation(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_bytes(b"".join(b"line %d\n" % i for i in range(5000)) + b"partial")
+    text, offset = read_tail(str(log), 2)
+    assert text == "line 4998\nline 4999\n"
+    tail = LogTail(str(log), "utf-8", offset)
+    assert tail.read() == ("partial", False)
+    with open(log, "ab") as f:
+        f.write(" é\r".encode()[:-2])  # "é" split between writes, CR waiting for LF
+    assert tail.read() == (" ", False)
+    with open(log, "ab") as f:
+        f.write("é\r\n".encode()[1:])
+    assert tail.read() == ("é\n", False)
+    log.write_bytes(b"truncated\n")
+    assert tail.read() == ("truncated\n", True)
+    os.replace(log, tmp_path / "app.log.1")
+    assert tail.read() == ("", False)
+    log.write_bytes(b"rotated\n")
+    assert tail.read() == ("rotated\n", True)
+
+
+def test_follow_mode_appends_and_caps_lines(qtbot, tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("".join(f"old {i}\n" for i in range(500)), encoding="utf-8")
+    settings().set(FOLLOW_MAX_LINES, 100)
+    try:
+        win = MainWindow()
+        qtbot.addWidget(win)
+        win.open_location(str(log))
+        win.act_follow.setChecked(True)
+        assert win.editor.isReadOnly()
+        assert win.doc.text.startswith("old 400\n")
+        with open(log, "a", encoding="utf-8") as f:
+            f.write("".join(f"new {i}\n" for i in range(300)))
+        qtbot.waitUntil(lambda: win.doc.text.endswith("new 299\n"), timeout=3000)
+        assert win.editor.toPlainText() == win.doc.text
+        assert win.editor.document().blockCount() <= 100 + 5
+        fresh = TextStats(win.doc.text)
+        assert (win._stats.lines, win._stats.words, win._stats.chars) == (fresh.lines, fresh.words, fresh.chars)
+
+        win.act_follow.setChecked(False)  # the whole file again, editable
+        assert win._follower is None and not win.editor.isReadOnly()
+        assert win.doc.text.startswith("old 0\n") and win.doc.text.endswith("new 299\n")
+    finally:
+        settings().set(FOLLOW_MAX_LINES, 100_000)
@@ -0,0 +1,131 @@
+import os
+
+from scribeone.core.search import SearchQuery
+from scribeone.core.workspace_index import WorkspaceIndex, required_literals
+from scribeone.core.workspace_search import iter_files
+from scribeone.ui.find_in_files_worker import FindInFilesWorker
+
+
+def _sync(index, root):
+    return index.sync(iter_files(str(root)), lambda p: True)
+
+
+def test_index_narrows_candidates_and_follows_changes(tmp_path):
+    (tmp_path / "a.txt").write_text("the Quick brown fox\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("lazy dog\n", encoding="utf-8")
+    index = WorkspaceIndex(tmp_path / "index.sqlite")
+    try:
+        assert _sync(index, tmp_path) == 2
+        assert index.candidates(["quick"]) == {str(tmp_path / "a.txt")}
+        assert index.candidates(["qu"]) is None  # too short to tell
+        assert _sync(index, tmp_path) == 0  # unchanged files are not reread
+
+        (tmp_path / "b.txt").write_text("lazy quick dog, longer now\n", encoding="utf-8")
+        os.remove(tmp_path / "a.txt")
+        assert _sync(index, tmp_path) == 1
+        assert index.candidates(["quick"]) == {str(tmp_path / "b.txt")}
+        assert set(index.states()) == {str(tmp_path / "b.txt")}
+        assert index.find_names("bt") == [str(tmp_path / "b.txt")]
+    finally:
+        index.close()
+
+
+def test_required_literals_are_conservative():
+    assert required_literals(SearchQuery("a.b")) == ["a.b"]
+    assert required_literals(SearchQuery(r"foo\.bar\d+baz", regex=True)) == ["foo.bar", "baz"]
+    assert required_literals(SearchQuery(r"colou?r(ed)?x", regex=True)) == ["colo", "r", "x"]
+    assert required_literals(SearchQuery("cat|dog", regex=True)) == []
+    # Numeric and named escapes are consumed whole, never read as literal text
+    assert required_literals(SearchQuery(r"\x41BCdef", regex=True)) == ["BCdef"]
+    assert required_literals(SearchQuery(r"\101bcde", regex=True)) == ["bcde"]
+    assert required_literals(SearchQuery(r"\u0041bc\U00000042cd\N{LATIN SMALL LETTER E}f", regex=True)) == ["bc", "cd", "f"]
+    assert required_literals(SearchQuery(r"(a)\1xyz\0123", regex=True)) == ["xyz", "3"]
+
+
+def test_escaped_regex_still_finds_indexed_files(tmp_path):
+    (tmp_path / "a.txt").write_text("hello ABCdef world\n", encoding="utf-8")
+    index = WorkspaceIndex(tmp_path / "index.sqlite")
+    try:
+        _sync(index, tmp_path)
+        for pattern in (r"\x41BCdef", r"\101BCdef", r"\u0041BCdef"):
+            query = SearchQuery(pattern, regex=True)
+            assert query.compile().search("hello ABCdef world")
+            assert index.candidates(required_literals(query)) in (None, {str(tmp_path / "a.txt")}), pattern
+    finally:
+        index.close()
+
+
+def test_worker_skips_files_the_index_rules_out(qtbot, tmp_path):
+    for i in range(40):
+        (tmp_path / f"f{i}.txt").write_text("needle\n" if i == 7 else "hay\n", encoding="utf-8")
+    db = str(tmp_path / "index.sqlite")
+    index = WorkspaceIndex(db)
+    _sync(index, tmp_path)
+    index.close()
+    (tmp_path / "f9.txt").write_text("new needle, not indexed yet\n", encoding="utf-8")
+    worker = FindInFilesWorker(str(tmp_path), SearchQuery("needle"), ("*.txt",), (), db)
+    hits = []
+    worker.resultsFound.connect(hits.extend)
+    with qtbot.waitSignal(worker.finished, timeout=30000):
+        worker.start()
+    assert sorted(os.path.basename(h.path) for h in hits) == ["f7.txt", "f9.txt"]
+    assert worker.files_skipped == 38
+
+
+def test_quick_open_is_seeded_from_the_index_off_the_gui_thread(qtbot, tmp_path):
+    from scribeone.core.workspace_index import indexed_paths
+    from scribeone.ui.quick_open import PathScanner
+
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "a.txt").write_text("x", encoding="utf-8")
+    db = str(tmp_path / "index.sqlite")
+    assert indexed_paths(db) == [] and not os.path.exists(db)
+    index = WorkspaceIndex(db)
+    try:
+        _sync(index, root)
+    finally:
+        index.close()
+    assert indexed_paths(db) == [str(root / "a.txt")]
+
+    os.remove(root / "a.txt")  # the index is a seed; the walk has the last word
+    scanner = PathScanner(str(root), ("*.txt",), (), db)
+    batches, ready = [], []
+    scanner.pathsFound.connect(batches.append)
+    scanner.indexReady.connect(ready.append)
+    with qtbot.waitSignal(scanner.finished, timeout=10000):
+        scanner.start()
+    assert batches[0] == [str(root / "a.txt")]
+    assert len(ready[0]) == 0
+
+
+def test_indexing_waits_for_a_chosen_root_and_watches_within_one_budget(qtbot, tmp_path, monkeypatch):
+    from scribeone.ui import workspace_indexer
+    from scribeone.ui.sidebar_panel import SidebarPanel
+    from scribeone.utils.settings import WORKSPACE_ROOT, settings
+    from scribeone.utils.workspace_settings import set_workspace_root
+
+    settings().remove(WORKSPACE_ROOT)
+    panel = SidebarPanel()
+    qtbot.addWidget(panel)
+    panel.set_root(None)  # the home directory, shown but not indexed
+    assert panel.indexer.root is None and panel.indexer.db_path is None
+    set_workspace_root(str(tmp_path))
+    panel.set_root(str(tmp_path))
+    assert panel.indexer.root == str(tmp_path) and panel.indexer.db_path
+    panel.shutdown()
+    settings().remove(WORKSPACE_ROOT)
+
+    monkeypatch.setattr(workspace_indexer, "MAX_WATCHED_DIRS", 3)
+    dirs = []
+    for i in range(4):
+        (tmp_path / f"d{i}").mkdir()
+        dirs.append(str(tmp_path / f"d{i}"))
+    first, second = workspace_indexer.WorkspaceIndexer(), workspace_indexer.WorkspaceIndexer()
+    first._watch(dirs[:2])
+    second._watch(dirs[2:])
+    assert len(first._watcher.directories()) == 2 and len(second._watcher.directories()) == 1
+    first.stop()
+    second._watch(dirs[2:])
+    assert len(second._watcher.directories()) == 2
+    second.stop()
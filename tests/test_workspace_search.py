@@ -0,0 +1,72 @@
+import os
+
+from scribeone.core.search import SearchQuery
+from scribeone.core.workspace_search import iter_files, search_file, split_patterns
+from scribeone.ui.find_in_files_worker import FindInFilesWorker
+
+
+def _tree(tmp_path):
+    (tmp_path / "a.txt").write_text("alpha\nneedle one\n", encoding="utf-8")
+    (tmp_path / "notes.MD").write_text("needle\n", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_bytes("第一行\r\nNeedle 二\r\n".encode("utf-16"))
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "c.txt").write_text("needle\n", encoding="utf-8")
+    (tmp_path / "bin.txt").write_bytes(b"needle\0\1\2")
+    return tmp_path
+
+
+def test_iter_files_honours_filters_and_ignores(tmp_path):
+    root = _tree(tmp_path)
+    names = {os.path.relpath(p, root) for p in iter_files(str(root), split_patterns("*.txt; *.md"), ("node_modules",))}
+    assert names == {"a.txt", "bin.txt", "notes.MD", os.path.join("sub", "b.txt")}
+
+
+def test_search_file_reports_lines_in_the_detected_encoding(tmp_path):
+    root = _tree(tmp_path)
+    query = SearchQuery("needle")
+    assert [(h.line, h.column, h.preview) for h in search_file(str(root / "a.txt"), query)] == [(2, 1, "needle one")]
+    assert [(h.line, h.preview) for h in search_file(str(root / "sub" / "b.txt"), query)] == [(2, "Needle 二")]
+    assert search_file(str(root / "bin.txt"), query) == []
+
+
+def test_line_numbers_survive_chunk_boundaries(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_text("x" * 100 + "\n" + ("filler line\n" * 200_000) + "needle\n", encoding="utf-8")
+    hits = search_file(str(path), SearchQuery("needle"))
+    assert [h.line for h in hits] == [200_002]
+
+
+def test_worker_streams_hits_from_the_pool(qtbot, tmp_path):
+    root = _tree(tmp_path)
+    worker = FindInFilesWorker(str(root), SearchQuery("needle"), ("*.txt",), ("node_modules",))
+    hits = []
+    worker.resultsFound.connect(hits.extend)
+    with qtbot.waitSignal(worker.finished, timeout=30000):
+        worker.start()
+    assert worker.complete
+    assert sorted(os.path.relpath(h.path, root) for h in hits) == ["a.txt", os.path.join("sub", "b.txt")]
+
+
+def test_a_line_longer_than_the_carry_is_searched_in_pieces(tmp_path, monkeypatch):
+    from scribeone.core import fileio, workspace_search
+
+    path = tmp_path / "min.json"
+    path.write_text("x" * 50 + "needle" + "y" * 30 + "needle\nneedle", encoding="utf-8")
+    monkeypatch.setattr(workspace_search, "MAX_CARRY_CHARS", 16)
+    monkeypatch.setattr(
+        workspace_search, "iter_decoded_chunks", lambda p, enc: fileio.iter_decoded_chunks(p, enc, chunk_size=8)
+    )
+    hits = search_file(str(path), SearchQuery("needle"))
+    # Pieces of 24 characters; columns keep counting across them
+    assert [(h.line, h.column) for h in hits] == [(1, 51), (1, 87), (2, 1)]
+
+
+def test_worker_reports_errors_from_the_pool(qtbot, tmp_path):
+    root = _tree(tmp_path)
+    worker = FindInFilesWorker(str(root), SearchQuery("(", regex=True), ("*.txt",), ())
+    errors = []
+    worker.failed.connect(errors.append)
+    with qtbot.waitSignal(worker.finished, timeout=30000):
+        worker.start()
+    assert not worker.complete and len(errors) == 1